@@ -0,0 +1,81 @@
+# accounts/activity.py
+"""
+The "My activity" read model behind the user dashboard.
+
+One small query per list - recent registrations (with the event's title and
+date), UGC posts and reviews - each walking the user's own index, flattened
+into plain dicts and cached per user for USER_ACTIVITY_CACHE_TTL seconds.
+Registering, posting or reviewing bumps that user's version (see
+accounts.signals), so the dashboard shows the change on the next load.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump_version, versioned_key
+from core.query_audit import hot_query
+from registrations.models import Registration
+from ugc.models import UGC, Review
+
+CACHE_TTL = getattr(settings, "USER_ACTIVITY_CACHE_TTL", 300)
+ITEMS = getattr(settings, "USER_ACTIVITY_ITEMS", 5)
+
+
+def _namespace(user_id):
+    return f"user_activity:{user_id}"
+
+
+@hot_query("accounts.activity_registrations", user_id="USR001")
+def _recent_registrations(user_id):
+    return (Registration.objects.filter(user_id=user_id)
+            .order_by("-registration_date", "-registration_id")
+            .values("registration_id", "registration_date", "payment_status",
+                    "event_id", "event__title", "event__date_time"))
+
+
+@hot_query("accounts.activity_ugc", user_id="USR001")
+def _recent_ugc(user_id):
+    return (UGC.objects.filter(user_id=user_id)
+            .order_by("-posted_on", "-ugc_id")
+            .values("ugc_id", "content_type", "content_data", "posted_on", "event_id", "event__title"))
+
+
+@hot_query("accounts.activity_reviews", user_id="USR001")
+def _recent_reviews(user_id):
+    return (Review.objects.filter(user_id=user_id)
+            .order_by("-date_posted", "-review_id")
+            .values("review_id", "rating", "comment", "date_posted", "event_id", "event__title"))
+
+
+def compute_user_activity(user_id):
+    return {
+        "registrations": [
+            {"registration_id": r["registration_id"], "event_id": r["event_id"],
+             "title": r["event__title"], "event_date": r["event__date_time"],
+             "registered_on": r["registration_date"], "payment_status": r["payment_status"]}
+            for r in _recent_registrations(user_id)[:ITEMS]
+        ],
+        "ugc": [
+            {"ugc_id": u["ugc_id"], "event_id": u["event_id"], "title": u["event__title"],
+             "content_type": u["content_type"], "caption": u["content_data"], "posted_on": u["posted_on"]}
+            for u in _recent_ugc(user_id)[:ITEMS]
+        ],
+        "reviews": [
+            {"review_id": r["review_id"], "event_id": r["event_id"], "title": r["event__title"],
+             "rating": r["rating"], "comment": r["comment"], "posted_on": r["date_posted"]}
+            for r in _recent_reviews(user_id)[:ITEMS]
+        ],
+    }
+
+
+def user_activity(user_id):
+    """Cached ``{"registrations", "ugc", "reviews"}`` lists (newest first) for one user."""
+    key = versioned_key(_namespace(user_id))
+    activity = cache.get(key)
+    if activity is None:
+        activity = compute_user_activity(user_id)
+        cache.set(key, activity, CACHE_TTL)
+    return activity
+
+
+def invalidate_user_activity(user_id):
+    bump_version(_namespace(user_id))
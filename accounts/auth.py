@@ -0,0 +1,71 @@
+# accounts/auth.py
+"""
+Login lookups and password checks shared by login_view and admin_login.
+
+Names are matched on their normalized, unique key, so a login touches one
+row and runs at most one password hash.
+"""
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.utils.crypto import constant_time_compare
+
+from core.query_audit import hot_query
+from .models import AdminProfile, UserProfile, normalize_login_name
+
+
+# algorithm names of Django's hashers: a stored "<one of these>$..." is a hash
+# whose hasher isn't enabled here, never a plain-text password
+_HASH_ALGORITHMS = frozenset({
+    "pbkdf2_sha256", "pbkdf2_sha1", "argon2", "bcrypt_sha256", "bcrypt", "scrypt",
+    "md5", "sha1", "unsalted_md5", "unsalted_sha1", "crypt",
+})
+
+
+def _is_legacy_plain_text(stored):
+    if not stored or stored.startswith("!"):      # "!..." marks an unusable password
+        return False
+    return not ("$" in stored and stored.split("$", 1)[0] in _HASH_ALGORITHMS)
+
+
+@hot_query("accounts.user_by_name", key="someone")
+def _users_named(key):
+    return UserProfile.objects.filter(username_key=key)
+
+
+@hot_query("accounts.admin_by_name", key="someone")
+def _admins_named(key):
+    return AdminProfile.objects.filter(admin_name_key=key)
+
+
+def find_user(login):
+    """UserProfile for a username (or, failing that, an email address)."""
+    user = _users_named(normalize_login_name(login)).first()
+    if user is None and "@" in login:
+        user = UserProfile.objects.filter(email=login.strip().lower()).first()
+    return user
+
+
+def find_admin(admin_name):
+    return _admins_named(normalize_login_name(admin_name)).first()
+
+
+def verify_password(account, raw):
+    """
+    Check ``raw`` against ``account.password``. Legacy plain-text passwords and
+    hashes made under an older hasher policy are re-hashed in place on success;
+    an unusable password ("!...") never matches.
+    """
+    stored = account.password or ""
+
+    def upgrade(raw_password):
+        account.password = make_password(raw_password)
+        account.save(update_fields=["password"])
+
+    try:
+        identify_hasher(stored)
+    except ValueError:
+        # legacy plain-text (old rows) - but not unusable markers or unknown hashes
+        if _is_legacy_plain_text(stored) and constant_time_compare(raw, stored):
+            upgrade(raw)
+            return True
+        return False
+    return check_password(raw, stored, setter=upgrade)
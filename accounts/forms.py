@@ -1,6 +1,6 @@
 # accounts/forms.py
 from django import forms
-from .models import UserProfile
+from .models import UserProfile, normalize_login_name
 from django.contrib.auth.hashers import make_password
 
 
@@ -28,6 +28,12 @@ class UserSignUpForm(forms.ModelForm):
             "email": forms.EmailInput(attrs={"class": "form-control " , "placeholder" : "Enter a email"}),
         }
 
+    def clean_username(self):
+        username = self.cleaned_data["username"].strip()
+        if UserProfile.objects.filter(username_key=normalize_login_name(username)).exists():
+            raise forms.ValidationError("Username already taken.")
+        return username
+
     def clean_email(self):
         email = self.cleaned_data["email"].lower()
         if UserProfile.objects.filter(email=email).exists():
@@ -0,0 +1,15 @@
+# accounts/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PolicyPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from PASSWORD_PBKDF2_ITERATIONS.
+
+    Same algorithm name as Django's hasher, so existing hashes keep verifying;
+    when the setting changes, hashes with the old count are re-encoded on the
+    user's next successful login (accounts.auth.verify_password). Use
+    ``manage.py bench_logins`` to see what a given count costs per core.
+    """
+    iterations = getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,91 @@
+# accounts/management/commands/bench_logins.py
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.hashers import PolicyPBKDF2PasswordHasher
+from accounts.models import UserProfile
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password verifications/sec on one core for several PBKDF2 iteration "
+        "counts, then time real logins through login_view (throwaway user, rolled back)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", default="100000,300000,600000,1000000",
+                            help="Comma-separated PBKDF2 iteration counts to compare.")
+        parser.add_argument("--seconds", type=float, default=1.0,
+                            help="How long to measure each count.")
+        parser.add_argument("--logins", type=int, default=5,
+                            help="Logins to run through the view with the current policy.")
+
+    def handle(self, *args, **opts):
+        current = PolicyPBKDF2PasswordHasher.iterations
+        self.stdout.write(f"policy: PASSWORD_PBKDF2_ITERATIONS={current}")
+        for count in [int(x) for x in opts["iterations"].split(",") if x.strip()]:
+            rate, ms = self._hash_rate(count, opts["seconds"])
+            mark = "  <- policy" if count == current else ""
+            self.stdout.write(f"iterations={count:>9}  {rate:7.1f} logins/s/core  {ms:7.1f} ms each{mark}")
+
+        try:
+            with transaction.atomic():
+                self._logins(opts["logins"], current)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _hash_rate(self, iterations, seconds):
+        hasher = PolicyPBKDF2PasswordHasher()
+        hasher.iterations = iterations
+        encoded = hasher.encode("bench-password", hasher.salt())
+        n, t0 = 0, time.perf_counter()
+        while time.perf_counter() - t0 < seconds or n == 0:
+            hasher.verify("bench-password", encoded)
+            n += 1
+        elapsed = time.perf_counter() - t0
+        return n / elapsed, elapsed / n * 1000
+
+    def _logins(self, n, current):
+        # stored under an older work factor, so the first login must re-hash it
+        old = PolicyPBKDF2PasswordHasher()
+        old.iterations = max(1, current // 2)
+        user = UserProfile.objects.create(
+            username="Bench_Login", email="bench-login@example.invalid",
+            password=old.encode("bench-password", old.salt()),
+        )
+        client = Client(SERVER_NAME=(settings.ALLOWED_HOSTS or ["localhost"])[0])
+        url = reverse("login")
+
+        timings, queries = [], 0
+        for _ in range(n):
+            with CaptureQueriesContext(connection) as ctx:
+                t0 = time.perf_counter()
+                resp = client.post(url, {"username": " bench_login ", "password": "bench-password"})
+                timings.append((time.perf_counter() - t0) * 1000)
+            queries = len(ctx)
+            if resp.status_code != 302 or resp.url != reverse("dashboard"):
+                self.stderr.write(f"login failed: {resp.status_code} {getattr(resp, 'url', '')}")
+                return
+
+        user.refresh_from_db()
+        rehashed = user.password.split("$")[1] == str(current)
+        self.stdout.write(
+            f"login_view: first {timings[0]:.1f} ms (re-hash), then "
+            f"{sum(timings[1:]) / max(len(timings) - 1, 1):.1f} ms avg, {queries} queries per login"
+        )
+        if rehashed:
+            self.stdout.write(self.style.SUCCESS("Old hash was upgraded to the current policy on login."))
+        else:
+            self.stdout.write(self.style.WARNING("Hash was NOT upgraded on login!"))
@@ -0,0 +1,63 @@
+# accounts/middleware.py
+"""
+Who is logged in, resolved at most once per request.
+
+``login_view`` / ``admin_login`` keep ``user_id`` / ``admin_id`` in the
+session; views read ``request.principal.user`` / ``.admin`` / ``.college``
+instead of querying for them again. Each lookup is lazy (pages that never
+ask cost nothing) and memoised for the rest of the request.
+"""
+from functools import cached_property
+
+from .models import AdminProfile, UserProfile
+
+USER_SESSION_KEY = "user_id"
+ADMIN_SESSION_KEY = "admin_id"
+
+
+class Principal:
+    def __init__(self, request):
+        self._session = request.session
+
+    @property
+    def user_id(self):
+        return self._session.get(USER_SESSION_KEY)
+
+    @property
+    def admin_id(self):
+        return self._session.get(ADMIN_SESSION_KEY)
+
+    @cached_property
+    def user(self):
+        """The logged-in UserProfile, or None (user_id is the primary key)."""
+        uid = self.user_id
+        return UserProfile.objects.filter(pk=uid).first() if uid else None
+
+    @cached_property
+    def admin(self):
+        """The logged-in AdminProfile with its college joined in, or None."""
+        aid = self.admin_id
+        if not aid:
+            return None
+        return AdminProfile.objects.select_related("college").filter(admin_id=aid).first()
+
+    @property
+    def college(self):
+        # reverse one-to-one: raises (an AttributeError) when no college is linked
+        return getattr(self.admin, "college", None)
+
+    def forget(self):
+        """Drop memoised lookups, e.g. right after login/logout changed the session."""
+        self.__dict__.pop("user", None)
+        self.__dict__.pop("admin", None)
+
+
+class CurrentPrincipalMiddleware:
+    """Must come after SessionMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.principal = Principal(request)
+        return self.get_response(request)
@@ -0,0 +1,55 @@
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalize(name):
+    return unicodedata.normalize("NFKC", name or "").strip().casefold()
+
+
+def fill_keys(apps, schema_editor):
+    # Names were never unique. The oldest row keeps the plain key; later
+    # duplicates get "<key>#<id>" and can still log in with their email.
+    for model, pk, source, key_field in (
+        ("UserProfile", "user_id", "username", "username_key"),
+        ("AdminProfile", "id", "admin_name", "admin_name_key"),
+    ):
+        Model = apps.get_model("accounts", model)
+        seen = set()
+        for obj in Model.objects.order_by(pk):
+            key = _normalize(getattr(obj, source))
+            if not key or key in seen:
+                key = f"{key}#{getattr(obj, pk)}"
+            seen.add(key)
+            Model.objects.filter(pk=obj.pk).update(**{key_field: key})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_rename_pasword_userprofile_password'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='username_key',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='adminprofile',
+            name='admin_name_key',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='username_key',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='adminprofile',
+            name='admin_name_key',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -1,15 +1,23 @@
+import unicodedata
+
 from django.db import models 
+from core.sequences import next_id
+
+
+def normalize_login_name(name):
+    """Lookup key for usernames / admin names: NFKC, trimmed, case-folded."""
+    return unicodedata.normalize("NFKC", name or "").strip().casefold()
+
+
+def _sync_key(instance, source, key_field, kwargs):
+    setattr(instance, key_field, normalize_login_name(getattr(instance, source)))
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and source in update_fields:
+        kwargs["update_fields"] = {*update_fields, key_field}
 
 
 def generate_user_id():
-    last_user = UserProfile.objects.order_by("-user_id").first()
-    if last_user:
-        # Extract numeric part and increment
-        last_num = int(last_user.user_id.replace("USR", ""))
-        new_num = last_num + 1
-    else:
-        new_num = 1
-    return f"USR{new_num:03d}"  # e.g., USR001, USR002
+    return next_id("USR")  # e.g., USR001, USR002
 
 class UserProfile(models.Model):
     user_id = models.CharField(primary_key=True, max_length=20, default=generate_user_id, editable=False)
@@ -18,21 +26,19 @@ class UserProfile(models.Model):
     password = models.CharField(max_length=128)
     profile_info = models.CharField(max_length=50, blank=True, null=True)
     preferences = models.CharField(max_length=20, blank=True, null=True)
+    # normalized username; unique + indexed so login is a single-row lookup
+    username_key = models.CharField(max_length=64, unique=True, editable=False)
 
+    def save(self, *args, **kwargs):
+        _sync_key(self, "username", "username_key", kwargs)
+        super().save(*args, **kwargs)
 
     def _str_(self):
         return self.user_name
 
 
 def _next_admin_id():
-    last = AdminProfile.objects.order_by('id').last()
-    if last and last.admin_id and last.admin_id.startswith("ADM"):
-        try:
-            n = int(last.admin_id[3:]) + 1
-        except ValueError:
-            n = 1
-        return f"ADM{str(n).zfill(4)}"
-    return "ADM0001"
+    return next_id("ADM")
 
 def generate_admin_id():
     return _next_admin_id()
@@ -48,6 +54,11 @@ class AdminProfile(models.Model):
     password   = models.CharField(max_length=128)
     admin_id   = models.CharField(max_length=10, unique=True, default=generate_admin_id)  
     created_at = models.DateTimeField(auto_now_add=True)
+    admin_name_key = models.CharField(max_length=64, unique=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        _sync_key(self, "admin_name", "admin_name_key", kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.admin_id} - {self.full_name}"
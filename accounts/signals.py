@@ -0,0 +1,20 @@
+# accounts/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from registrations.models import Registration
+from ugc.models import UGC, Review
+from .activity import invalidate_user_activity
+
+
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+@receiver(post_save, sender=UGC)
+@receiver(post_delete, sender=UGC)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def activity_changed(sender, instance, **kwargs):
+    user_id = instance.user_id
+    if user_id:
+        transaction.on_commit(lambda: invalidate_user_activity(user_id))
@@ -1,6 +1,6 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.contrib.auth.hashers import make_password, check_password
+from django.contrib.auth.hashers import make_password
 from django.views.decorators.http import require_http_methods
 from django.db import transaction
 from django.contrib import messages
@@ -9,6 +9,10 @@ from functools import wraps
 from .models import UserProfile
 from colleges.models import College
 from .forms import UserSignUpForm, AdminRegisterForm, AdminLoginForm
+from .activity import user_activity
+from .auth import find_admin, find_user, verify_password
+from core.metrics import query_budget
+from core.query_audit import hot_query
 
 
 # ----------------- HELPERS -----------------
@@ -52,28 +56,13 @@ def login_view(request):
             return redirect("login")
 
      
-        candidates = list(UserProfile.objects.filter(username__iexact=username))
-        if not candidates:
+        # one indexed row, at most one hash check (accounts.auth)
+        matched = find_user(username)
+        if not matched:
             messages.error(request, "Username not found.")
             return redirect("login")
 
-        matched = None
-        for u in candidates:
-            stored = u.password or ""
-            if stored.startswith("pbkdf2_"):
-                if check_password(password, stored):
-                    matched = u
-                    break
-            else:
-              
-                if password == stored:
-                 
-                    u.password = make_password(password)
-                    u.save(update_fields=["password"])
-                    matched = u
-                    break
-
-        if not matched:
+        if not verify_password(matched, password):
             messages.error(request, "Invalid username or password.")
             return redirect("login")
 
@@ -94,87 +83,33 @@ def login_view(request):
 
 USER_SESSION_KEY = "user_id"
 
-def _get_related_list(user, *names):
-    """
-    Try multiple relation names; return up to 5 items as a list.
-    Works for M2M/ForeignKey related managers (have .all()).
-    """
-    for name in names:
-        rel = getattr(user, name, None)
-        if rel is not None and hasattr(rel, "all"):
-            try:
-                qs = rel.all()
-                try:
-                    qs = qs.order_by("-id")
-                except Exception:
-                    pass
-                return list(qs[:5])
-            except Exception:
-                pass
-    return []
-
-def _event_dict(obj):
-    """Make a display dict: label + date_str (best-effort fields)."""
-    label = (
-        getattr(obj, "name", None)
-        or getattr(obj, "title", None)
-        or getattr(obj, "event_name", None)
-        or str(obj)
-    )
-    dt = (
-        getattr(obj, "date", None)
-        or getattr(obj, "event_date", None)
-        or getattr(obj, "start_time", None)
-        or None
-    )
-    if hasattr(dt, "strftime"):
-        date_str = dt.strftime("%b %d, %Y")
-    else:
-        date_str = ""
-    return {"label": label, "date_str": date_str}
-
-def _upload_dict(obj):
-    """Make a display dict for uploads/ugc."""
-    label = (
-        getattr(obj, "title", None)
-        or getattr(obj, "name", None)
-        or getattr(obj, "filename", None)
-        or str(obj)
-    )
-    meta = getattr(obj, "description", None) or getattr(obj, "caption", None) or ""
-    return {"label": label, "meta": meta}
-
+@query_budget(5)
 def dashboard_view(request):
-    uid = request.session.get(USER_SESSION_KEY)
-    if not uid:
+    if not request.principal.user_id:
         return redirect("login")
 
-    user = UserProfile.objects.filter(pk=uid).first() or UserProfile.objects.filter(user_id=uid).first()
+    user = request.principal.user
     if not user:
         messages.error(request, "Session invalid. Please log in again.")
         return redirect("login")
 
-   
-    raw_regs = _get_related_list(user, "events_registered", "registrations", "registered_events")
-    raw_up = _get_related_list(user, "uploads", "ugc", "ugc_items")
-
-    registrations = [_event_dict(x) for x in raw_regs]
-    uploads = [_upload_dict(x) for x in raw_up]
+    # recent registrations / UGC / reviews: cached per user (accounts.activity)
+    activity = user_activity(user.user_id)
 
     ctx = {
         "account_user": user,
-        "registrations": registrations,  # list of {"label","date_str"}
-        "uploads": uploads,              # list of {"label","meta"}
+        "registrations": activity["registrations"],
+        "uploads": activity["ugc"],
+        "reviews": activity["reviews"],
     }
     return render(request, "accounts/dashboard.html", ctx)
 
 @require_http_methods(["POST"])
 def profile_edit_view(request):
-    uid = request.session.get(USER_SESSION_KEY)
-    if not uid:
+    if not request.principal.user_id:
         return redirect("login")
 
-    user = UserProfile.objects.filter(pk=uid).first() or UserProfile.objects.filter(user_id=uid).first()
+    user = request.principal.user
     if not user:
         messages.error(request, "Session invalid. Please log in again.")
         return redirect("login")
@@ -218,6 +153,8 @@ def admin_register(request):
             # Basic duplicate checks
             if AdminProfile.objects.filter(email=cd["email"].strip().lower()).exists():
                 form.add_error("email", "An admin with this email already exists.")
+            elif find_admin(cd["admin_name"]):
+                form.add_error("admin_name", "This admin username is already taken.")
             elif College.objects.filter(name__iexact=cd["college_name"].strip()).exists():
                 form.add_error("college_name", "A college with this name already exists.")
             else:
@@ -258,24 +195,12 @@ def admin_login(request):
             messages.error(request, "Please enter both username and password.")
             return redirect("admin_login")
 
-        try:
-            admin = AdminProfile.objects.get(admin_name__iexact=admin_name)
-        except AdminProfile.DoesNotExist:
+        admin = find_admin(admin_name)
+        if admin is None:
             messages.error(request, "Admin username not found.")
             return redirect("admin_login")
 
-        ok = False
-        pwdval = admin.password or ""
-        if pwdval.startswith("pbkdf2_"):          # hashed path
-            ok = check_password(password, pwdval)
-        else:                                      # legacy plain-text (old rows)
-            ok = (password == pwdval)
-            if ok:
-                # Upgrade to hashed on-the-fly
-                admin.password = make_password(password)
-                admin.save(update_fields=["password"])
-
-        if not ok:
+        if not verify_password(admin, password):
             messages.error(request, "Invalid password.")
             return redirect("admin_login")
 
@@ -307,18 +232,13 @@ from django.views.decorators.http import require_GET
 from accounts.models import AdminProfile
 from events.models import Event
 from registrations.models import Registration, Payment
+from registrations.stats import college_stats
+from registrations.views import college_registrations, registration_row
 
-
-# --- small helper to get the logged-in admin from session ---
-ADMIN_SESSION_KEY = "admin_id"
-
-def _current_admin(request):
-    admin_id = request.session.get(ADMIN_SESSION_KEY)
-    if not admin_id:
-        return None
-    return AdminProfile.objects.filter(admin_id=admin_id).first()
+DASHBOARD_RECENT_ROWS = 10
 
 
+@query_budget(4)
 @require_GET
 def admin_dashboard(request):
     """
@@ -326,76 +246,25 @@ def admin_dashboard(request):
     Totals:
       - total_events
       - total_registrations
-      - total_payments (₹ of PAID payments)
-      - total_sponsored (if Event has is_sponsored; else 0)
+      - total_revenue (₹ of PAID payments)
+      - total_sponsored (events with at least one sponsor)
+    All of them come from the shared, cached registrations.stats service.
     """
-    admin = _current_admin(request)
+    admin = request.principal.admin
     if not admin:
         messages.error(request, "Please log in as admin.")
         return redirect("admin_login")
 
     college = getattr(admin, "college", None)
 
-    # Default zeroed metrics if no college is linked yet
-    stats = {
-        "total_events": 0,
-        "total_registrations": 0,
-        "total_payments": Decimal("0.00"),
-        "total_sponsored": 0,
-    }
+    stats = college_stats(college)      # all zeros when no college is linked yet
 
     rows = []
 
     if college:
-        # ---- Totals, all scoped to this college ----
-        stats["total_events"] = Event.objects.filter(college=college).count()
-
-        stats["total_registrations"] = Registration.objects.filter(
-            event__college=college
-        ).count()
-
-        stats["total_payments"] = (
-            Payment.objects.filter(
-                invoice__registration__event__college=college,
-                status__iexact="paid",
-            )
-            .aggregate(total=Coalesce(Sum("amount"), Decimal("0.00")))
-            .get("total")
-            or Decimal("0.00")
-        )
-
-        # Optional: only if your Event model actually has is_sponsored
-        try:
-            stats["total_sponsored"] = Event.objects.filter(
-                college=college, is_sponsored=True
-            ).count()
-        except Exception:
-            stats["total_sponsored"] = 0
-
-        # ---- Detailed table rows (if you show them on the dashboard) ----
-        regs = (
-            Registration.objects.filter(event__college=college)
-            .select_related("user", "event", "invoice", "invoice__payment")
-            .order_by("-registration_date", "-event__date_time")
-        )
-
-        for r in regs:
-            inv = getattr(r, "invoice", None)
-            pay = getattr(inv, "payment", None)
-            rows.append(
-                {
-                    "reg_id": r.registration_id,
-                    "date": r.registration_date,
-                    "user": r.user,  # use .username / .email in template
-                    "event_id": r.event.event_id,
-                    "event_title": r.event.title,
-                    "status": r.payment_status,
-                    "invoice_id": getattr(inv, "invoice_id", None),
-                    "pay_status": getattr(pay, "status", ""),
-                    "gateway": getattr(pay, "gateway", ""),
-                    "amount": getattr(pay, "amount", Decimal("0.00")),
-                }
-            )
+        # ---- Most recent registrations (full list lives on the overview page) ----
+        regs = college_registrations(college)[:DASHBOARD_RECENT_ROWS]
+        rows = [registration_row(r) for r in regs]
 
     else:
         messages.info(
@@ -424,9 +293,15 @@ from django.shortcuts import render
 from django.utils import timezone
 from events.models import Event
 
+@hot_query("accounts.upcoming_events")
+def _upcoming_events():
+    return Event.objects.filter(date_time__gte=timezone.now()).order_by('date_time')[:8]
+
+
+@query_budget(3)
 def home_view(request):
     # If your model has date_time
-    qs = Event.objects.filter(date_time__gte=timezone.now()).order_by('date_time')[:8]
+    qs = _upcoming_events()
 
     # If instead you have start/end dates, use this:
     # qs = Event.objects.filter(start_date__gte=timezone.now().date()).order_by('start_date')[:8]
@@ -442,20 +317,21 @@ from colleges.models import College
 from events.models import Event
 from django.http import HttpResponse
 
+from search.queries import find_colleges, find_events, SUGGEST_LIMIT
+from search.autocomplete import autocomplete
+
 def search(request):
     q = request.GET.get("q", "").strip()
     colleges = events = []
     if q:
-        colleges = College.objects.filter(name__icontains=q)
-        events = Event.objects.filter(Q(title__icontains=q) | Q(description__icontains=q))
+        colleges = find_colleges(q)
+        events = find_events(q)
     return render(request, "accounts/search_result.html", {"q": q, "colleges": colleges, "events": events})
 
 
 
+@query_budget(2)
 def search_suggest(request):
+    # answered from the in-memory prefix index; no DB hit for hot prefixes
     q = request.GET.get("q", "").strip()
-    colleges = events = []
-    if q:
-        colleges = College.objects.filter(name__icontains=q)[:5]
-        events = Event.objects.filter(title__icontains=q)[:5]
-    return render(request, "accounts/search_suggest.html", {"colleges": colleges, "events": events})
+    return HttpResponse(autocomplete.suggest_html(q, SUGGEST_LIMIT))
@@ -0,0 +1,196 @@
+# analytics/counters.py
+"""
+Buffered view/share counters.
+
+Page hits only bump an in-process dict; a flush turns the accumulated deltas
+into one ``UPDATE analytics SET views = views + n`` per touched event. Flushes
+run on a background timer thread - straight away once
+``ANALYTICS_COUNTER_FLUSH_SIZE`` hits are pending, otherwise every
+``ANALYTICS_COUNTER_FLUSH_INTERVAL`` seconds - and at interpreter exit, so a
+crash loses at most one flush window of hits and requests never wait on one.
+"""
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    def __init__(self, flush_size=500, flush_interval=5.0, max_pending=10000):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending      # distinct events held before hits are dropped
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}                  # event_id -> [views, shares]
+        self._hits = 0
+        self._timer = None
+
+        self.stats = {
+            "flushes": 0,
+            "flushed_hits": 0,
+            "failed_flushes": 0,
+            "dropped": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "last_flush_at": None,
+        }
+
+    # ---------- recording ----------
+    def record(self, event_id, views=0, shares=0):
+        with self._lock:
+            slot = self._pending.get(event_id)
+            if slot is None:
+                if len(self._pending) >= self.max_pending:
+                    self.stats["dropped"] += views + shares
+                    return
+                slot = self._pending[event_id] = [0, 0]
+            slot[0] += views
+            slot[1] += shares
+            self._hits += views + shares
+            # a full buffer is flushed by the timer thread right away, never on
+            # the request thread (its UPDATEs would count against @query_budget)
+            self._ensure_timer(now=self._hits >= self.flush_size)
+
+    def record_view(self, event_id):
+        self.record(event_id, views=1)
+
+    def record_share(self, event_id):
+        self.record(event_id, shares=1)
+
+    def pending(self):
+        with self._lock:
+            return {eid: tuple(v) for eid, v in self._pending.items()}
+
+    # ---------- flushing ----------
+    def flush(self):
+        """Write pending deltas to Analytics. Returns the number of hits written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending, self._hits = self._pending, {}, 0
+            if not batch:
+                return 0
+
+            t0 = time.perf_counter()
+            try:
+                _write_deltas(batch)
+            except Exception:
+                logger.exception("Analytics counter flush failed; keeping %d event(s) for retry", len(batch))
+                self._requeue(batch)
+                self.stats["failed_flushes"] += 1
+                return 0
+
+            ms = (time.perf_counter() - t0) * 1000
+            written = sum(v + s for v, s in batch.values())
+            with self._lock:
+                self.stats["flushes"] += 1
+                self.stats["flushed_hits"] += written
+                self.stats["last_flush_ms"] = round(ms, 2)
+                self.stats["max_flush_ms"] = round(max(ms, self.stats["max_flush_ms"]), 2)
+                self.stats["last_flush_at"] = time.time()
+            return written
+
+    def _requeue(self, batch):
+        with self._lock:
+            for event_id, (views, shares) in batch.items():
+                slot = self._pending.get(event_id)
+                if slot is None:
+                    if len(self._pending) >= self.max_pending:
+                        self.stats["dropped"] += views + shares
+                        continue
+                    slot = self._pending[event_id] = [0, 0]
+                slot[0] += views
+                slot[1] += shares
+                self._hits += views + shares
+
+    def _ensure_timer(self, now=False):
+        # called with self._lock held
+        if now and self._timer is not None and self._timer.interval > 0:
+            self._timer.cancel()
+            self._timer = None
+        if self._timer is None and (now or self.flush_interval > 0):
+            self._timer = threading.Timer(0 if now else self.flush_interval, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            if self._timer is threading.current_thread():
+                self._timer = None
+        try:
+            self.flush()
+        finally:
+            connections.close_all()   # this thread's connections only
+        with self._lock:
+            if self._pending:
+                self._ensure_timer()
+
+    @contextmanager
+    def discarding(self):
+        """
+        Keep hits in memory for the duration of the block (no size or timer
+        flushes) and throw them away at the end - for benchmarks whose writes
+        are rolled back.
+        """
+        saved = self.flush_size, self.flush_interval
+        with self._lock:
+            self.flush_size, self.flush_interval = float("inf"), 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._pending, self._hits = {}, 0
+                self.flush_size, self.flush_interval = saved
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, pending_events=len(self._pending), pending_hits=self._hits)
+
+
+def _write_deltas(batch):
+    from analytics.models import Analytics
+    from analytics.rollups import rebuild_rollups, refresh_scores
+
+    with transaction.atomic():
+        missing = []
+        for event_id, (views, shares) in batch.items():
+            updated = Analytics.objects.filter(event_id=event_id).update(
+                views=F("views") + views, shares=F("shares") + shares)
+            if not updated:
+                missing.append(event_id)
+
+        if missing:
+            rebuild_rollups(event_ids=missing)
+            for event_id in missing:
+                views, shares = batch[event_id]
+                Analytics.objects.filter(event_id=event_id).update(
+                    views=F("views") + views, shares=F("shares") + shares)
+
+        refresh_scores(Analytics.objects.filter(event_id__in=list(batch)))
+
+
+buffer = CounterBuffer(
+    flush_size=getattr(settings, "ANALYTICS_COUNTER_FLUSH_SIZE", 500),
+    flush_interval=getattr(settings, "ANALYTICS_COUNTER_FLUSH_INTERVAL", 5.0),
+    max_pending=getattr(settings, "ANALYTICS_COUNTER_MAX_PENDING", 10000),
+)
+atexit.register(buffer.flush)
+
+
+def record_view(event_id):
+    buffer.record_view(event_id)
+
+
+def record_share(event_id):
+    buffer.record_share(event_id)
@@ -0,0 +1,31 @@
+# analytics/management/commands/rebuild_rollups.py
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.rollups import rebuild_rollups
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Recompute per-event engagement rollups from UGC, reviews and registrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true",
+                            help="Only report drift; exit with an error if any is found.")
+        parser.add_argument("--college", help="Limit to one college_id.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        qs = Event.objects.all()
+        if opts["college"]:
+            qs = qs.filter(college_id=opts["college"])
+
+        drift = rebuild_rollups(qs, dry_run=opts["check"], chunk_size=opts["chunk_size"])
+        for event_id, field, stored, fresh in drift:
+            self.stdout.write(f"{event_id}: {field} stored={stored!r} actual={fresh!r}")
+
+        if opts["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} drifted rollup value(s).")
+            self.stdout.write(self.style.SUCCESS("Rollups are consistent."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rollups rebuilt ({len(drift)} value(s) corrected)."))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_rename_pasword_userprofile_password'),
+        ('analytics', '0003_migrate_auth_to_userprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analytics',
+            name='last_activity',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='analytics',
+            name='last_user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.userprofile'),
+        ),
+        migrations.AddField(
+            model_name='analytics',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='analytics',
+            name='registrations_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='analytics',
+            name='reviews_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='analytics',
+            name='ugc_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
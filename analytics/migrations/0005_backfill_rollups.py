@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.db.models import Count, Max, Sum
+
+
+def backfill(apps, schema_editor):
+    """Fill the new rollup columns on existing rows (rebuild_rollups does the same later)."""
+    Analytics = apps.get_model("analytics", "Analytics")
+    UGC = apps.get_model("ugc", "UGC")
+    Review = apps.get_model("ugc", "Review")
+    Registration = apps.get_model("registrations", "Registration")
+
+    ugc = {r["event_id"]: r for r in UGC.objects.values("event_id").annotate(c=Count("pk"), m=Max("posted_on"))}
+    revs = {r["event_id"]: r for r in Review.objects.values("event_id")
+            .annotate(c=Count("pk"), s=Sum("rating"), m=Max("date_posted"))}
+    regs = dict(Registration.objects.values_list("event_id").annotate(c=Count("pk")))
+
+    for ana in Analytics.objects.all():
+        u, r = ugc.get(ana.event_id, {}), revs.get(ana.event_id, {})
+        ana.ugc_count = u.get("c", 0)
+        ana.reviews_count = r.get("c", 0)
+        ana.rating_sum = r.get("s") or 0
+        ana.registrations_count = regs.get(ana.event_id, 0)
+        ana.last_activity = max([d for d in (u.get("m"), r.get("m")) if d], default=None)
+        if ana.last_activity and ana.last_activity == u.get("m"):
+            latest = (UGC.objects.filter(event_id=ana.event_id, posted_on=ana.last_activity)
+                      .order_by("-ugc_id").first())
+        elif ana.last_activity:
+            latest = (Review.objects.filter(event_id=ana.event_id, date_posted=ana.last_activity)
+                      .order_by("-review_id").first())
+        else:
+            latest = None
+        ana.last_user_id = latest.user_id if latest else None
+
+        avg2 = (ana.rating_sum * 2) // ana.reviews_count if ana.reviews_count else 0
+        ana.engagement_score = (ana.ugc_count * 3 + ana.reviews_count * 4 + avg2
+                                + ana.views + ana.shares * 2)
+        ana.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_analytics_rollups'),
+        ('registrations', '0002_alter_registration_user'),
+        ('ugc', '0002_alter_photo_uploaded_by_alter_review_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
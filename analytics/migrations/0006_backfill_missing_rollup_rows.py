@@ -0,0 +1,30 @@
+import importlib
+
+from django.db import migrations
+
+backfill_rollups = importlib.import_module("analytics.migrations.0005_backfill_rollups").backfill
+
+
+def backfill(apps, schema_editor):
+    """Give every event an Analytics row (0005 only filled the rows that existed), then fill them all."""
+    Analytics = apps.get_model("analytics", "Analytics")
+    Event = apps.get_model("events", "Event")
+
+    have = set(Analytics.objects.values_list("event_id", flat=True))
+    missing = Event.objects.exclude(event_id__in=have).values_list("event_id", flat=True)
+    for event_id in missing:
+        Analytics.objects.create(event_id=event_id)     # analytics_id from core.sequences
+    backfill_rollups(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_backfill_rollups'),
+        ('core', '0001_initial'),
+        ('events', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -2,18 +2,11 @@
 from django.db import models
 from accounts.models import UserProfile          # ⬅ use your profile model
 from events.models import Event
+from core.sequences import next_id
 
 # ---------- ID generator ----------
 def generate_analytics_id():
-    last = Analytics.objects.order_by("analytics_id").last()
-    if last and last.analytics_id.startswith("ANL"):
-        try:
-            n = int(last.analytics_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"ANL{str(n).zfill(4)}"
+    return next_id("ANL")
 
 
 class Analytics(models.Model):
@@ -32,6 +25,20 @@ class Analytics(models.Model):
     shares = models.IntegerField(default=0)
     popular_event = models.CharField(max_length=20, blank=True)
 
+    # ---------- rollups (kept current by analytics.signals) ----------
+    ugc_count = models.IntegerField(default=0)
+    reviews_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    registrations_count = models.IntegerField(default=0)
+    last_activity = models.DateField(null=True, blank=True)
+    last_user = models.ForeignKey(
+        UserProfile,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
     # ⬇ switched to UserProfile
     users = models.ManyToManyField(
         UserProfile,
@@ -45,6 +52,10 @@ class Analytics(models.Model):
     def _str_(self):
         return self.analytics_id
 
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.reviews_count if self.reviews_count else 0
+
 
 class AnalyticsUser(models.Model):
     analytics = models.ForeignKey(
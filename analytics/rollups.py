@@ -0,0 +1,240 @@
+# analytics/rollups.py
+"""
+Per-event engagement rollups stored on ``Analytics``.
+
+Writes to UGC / Review / Registration adjust the counters with F() updates
+(see analytics.signals), so dashboards read ready-made numbers instead of
+scanning the content tables. ``rebuild_rollups`` recomputes everything from
+the source tables and is used both to backfill and to detect drift.
+"""
+from django.db.models import (
+    Case, CharField, Count, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+
+from core.sequences import allocate_ids
+from registrations.models import Registration
+from ugc.models import UGC, Review
+from .models import Analytics
+
+
+# fields rebuild_rollups compares / rewrites (last_user is informational only)
+ROLLUP_FIELDS = ("ugc_count", "reviews_count", "rating_sum", "registrations_count", "last_activity")
+
+
+def engagement_expr():
+    """engagement = ugc*3 + reviews*4 + int(avg_rating*2) + views + shares*2, in SQL."""
+    rating_part = Case(
+        When(reviews_count=0, then=Value(0)),
+        default=(F("rating_sum") * 2) / F("reviews_count"),
+        output_field=IntegerField(),
+    )
+    return (F("ugc_count") * 3 + F("reviews_count") * 4 + rating_part
+            + F("views") + F("shares") * 2)
+
+
+def refresh_scores(qs):
+    return qs.update(engagement_score=engagement_expr())
+
+
+# ---------- incremental maintenance ----------
+def _apply(event_id, day=None, user_id=None, **deltas):
+    """Add ``deltas`` to the event's counters; move last activity forward to ``day``."""
+    changes = {name: F(name) + n for name, n in deltas.items()}
+    if day is not None:
+        newer = Q(last_activity__isnull=True) | Q(last_activity__lte=day)
+        changes["last_activity"] = Case(When(newer, then=Value(day)), default=F("last_activity"))
+        changes["last_user"] = Case(When(newer, then=Value(user_id)), default=F("last_user"))
+
+    qs = Analytics.objects.filter(event_id=event_id)
+    if not qs.update(**changes):
+        return False
+    refresh_scores(qs)
+    return True
+
+
+def on_created(instance):
+    if isinstance(instance, UGC):
+        found = _apply(instance.event_id, instance.posted_on, instance.user_id, ugc_count=1)
+    elif isinstance(instance, Review):
+        found = _apply(instance.event_id, instance.date_posted, instance.user_id,
+                       reviews_count=1, rating_sum=instance.rating)
+    else:
+        found = _apply(instance.event_id, registrations_count=1)
+
+    if not found:
+        # first activity for this event: build its row from the tables
+        rebuild_rollups(event_ids=[instance.event_id])
+
+
+def on_bulk_registered(counts):
+    """
+    Registrations written with bulk_create (no post_save): ``counts`` is
+    {event_id: new registrations}. Call inside the writing transaction.
+    """
+    missing = [event_id for event_id, n in counts.items()
+               if n and not _apply(event_id, registrations_count=n)]
+    if missing:
+        rebuild_rollups(event_ids=missing)
+
+
+def on_deleted(instance):
+    # never create rows here: the event itself may be in the middle of a cascade delete
+    if isinstance(instance, UGC):
+        _apply(instance.event_id, ugc_count=-1)
+        day = instance.posted_on
+    elif isinstance(instance, Review):
+        _apply(instance.event_id, reviews_count=-1, rating_sum=-instance.rating)
+        day = instance.date_posted
+    else:
+        _apply(instance.event_id, registrations_count=-1)
+        return
+
+    # last activity can't be "decremented"; recompute it only when it may have moved
+    if Analytics.objects.filter(event_id=instance.event_id, last_activity=day).exists():
+        _refresh_activity(instance.event_id)
+
+
+def _refresh_activity(event_id):
+    from events.models import Event
+    ev = _event_stats(Event.objects.filter(pk=event_id)).first()
+    if ev is not None:
+        fresh = _fresh_values(ev)
+        Analytics.objects.filter(event_id=event_id).update(
+            last_activity=fresh["last_activity"], last_user=fresh["last_user_id"])
+
+
+# ---------- full recomputation ----------
+def _event_stats(events_qs):
+    """Annotate events with every rollup value using one correlated-subquery SELECT."""
+    ugc  = UGC.objects.filter(event=OuterRef("pk")).order_by().values("event")
+    revs = Review.objects.filter(event=OuterRef("pk")).order_by().values("event")
+    regs = Registration.objects.filter(event=OuterRef("pk")).order_by().values("event")
+
+    return events_qs.annotate(
+        s_ugc_count=Coalesce(Subquery(ugc.annotate(c=Count("pk")).values("c")), 0),
+        s_reviews_count=Coalesce(Subquery(revs.annotate(c=Count("pk")).values("c")), 0),
+        s_rating_sum=Coalesce(Subquery(revs.annotate(s=Sum("rating")).values("s")), 0),
+        s_registrations_count=Coalesce(Subquery(regs.annotate(c=Count("pk")).values("c")), 0),
+        s_last_ugc_dt=Subquery(ugc.annotate(m=Max("posted_on")).values("m")),
+        s_last_rev_dt=Subquery(revs.annotate(m=Max("date_posted")).values("m")),
+        s_last_ugc_user=Subquery(UGC.objects.filter(event=OuterRef("pk"))
+                                 .order_by("-posted_on", "-ugc_id").values("user_id")[:1]),
+        s_last_rev_user=Subquery(Review.objects.filter(event=OuterRef("pk"))
+                                 .order_by("-date_posted", "-review_id").values("user_id")[:1]),
+    )
+
+
+def _fresh_values(ev):
+    last_activity = max([d for d in (ev.s_last_ugc_dt, ev.s_last_rev_dt) if d], default=None)
+    if last_activity and ev.s_last_ugc_dt == last_activity:
+        last_user_id = ev.s_last_ugc_user
+    elif last_activity:
+        last_user_id = ev.s_last_rev_user
+    else:
+        last_user_id = None
+    return {
+        "ugc_count": ev.s_ugc_count,
+        "reviews_count": ev.s_reviews_count,
+        "rating_sum": ev.s_rating_sum,
+        "registrations_count": ev.s_registrations_count,
+        "last_activity": last_activity,
+        "last_user_id": last_user_id,
+    }
+
+
+def rebuild_rollups(events_qs=None, event_ids=None, dry_run=False, chunk_size=500):
+    """
+    Recompute rollups from the source tables.
+
+    Returns a list of ``(event_id, field, stored, fresh)`` tuples for every value
+    that differed (a missing Analytics row is reported with field ``"row"``,
+    unless the event has no activity to count).
+    With ``dry_run`` nothing is written.
+    """
+    from events.models import Event
+    if events_qs is None:
+        events_qs = Event.objects.all()
+    if event_ids is not None:
+        events_qs = events_qs.filter(pk__in=event_ids)
+
+    drift = []
+    batch = []
+    for ev in _event_stats(events_qs.order_by("pk")).iterator(chunk_size=chunk_size):
+        batch.append(ev)
+        if len(batch) >= chunk_size:
+            drift += _rebuild_batch(batch, dry_run)
+            batch = []
+    if batch:
+        drift += _rebuild_batch(batch, dry_run)
+    return drift
+
+
+def _rebuild_batch(events, dry_run):
+    ids = [ev.event_id for ev in events]
+    stored = {}
+    for ana in Analytics.objects.filter(event_id__in=ids).order_by("analytics_id"):
+        stored.setdefault(ana.event_id, ana)
+
+    drift, to_update, to_create = [], [], []
+    for ev in events:
+        fresh = _fresh_values(ev)
+        ana = stored.get(ev.event_id)
+        if ana is None:
+            # events without any activity simply haven't needed a row yet
+            if any(fresh.values()):
+                drift.append((ev.event_id, "row", None, "missing"))
+            to_create.append(Analytics(event_id=ev.event_id, **fresh))
+            continue
+        changed = False
+        for name in ROLLUP_FIELDS:
+            if getattr(ana, name) != fresh[name]:
+                drift.append((ev.event_id, name, getattr(ana, name), fresh[name]))
+                changed = True
+        if changed or ana.last_user_id != fresh["last_user_id"]:
+            for name, value in fresh.items():
+                setattr(ana, name, value)
+            to_update.append(ana)
+
+    if not dry_run:
+        if to_create:
+            for ana, aid in zip(to_create, allocate_ids("ANL", len(to_create))):
+                ana.analytics_id = aid
+            Analytics.objects.bulk_create(to_create)
+        if to_update:
+            Analytics.objects.bulk_update(to_update, list(ROLLUP_FIELDS) + ["last_user"])
+        if to_create or to_update:
+            refresh_scores(Analytics.objects.filter(event_id__in=ids))
+    return drift
+
+
+def ensure_rollups(events):
+    """Return {event_id: Analytics} for ``events``; rows missing so far are built once."""
+    ids = [ev.event_id for ev in events]
+    qs = Analytics.objects.filter(event_id__in=ids).select_related("last_user").order_by("analytics_id")
+    by_event = {}
+    for ana in qs:
+        by_event.setdefault(ana.event_id, ana)
+
+    missing = [eid for eid in ids if eid not in by_event]
+    if missing:
+        rebuild_rollups(event_ids=missing)
+        for ana in qs.filter(event_id__in=missing):
+            by_event.setdefault(ana.event_id, ana)
+    return by_event
+
+
+# ---------- popularity (run as a background job, see core.jobs) ----------
+def mark_popular(college_id):
+    """Flag the college's highest-engagement event popular_event="yes", every other one "no"."""
+    qs = Analytics.objects.filter(event__college_id=college_id)
+    # same tie-break as the analytics page: score, then title, then event id (highest wins)
+    top = (qs.order_by("-engagement_score", "-event__title", "-event_id")
+           .values_list("event_id", flat=True).first())
+    if top is None:
+        return 0
+    return qs.update(popular_event=Case(
+        When(event_id=top, then=Value("yes")),
+        default=Value("no"),
+        output_field=CharField(),
+    ))
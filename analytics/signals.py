@@ -0,0 +1,23 @@
+# analytics/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from registrations.models import Registration
+from ugc.models import UGC, Review
+from . import rollups
+
+
+@receiver(post_save, sender=UGC)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Registration)
+def rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    # edits (e.g. a rating changed in the admin) are picked up by rebuild_rollups
+    if created and not raw:
+        rollups.on_created(instance)
+
+
+@receiver(post_delete, sender=UGC)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Registration)
+def rollup_on_delete(sender, instance, **kwargs):
+    rollups.on_deleted(instance)
@@ -1,3 +1,27 @@
+import threading
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from .counters import CounterBuffer
+
+
+class CounterBufferTests(TestCase):
+    def test_full_buffer_is_flushed_off_the_request_thread(self):
+        buf = CounterBuffer(flush_size=3, flush_interval=60)
+        flushed = threading.Event()
+        callers = []
+
+        def fake_flush():
+            callers.append(threading.current_thread())
+            flushed.set()
+
+        with mock.patch.object(buf, "flush", side_effect=fake_flush), self.assertNumQueries(0):
+            for _ in range(3):
+                buf.record_view("EVT0001")
+            self.assertTrue(flushed.wait(5))
+        self.assertEqual(len(callers), 1)
+        self.assertIsNot(callers[0], threading.current_thread())
+        callers[0].join(5)
+        if buf._timer is not None:           # re-armed for the hits the fake flush left behind
+            buf._timer.cancel()
@@ -1,10 +1,9 @@
-# events/urls.py
+# analytics/urls.py
 from django.urls import path
 from . import views
 
-app_name = "events"
+app_name = "analytics"
 
 urlpatterns = [
-    # …your existing urls…
-    path("admin/analytics/", views.admin_analytics_view, name="admin_analytics"),
-]
\ No newline at end of file
+    path("counters/", views.counter_stats_view, name="counter_stats"),
+]
@@ -1,3 +1,12 @@
-from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from .counters import buffer
+
+
+@staff_member_required
+@require_GET
+def counter_stats_view(request):
+    """Buffered view/share counter health (site-wide, so staff only): flush latency, pending and dropped hits."""
+    return JsonResponse(buffer.snapshot())
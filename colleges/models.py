@@ -2,18 +2,12 @@ from django.db import models
 from django.utils import timezone
 from accounts.models import AdminProfile
 from django.db import models
-from django.db.models import IntegerField, Max
-from django.db.models.functions import Cast, Substr
+from core.sequences import next_id
 
 
 
 def generate_college_id():
-    # Look at numeric part of "COL0001" -> 1, get max, add 1
-    agg = (College.objects
-           .annotate(num=Cast(Substr('college_id', 4), IntegerField()))
-           .aggregate(mx=Max('num')))
-    next_num = (agg['mx'] or 0) + 1
-    return f"COL{next_num:04d}"
+    return next_id("COL")
 
 class College(models.Model):
     college_id  = models.CharField(max_length=20, primary_key=True, unique=True, default=generate_college_id)
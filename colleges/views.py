@@ -43,9 +43,9 @@ ADMIN_SESSION_KEY = "admin_id"  # this is what you set on admin login
 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.core.files.storage import default_storage
-from django.utils import timezone
 from django.views.decorators.http import require_http_methods
+from core import images
+from core.uploads import store_upload
 from .models import College
 
 @require_http_methods(["GET", "POST"])
@@ -58,9 +58,9 @@ def upload_college_logo(request, college_id):
             messages.error(request, "Please select an image.")
             return redirect("colleges:upload_college_logo", college_id=college_id)
 
-        # Save with timestamp to avoid conflicts
-        stamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-        path = default_storage.save(f"colleges/{college_id}/{stamp}_{f.name}", f)
+        # Streamed to disk under its content hash (re-uploads reuse the file)
+        path, _ = store_upload(f, "colleges/logos")
+        images.schedule(path)
         college.logo = path  # if your field is ImageField
         college.save(update_fields=["logo"])
         messages.success(request, "Logo updated.")
@@ -0,0 +1,17 @@
+# core/admin.py
+from django.contrib import admin
+from .models import IdSequence, Job
+
+
+@admin.register(IdSequence)
+class IdSequenceAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_value")
+    search_fields = ("name",)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "run_at", "created_at", "finished_at", "worker")
+    list_filter = ("status", "task")
+    search_fields = ("task", "key")
+    readonly_fields = ("created_at", "started_at", "finished_at", "last_error")
@@ -0,0 +1,41 @@
+# core/cache.py
+"""
+Namespace-versioned cache keys.
+
+Instead of hunting down every cached key when data changes, writers bump a
+namespace's version number; readers build keys that include the current
+version, so stale entries are simply never read again and expire on their own.
+
+A bump is only seen by processes that share the cache, so settings.CACHES
+points at a shared backend (files or Redis). A lost or evicted version
+key just starts a new version.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(namespace):
+    return f"ver:{namespace}"
+
+
+def get_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # a fresh timestamp can't collide with a version that was evicted
+        cache.add(_version_key(namespace), time.time_ns(), None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def bump_version(namespace):
+    try:
+        return cache.incr(_version_key(namespace))
+    except ValueError:
+        version = time.time_ns()
+        cache.set(_version_key(namespace), version, None)
+        return version
+
+
+def versioned_key(namespace, *parts):
+    return ":".join([namespace, f"v{get_version(namespace)}", *map(str, parts)])
@@ -0,0 +1,160 @@
+# core/images.py
+"""
+Resized, re-encoded copies ("derivatives") of uploaded images.
+
+Every image gets a thumb / card / full rendition in each format of
+IMAGE_DERIVATIVE_FORMATS that this Pillow build can write (AVIF and WebP by
+default), stored under ``derived/`` with the original's path:
+
+    events/images/ab/abcd....png -> derived/events/images/ab/abcd....card.webp
+
+Uploads queue a ``build_derivatives`` job (core.jobs); the
+``build_image_derivatives`` command backfills existing files. Templates use
+``{% picture %}`` (core.templatetags.media_tags), which falls back to the
+original file until the derivatives exist.
+"""
+import hashlib
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .jobs import enqueue
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = "derived"
+
+# name -> max width in px (never upscaled)
+SIZES = {"thumb": 160, "card": 480, "full": 1280}
+
+QUALITY = {"avif": 55, "webp": 80, "jpeg": 82}
+MIME = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp", ".tif", ".tiff")
+
+
+def _supported_formats():
+    wanted = getattr(settings, "IMAGE_DERIVATIVE_FORMATS", ("avif", "webp"))
+    usable = [fmt for fmt in wanted if fmt == "jpeg" or features.check(fmt)]
+    return tuple(usable) or ("jpeg",)
+
+
+FORMATS = _supported_formats()      # best first; the last one goes in <img src>
+
+
+def is_image_path(path):
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
+
+def derivative_path(path, size, fmt):
+    stem = os.path.splitext(path.replace("\\", "/").lstrip("/"))[0]
+    return f"{DERIVED_DIR}/{stem}.{size}.{fmt}"
+
+
+def all_derivative_paths(path):
+    if not is_image_path(path):
+        return []
+    return [derivative_path(path, size, fmt) for size in SIZES for fmt in FORMATS]
+
+
+def _marker(path):
+    # written last by generate(), so its presence means the whole set exists
+    return derivative_path(path, list(SIZES)[-1], FORMATS[-1])
+
+
+def _cache_key(path):
+    # file names can contain spaces etc., which some cache backends reject
+    return "derivatives:" + hashlib.md5(path.encode("utf-8")).hexdigest()
+
+
+def has_derivatives(path, storage=None):
+    """True once every derivative of ``path`` is on disk (cached; originals never change)."""
+    found = cache.get(_cache_key(path))
+    if found is None:
+        found = (storage or default_storage).exists(_marker(path))
+        cache.set(_cache_key(path), found, None if found else 60)
+    return found
+
+
+def forget(path):
+    cache.delete(_cache_key(path))
+
+
+class BadImage(Exception):
+    """The original can't be decoded: not an image, truncated, or a decompression bomb."""
+
+
+def _encode(img, fmt):
+    if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format=fmt.upper(), quality=QUALITY[fmt])
+    return buf.getvalue()
+
+
+def generate(path, storage=None, force=False):
+    """
+    Write the missing derivatives of ``path``. Returns ``(files written,
+    bytes written)``; raises BadImage when the file can't be decoded.
+    """
+    storage = storage or default_storage
+    if not force and storage.exists(_marker(path)):
+        return 0, 0
+
+    with storage.open(path, "rb") as fh:
+        try:
+            original = Image.open(fh)
+            original.load()
+            original = ImageOps.exif_transpose(original)
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+            # OSError here is Pillow's "image file is truncated" and friends
+            raise BadImage(f"{type(exc).__name__}: {exc}") from exc
+    if original.mode == "P":
+        original = original.convert("RGBA")
+    elif original.mode not in ("RGB", "RGBA", "L", "LA"):
+        original = original.convert("RGB")
+
+    written = nbytes = 0
+    for size, width in SIZES.items():
+        img = original.copy()
+        if img.width > width:
+            img.thumbnail((width, round(img.height * width / img.width)), Image.LANCZOS)
+        for fmt in FORMATS:
+            target = derivative_path(path, size, fmt)
+            if storage.exists(target):
+                if not force:
+                    continue
+                storage.delete(target)
+            data = _encode(img, fmt)
+            storage.save(target, ContentFile(data))
+            written += 1
+            nbytes += len(data)
+    cache.set(_cache_key(path), True, None)
+    return written, nbytes
+
+
+def build_derivatives(path):
+    """Job entry point: like generate(), but a file that can't be decoded is not worth retrying."""
+    try:
+        generate(path)
+    except BadImage as exc:
+        logger.warning("No derivatives built for %s (%s)", path, exc)
+
+
+def schedule(path):
+    """Queue derivative generation for a stored upload; the request doesn't wait for it."""
+    if path and is_image_path(path):
+        enqueue(build_derivatives, path, key=_cache_key(path))
+
+
+def derivative_set(path):
+    """{fmt: {size: storage path}} for templates, or None if not generated yet."""
+    if not has_derivatives(path):
+        return None
+    return {fmt: {size: derivative_path(path, size, fmt) for size in SIZES} for fmt in FORMATS}
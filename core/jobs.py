@@ -0,0 +1,178 @@
+# core/jobs.py
+"""
+A small database-backed job queue.
+
+Views call ``enqueue(func, *args)`` and return; the row is written in the
+request's transaction, so a job only becomes visible if the request commits.
+``python manage.py run_jobs`` claims due jobs one at a time with a
+conditional UPDATE (works on SQLite and Postgres alike), runs them, and on
+failure reschedules with exponential backoff until ``max_attempts`` is used
+up. Jobs stuck in "running" longer than JOBS_LEASE_SECONDS (a worker died)
+are handed out again. ``job_stats`` reports depth and latency.
+
+Arguments must be JSON-serialisable; tasks should be idempotent because a
+job can run more than once.
+"""
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, "JOBS_MAX_ATTEMPTS", 5)
+BACKOFF_BASE = getattr(settings, "JOBS_BACKOFF_BASE", 5.0)        # seconds, doubled per attempt
+BACKOFF_MAX = getattr(settings, "JOBS_BACKOFF_MAX", 3600.0)
+LEASE_SECONDS = getattr(settings, "JOBS_LEASE_SECONDS", 600)
+
+
+def task_path(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue(func, *args, delay=0, key="", max_attempts=None, **kwargs):
+    """
+    Queue ``func(*args, **kwargs)``. With ``key``, a job that is still queued
+    under the same key is reused instead of adding a duplicate.
+    """
+    if key:
+        existing = Job.objects.filter(key=key, status=Job.QUEUED).first()
+        if existing:
+            return existing
+    return Job.objects.create(
+        task=task_path(func),
+        args=list(args),
+        kwargs=kwargs,
+        key=key,
+        max_attempts=max_attempts or MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def backoff(attempt):
+    """Seconds to wait before retry number ``attempt`` (1-based), with +-20% jitter."""
+    return min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX) * random.uniform(0.8, 1.2)
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ---------- worker side ----------
+def requeue_stale(now=None):
+    now = now or timezone.now()
+    return Job.objects.filter(
+        status=Job.RUNNING, started_at__lt=now - timedelta(seconds=LEASE_SECONDS),
+    ).update(status=Job.QUEUED, worker="", run_at=now)
+
+
+def claim(worker, now=None):
+    """Atomically take the next due job, or return None if nothing is due."""
+    now = now or timezone.now()
+    due = (Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+           .order_by("run_at", "id").values_list("pk", flat=True)[:10])
+    for pk in due:
+        # another worker may win the race for this row; then try the next one
+        taken = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, worker=worker, started_at=now, attempts=F("attempts") + 1)
+        if taken:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run(job):
+    """Execute a claimed job and record the outcome. Returns True on success."""
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc(limit=20)
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s (%s) failed for good:\n%s", job.pk, job.task, error)
+            Job.objects.filter(pk=job.pk).update(status=Job.FAILED, finished_at=now, last_error=error)
+        else:
+            delay = backoff(job.attempts)
+            logger.warning("Job %s (%s) failed, retry %d in %.0fs", job.pk, job.task, job.attempts, delay)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED, worker="", last_error=error,
+                run_at=now + timedelta(seconds=delay))
+        return False
+    Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=timezone.now(), last_error="")
+    return True
+
+
+def work(worker=None, burst=False, sleep=1.0, max_jobs=None, stop=None):
+    """
+    Process jobs until ``max_jobs`` ran, ``stop()`` returns True, or - with
+    ``burst`` - the queue has nothing due. Returns the number of jobs run.
+    """
+    worker = worker or default_worker_name()
+    done = 0
+    last_reap = 0.0
+    while not (stop and stop()):
+        close_old_connections()
+        if time.monotonic() - last_reap > 60:
+            requeue_stale()
+            last_reap = time.monotonic()
+        job = claim(worker)
+        if job is None:
+            if burst:
+                break
+            time.sleep(sleep)
+            continue
+        run(job)
+        done += 1
+        if max_jobs and done >= max_jobs:
+            break
+    return done
+
+
+# ---------- inspection ----------
+def stats(sample=500):
+    """
+    Queue depth by status plus wait (due -> started) and run latency (ms)
+    over the last ``sample`` finished jobs.
+    """
+    now = timezone.now()
+    counts = {status: 0 for status, _ in Job.STATUS_CHOICES}
+    for row in Job.objects.values("status").order_by().annotate(n=Count("id")):
+        counts[row["status"]] = row["n"]
+
+    oldest = (Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+              .order_by("run_at").values_list("run_at", flat=True).first())
+    finished = list(Job.objects.filter(status=Job.DONE)
+                    .order_by("-finished_at")
+                    .values_list("run_at", "started_at", "finished_at")[:sample])
+    # wait counts from when the job was due, so a delay=... isn't mistaken for queueing
+    waits = sorted(max(0.0, (s - r).total_seconds() * 1000) for r, s, _ in finished)
+    runs = sorted((f - s).total_seconds() * 1000 for _, s, f in finished)
+
+    def pct(values, p):
+        return round(values[min(len(values) - 1, int(len(values) * p))], 1) if values else None
+
+    return {
+        "counts": counts,
+        "due": Job.objects.filter(status=Job.QUEUED, run_at__lte=now).count(),
+        "oldest_due_age_s": round((now - oldest).total_seconds(), 1) if oldest else None,
+        "wait_ms": {"p50": pct(waits, 0.5), "p95": pct(waits, 0.95)},
+        "run_ms": {"p50": pct(runs, 0.5), "p95": pct(runs, 0.95)},
+        "by_task": list(Job.objects.filter(status__in=[Job.QUEUED, Job.FAILED])
+                        .values("task", "status").order_by("task", "status").annotate(n=Count("id"))),
+    }
+
+
+def purge(days=7):
+    """Delete finished (done) jobs older than ``days``."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()[0]
@@ -0,0 +1,132 @@
+# core/keyset.py
+"""
+Keyset ("seek") pagination.
+
+Pages are addressed by the sort key of the last row already shown instead of
+an OFFSET, so page 1000 costs the same as page 1. Cursors are signed so a
+client can't hand us arbitrary filter values. NULLs always sort last.
+"""
+import datetime
+import hashlib
+import json
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
+_SALT = "core.keyset"
+
+
+def _order_expr(model, spec):
+    name = spec.lstrip("-")
+    # only nullable columns need NULLS LAST; plain ones keep index-friendly ORDER BY
+    nulls_last = True if model._meta.get_field(name).null else None
+    if spec.startswith("-"):
+        return F(name).desc(nulls_last=nulls_last)
+    return F(name).asc(nulls_last=nulls_last)
+
+
+def _value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def encode_cursor(row, ordering):
+    values = [_value(row, spec.lstrip("-")) for spec in ordering]
+    return signing.dumps(values, salt=_SALT, compress=True, serializer=_JSONSerializer)
+
+
+def decode_cursor(token, model, ordering):
+    """Return the cursor's values as Python objects, or None if it's missing/invalid."""
+    if not token:
+        return None
+    try:
+        raw = signing.loads(token, salt=_SALT, serializer=_JSONSerializer)
+    except signing.BadSignature:
+        return None
+    if not isinstance(raw, list) or len(raw) != len(ordering):
+        return None
+    values = []
+    for spec, value in zip(ordering, raw):
+        field = model._meta.get_field(spec.lstrip("-"))
+        values.append(None if value is None else field.to_python(value))
+    return values
+
+
+def cursor_key(values):
+    """Short stable string for decoded cursor values (None: the first page), e.g. for cache keys."""
+    if values is None:
+        return "first"
+    return hashlib.sha256(_JSONSerializer().dumps(values)).hexdigest()[:32]
+
+
+def _after(model, spec, value, nulls=True):
+    """Rows strictly after ``value`` in the direction of ``spec``."""
+    name = spec.lstrip("-")
+    if value is None:
+        return Q(pk__in=[])          # nothing sorts after NULL
+    lookup = "lt" if spec.startswith("-") else "gt"
+    cond = Q(**{f"{name}__{lookup}": value})
+    if nulls and model._meta.get_field(name).null:
+        cond |= Q(**{f"{name}__isnull": True})
+    return cond
+
+
+def _equal(name, value):
+    return Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+
+
+def keyset_filter(model, ordering, values, lead_nulls=True):
+    """Q for rows after ``values``; ``lead_nulls=False`` leaves out the NULL tail of the first column."""
+    cond = Q(pk__in=[])
+    prefix = Q()
+    for i, (spec, value) in enumerate(zip(ordering, values)):
+        cond |= prefix & _after(model, spec, value, nulls=lead_nulls or i > 0)
+        prefix &= _equal(spec.lstrip("-"), value)
+    return cond
+
+
+def keyset_page(qs, ordering, cursor=None, size=20):
+    """
+    Return ``(rows, next_cursor)`` for the page after ``cursor``.
+
+    ``ordering`` must end in a unique column (usually the pk) so every row has
+    exactly one position. ``next_cursor`` is None on the last page.
+    """
+    model = qs.model
+    qs = qs.order_by(*[_order_expr(model, s) for s in ordering])
+    values = decode_cursor(cursor, model, ordering)
+    lead = ordering[0].lstrip("-")
+
+    if values is None:
+        rows = list(qs[:size + 1])
+    elif values[0] is not None and model._meta.get_field(lead).null:
+        # "x < v OR x IS NULL" defeats an index range scan, so seek through the
+        # non-NULL range first and only then continue into the NULL tail
+        bound = Q(**{f"{lead}__{'lte' if ordering[0].startswith('-') else 'gte'}": values[0]})
+        rows = list(qs.filter(bound, keyset_filter(model, ordering, values, lead_nulls=False))[:size + 1])
+        if len(rows) <= size:
+            rows += list(qs.filter(**{f"{lead}__isnull": True})[:size + 1 - len(rows)])
+    else:
+        rows = list(qs.filter(keyset_filter(model, ordering, values))[:size + 1])
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1], ordering)
+    return rows, next_cursor
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder rounds to milliseconds; cursors need exact equality
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _JSONSerializer:
+    def dumps(self, obj):
+        return _CursorEncoder(separators=(",", ":")).encode(obj).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data.decode("utf-8"))
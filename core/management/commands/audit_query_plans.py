@@ -0,0 +1,42 @@
+# core/management/commands/audit_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from core.query_audit import HOT_QUERIES, explain
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every query registered with core.query_audit.hot_query and fail "
+        "if any of them reads a table without an index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="Only these queries (default: all).")
+        parser.add_argument("--plans", action="store_true", help="Print the full plan of every query.")
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **opts):
+        autodiscover_modules("views")          # the views register their query builders
+        names = opts["names"] or sorted(HOT_QUERIES)
+        unknown = [n for n in names if n not in HOT_QUERIES]
+        if unknown:
+            raise CommandError(f"Unknown query: {', '.join(unknown)}")
+
+        failed = []
+        for name in names:
+            lines, scans, sorts = explain(name, using=opts["database"])
+            if scans:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {', '.join(scans)}"))
+            elif sorts:
+                self.stdout.write(self.style.WARNING(f"sort       {name}"))
+            else:
+                self.stdout.write(f"ok         {name}")
+            if opts["plans"] or scans:
+                for line in lines:
+                    self.stdout.write(f"    {line}")
+
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(names)} hot queries do a full table scan.")
+        self.stdout.write(self.style.SUCCESS(f"{len(names)} hot queries use indexes."))
@@ -0,0 +1,207 @@
+# core/management/commands/bench_views.py
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from accounts.activity import invalidate_user_activity
+from analytics.counters import buffer as counter_buffer
+from colleges.models import College
+from core.cache import bump_version
+from events.models import Event
+from events.signals import EVENTS_CACHE_NAMESPACE, event_detail_namespace
+from foreverfest.db_profiles import describe
+from registrations.models import Registration
+from registrations.stats import invalidate_college_stats
+from search.autocomplete import CACHE_NAMESPACE as AUTOCOMPLETE_NAMESPACE
+from ugc.models import UGC, Photo, Review
+
+# (label, url name, url args key, who is logged in, query string)
+SCENARIOS = (
+    ("events_page", "events:events_page", None, "anon", ""),
+    ("event_detail", "events:event_detail", "event", "anon", ""),
+    ("event_hub", "ugc:event_hub", "event", "user", ""),
+    ("search_suggest", "search_suggest", None, "anon", "q=fe"),
+    ("admin_dashboard", "admin_dashboard", None, "admin", ""),
+    ("admin_analytics", "events:admin_analytics", None, "admin", ""),
+    ("admin_registrations", "registrations:admin_registrations_overview", None, "admin", ""),
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * p))], 2) if values else None
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the hot pages against the current database (load one with "
+        "seed_data first) and check each request's SQL query count against the "
+        "view's @query_budget. Everything the requests write is rolled back. "
+        "Writes a JSON report; --compare prints the change "
+        "against an earlier report. Exits non-zero when a view goes over budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Warm requests per view.")
+        parser.add_argument("--college", help="college_id to benchmark (default: the one with most events).")
+        parser.add_argument("--only", help="Comma-separated scenario labels.")
+        parser.add_argument("--output", help="Report path (default bench_results/views-<time>.json).")
+        parser.add_argument("--compare", help="Earlier report to compare against.")
+
+    def handle(self, *args, **opts):
+        college = self._college(opts["college"])
+        event = (Event.objects.filter(college=college).annotate(n=Count("registrations"))
+                 .order_by("-n", "event_id").first())
+        if event is None:
+            raise CommandError(f"{college.college_id} has no events; run seed_data first.")
+        reg = Registration.objects.filter(event=event).select_related("user").first()
+        ids = {"admin": college.owner_admin.admin_id if college.owner_admin else None,
+               "user": reg.user.pk if reg else None}
+
+        only = {s.strip() for s in (opts["only"] or "").split(",") if s.strip()}
+        results = {}
+        # sessions, view counts and queued jobs the requests create are not kept
+        try:
+            with transaction.atomic(), counter_buffer.discarding():
+                for label, name, arg, who, query in SCENARIOS:
+                    if only and label not in only:
+                        continue
+                    if who != "anon" and not ids[who]:
+                        self.stdout.write(self.style.WARNING(f"{label}: skipped, no {who} to log in as"))
+                        continue
+                    url = reverse(name, args=[event.event_id] if arg == "event" else [])
+                    self._go_cold(college, event, ids)
+                    results[label] = self._bench(self._client(who, ids), url, query, opts["repeat"])
+                    self._print(label, results[label])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        report = {
+            "meta": {
+                "at": timezone.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "database": describe(connection),
+                "repeat": opts["repeat"],
+                "college": college.college_id,
+                "event": event.event_id,
+                "dataset": {
+                    "colleges": College.objects.count(),
+                    "events": Event.objects.count(),
+                    "registrations": Registration.objects.count(),
+                    "ugc": UGC.objects.count(),
+                    "photos": Photo.objects.count(),
+                    "reviews": Review.objects.count(),
+                },
+            },
+            "views": results,
+        }
+        path = Path(opts["output"] or Path(settings.BASE_DIR) / "bench_results"
+                    / f"views-{timezone.now():%Y%m%d-%H%M%S}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(f"Report written to {path}")
+
+        if opts["compare"]:
+            self._compare(json.loads(Path(opts["compare"]).read_text()), report)
+
+        over = [label for label, r in results.items() if not r["within_budget"]]
+        if over:
+            raise CommandError(f"Over query budget: {', '.join(over)}")
+        self.stdout.write(self.style.SUCCESS("All views within their query budgets."))
+
+    # ---------- setup ----------
+    def _college(self, college_id):
+        if college_id:
+            college = College.objects.select_related("owner_admin").filter(college_id=college_id).first()
+            if college is None:
+                raise CommandError(f"No college {college_id}.")
+            return college
+        college = (College.objects.select_related("owner_admin").annotate(n=Count("events"))
+                   .order_by("-n", "college_id").first())
+        if college is None:
+            raise CommandError("The database has no colleges; run seed_data first.")
+        return college
+
+    def _client(self, who, ids):
+        client = Client(SERVER_NAME="localhost")
+        if who != "anon":
+            session = client.session
+            session["admin_id" if who == "admin" else "user_id"] = ids[who]
+            session.save()
+        return client
+
+    def _go_cold(self, college, event, ids):
+        # new versions instead of cache.clear(): the cache is shared with the running site
+        for namespace in (EVENTS_CACHE_NAMESPACE, AUTOCOMPLETE_NAMESPACE, event_detail_namespace(event.event_id)):
+            bump_version(namespace)
+        invalidate_college_stats(college.college_id)
+        if ids["user"]:
+            invalidate_user_activity(ids["user"])
+
+    # ---------- measuring ----------
+    def _get(self, client, url, query):
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            resp = client.get(url, QUERY_STRING=query)
+            ms = (time.perf_counter() - t0) * 1000
+        if resp.status_code != 200:
+            raise CommandError(f"GET {url}?{query} returned {resp.status_code}")
+        return ms, len(ctx.captured_queries)
+
+    def _bench(self, client, url, query, repeat):
+        budget = getattr(resolve(url).func, "query_budget", None)
+        cold_ms, cold_queries = self._get(client, url, query)
+        runs = [self._get(client, url, query) for _ in range(repeat)]
+        ms = [r[0] for r in runs]
+        queries = [r[1] for r in runs]
+        most = max([cold_queries, *queries])
+        return {
+            "url": f"{url}?{query}" if query else url,
+            "budget": budget,
+            "cold": {"ms": round(cold_ms, 2), "queries": cold_queries},
+            "ms": {"p50": _pct(ms, 0.5), "p95": _pct(ms, 0.95), "max": round(max(ms), 2) if ms else None},
+            "queries": {"min": min(queries, default=cold_queries), "max": most},
+            "within_budget": budget is None or most <= budget,
+        }
+
+    def _print(self, label, r):
+        line = (f"{label:<20} cold {r['cold']['ms']:7.1f} ms / {r['cold']['queries']:>2} q   "
+                f"warm p50 {r['ms']['p50'] or 0:7.1f} ms  p95 {r['ms']['p95'] or 0:7.1f} ms   "
+                f"queries {r['queries']['min']}-{r['queries']['max']} (budget {r['budget']})")
+        self.stdout.write(line if r["within_budget"] else self.style.ERROR(line))
+
+    def _compare(self, before, after):
+        self.stdout.write(f"Compared with {before['meta'].get('commit')} ({before['meta'].get('at')}):")
+        for label, r in after["views"].items():
+            old = before["views"].get(label)
+            if not old:
+                self.stdout.write(f"  {label:<20} new")
+                continue
+            p50, old_p50 = r["ms"]["p50"] or 0, old["ms"]["p50"] or 0
+            change = f"{(p50 - old_p50) / old_p50 * 100:+.0f}%" if old_p50 else "n/a"
+            self.stdout.write(
+                f"  {label:<20} p50 {old_p50:7.1f} -> {p50:7.1f} ms ({change})   "
+                f"queries {old['queries']['max']} -> {r['queries']['max']}")
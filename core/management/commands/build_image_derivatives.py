@@ -0,0 +1,61 @@
+# core/management/commands/build_image_derivatives.py
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core import images
+
+DEFAULT_DIRS = ("events", "ugc", "colleges", "college_logos")
+
+
+def _walk(storage, top):
+    try:
+        dirs, files = storage.listdir(top)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f"{top}/{name}"
+    for name in dirs:
+        if f"{top}/{name}" != images.DERIVED_DIR:
+            yield from _walk(storage, f"{top}/{name}")
+
+
+class Command(BaseCommand):
+    help = "Build thumb/card/full derivatives for images already in MEDIA_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dirs", nargs="*", help=f"Media sub-directories (default: {' '.join(DEFAULT_DIRS)}).")
+        parser.add_argument("--force", action="store_true", help="Re-encode derivatives that already exist.")
+        parser.add_argument("--dry-run", action="store_true", help="Only list the images that would be processed.")
+
+    def handle(self, *args, **opts):
+        storage = default_storage
+        paths = [p for top in (opts["dirs"] or DEFAULT_DIRS)
+                 for p in _walk(storage, top.strip("/")) if images.is_image_path(p)]
+        self.stdout.write(f"{len(paths)} image(s); formats: {', '.join(images.FORMATS)}")
+
+        built = skipped = failed = 0
+        original_bytes = card_bytes = 0
+        for path in paths:
+            if opts["dry_run"]:
+                self.stdout.write(f"  {path}")
+                continue
+            try:
+                written, _ = images.generate(path, storage=storage, force=opts["force"])
+            except (images.BadImage, OSError) as exc:
+                failed += 1
+                self.stderr.write(f"  {path}: {exc}")
+                continue
+            built += bool(written)
+            skipped += not written
+            original_bytes += storage.size(path)
+            card_bytes += storage.size(images.derivative_path(path, "card", images.FORMATS[-1]))
+
+        if opts["dry_run"]:
+            return
+        self.stdout.write(f"built {built}, already done {skipped}, failed {failed}")
+        if original_bytes:
+            self.stdout.write(
+                f"originals {original_bytes / 1024:.0f} KiB -> card {images.FORMATS[-1]} "
+                f"{card_bytes / 1024:.0f} KiB ({original_bytes / max(card_bytes, 1):.1f}x smaller)"
+            )
+        self.stdout.write(self.style.SUCCESS("Image derivatives up to date."))
@@ -0,0 +1,43 @@
+# core/management/commands/job_stats.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from core import jobs
+from core.models import Job
+
+
+class Command(BaseCommand):
+    help = "Show background job queue depth and latency; optionally retry failures or purge old jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Print the raw stats as JSON.")
+        parser.add_argument("--failed", action="store_true", help="List failed jobs with their last error line.")
+        parser.add_argument("--retry-failed", action="store_true", help="Queue failed jobs again.")
+        parser.add_argument("--purge-days", type=int, default=None,
+                            help="Delete done jobs that finished more than N days ago.")
+
+    def handle(self, *args, **opts):
+        if opts["retry_failed"]:
+            n = Job.objects.filter(status=Job.FAILED).update(status=Job.QUEUED, attempts=0, worker="")
+            self.stdout.write(f"re-queued {n} failed job(s)")
+        if opts["purge_days"] is not None:
+            self.stdout.write(f"purged {jobs.purge(opts['purge_days'])} done job(s)")
+
+        data = jobs.stats()
+        if opts["json"]:
+            self.stdout.write(json.dumps(data, indent=2))
+            return
+
+        self.stdout.write("  ".join(f"{status}={n}" for status, n in data["counts"].items()))
+        oldest = data["oldest_due_age_s"]
+        self.stdout.write(f"due now: {data['due']}  oldest due: {'-' if oldest is None else f'{oldest}s'}")
+        self.stdout.write(f"wait ms p50/p95: {data['wait_ms']['p50']}/{data['wait_ms']['p95']}  "
+                          f"run ms p50/p95: {data['run_ms']['p50']}/{data['run_ms']['p95']}")
+        for row in data["by_task"]:
+            self.stdout.write(f"  {row['status']:<7} {row['n']:>6}  {row['task']}")
+
+        if opts["failed"]:
+            for job in Job.objects.filter(status=Job.FAILED).order_by("-finished_at")[:50]:
+                last = (job.last_error.strip().splitlines() or [""])[-1]
+                self.stdout.write(f"  #{job.pk} {job.task} x{job.attempts}: {last}")
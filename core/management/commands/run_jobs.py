@@ -0,0 +1,34 @@
+# core/management/commands/run_jobs.py
+import logging
+import signal
+
+from django.core.management.base import BaseCommand
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (core.jobs). Stops cleanly on SIGINT/SIGTERM."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--burst", action="store_true", help="Exit once nothing is due.")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Idle poll interval in seconds.")
+        parser.add_argument("--max-jobs", type=int, default=None, help="Exit after this many jobs.")
+        parser.add_argument("--name", default=None, help="Worker name (default host:pid).")
+
+    def handle(self, *args, **opts):
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+        stopping = []
+
+        def _stop(signum, frame):
+            self.stdout.write("finishing current job, then stopping ...")
+            stopping.append(signum)
+
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGTERM, _stop)
+
+        name = opts["name"] or jobs.default_worker_name()
+        self.stdout.write(f"worker {name} started")
+        done = jobs.work(worker=name, burst=opts["burst"], sleep=opts["sleep"],
+                         max_jobs=opts["max_jobs"], stop=lambda: bool(stopping))
+        self.stdout.write(self.style.SUCCESS(f"worker {name} ran {done} job(s)"))
@@ -0,0 +1,219 @@
+# core/management/commands/seed_data.py
+import io
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import AdminProfile, UserProfile, normalize_login_name
+from colleges.models import College
+from core import images
+from core.cache import bump_version
+from core.sequences import allocate_ids
+from core.uploads import media_url
+from events.models import Event
+from events.signals import EVENTS_CACHE_NAMESPACE
+from registrations.models import Invoice, Payment, Registration
+from registrations.services import GATEWAYS, PLAN_PRICES
+from registrations.stats import invalidate_college_stats
+from search.autocomplete import CACHE_NAMESPACE as AUTOCOMPLETE_NAMESPACE
+from ugc.models import UGC, Photo, Review
+
+SEED_DOMAIN = "seed.invalid"          # every seeded account uses it; --flush keys off it
+SEED_PASSWORD = "seed-password"
+
+CITIES = ("Mumbai", "Pune", "Delhi", "Bengaluru", "Chennai", "Hyderabad", "Kolkata", "Jaipur", "Indore", "Nagpur")
+KINDS = ("Tech Fest", "Hackathon", "Cultural Night", "Music Fest", "Robotics Expo", "Quiz Bowl",
+         "Startup Summit", "Dance Battle", "Film Festival", "Sports Meet", "Literature Fest", "Gaming Cup")
+WORDS = ("great", "crowd", "stage", "music", "food", "team", "lights", "fun", "speakers", "venue",
+         "energy", "prizes", "workshop", "talks", "night", "organised", "loved", "amazing")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed colleges, admins, events, users, registrations (with invoices and "
+        "payments), UGC posts, photos and reviews at realistic ratios for load "
+        "and benchmark runs. Popularity is skewed: a few events get most of the "
+        f"traffic. Seeded users log in with password {SEED_PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--colleges", type=int, default=20)
+        parser.add_argument("--events-per-college", type=int, default=50)
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--registrations-per-event", type=int, default=25, help="Average; skewed per event.")
+        parser.add_argument("--ugc-per-event", type=int, default=4, help="Average; skewed per event.")
+        parser.add_argument("--reviews-per-event", type=int, default=4, help="Average; skewed per event.")
+        parser.add_argument("--photo-share", type=float, default=0.6, help="Share of UGC posts that carry a photo.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=1, help="Random seed, so runs are repeatable.")
+        parser.add_argument("--flush", action="store_true", help="Delete previously seeded rows first.")
+
+    def handle(self, *args, **opts):
+        self.rng = random.Random(opts["seed"])
+        self.batch = opts["batch_size"]
+        t0 = time.perf_counter()
+        if opts["flush"]:
+            self._flush()
+
+        password = make_password(SEED_PASSWORD)      # hashed once, shared by every seeded account
+        colleges = self._colleges(opts["colleges"], password)
+        events = self._events(colleges, opts["events_per_college"])
+        users = self._users(opts["users"], password)
+        weights = self._popularity(len(events))
+        regs = self._registrations(events, users, weights, opts["registrations_per_event"])
+        ugc, photos = self._ugc(events, users, weights, opts["ugc_per_event"], opts["photo_share"])
+        reviews = self._reviews(events, users, weights, opts["reviews_per_event"])
+
+        # bulk_create skips the post_save hooks that normally invalidate these
+        bump_version(EVENTS_CACHE_NAMESPACE)
+        bump_version(AUTOCOMPLETE_NAMESPACE)
+        for college in colleges:
+            invalidate_college_stats(college.college_id)
+        out = io.StringIO()               # one line per new event; keep only the summary
+        call_command("rebuild_rollups", stdout=out)
+        self.stdout.write(out.getvalue().strip().splitlines()[-1])
+        self.stdout.write(
+            f"colleges {len(colleges)}, events {len(events)}, users {len(users)}, registrations {regs}, "
+            f"ugc {ugc} ({photos} photos), reviews {reviews} in {time.perf_counter() - t0:.1f}s"
+        )
+        self.stdout.write(self.style.SUCCESS("Seed data loaded."))
+
+    # ---------- helpers ----------
+    def _bulk(self, model, rows):
+        rows = list(rows)
+        for i in range(0, len(rows), self.batch):
+            with transaction.atomic():
+                model.objects.bulk_create(rows[i:i + self.batch], batch_size=500)
+        return rows
+
+    def _popularity(self, n):
+        # Zipf-like: rank r gets weight 1/r, shuffled so the hot events are spread over colleges
+        weights = [1.0 / (rank + 1) for rank in range(n)]
+        self.rng.shuffle(weights)
+        return weights
+
+    def _counts(self, weights, average):
+        total = average * len(weights)
+        scale = total / sum(weights)
+        return [int(w * scale) for w in weights]
+
+    def _flush(self):
+        College.objects.filter(owner_admin__email__endswith=f"@{SEED_DOMAIN}").delete()
+        UserProfile.objects.filter(email__endswith=f"@{SEED_DOMAIN}").delete()
+        AdminProfile.objects.filter(email__endswith=f"@{SEED_DOMAIN}").delete()
+        self.stdout.write("Previous seed data removed.")
+
+    # ---------- rows ----------
+    def _colleges(self, n, password):
+        admin_ids = allocate_ids("ADM", n)
+        admins = self._bulk(AdminProfile, (
+            AdminProfile(
+                admin_id=aid, full_name=f"Seed Admin {aid}", admin_name=f"seed_{aid.lower()}",
+                admin_name_key=normalize_login_name(f"seed_{aid.lower()}"), contact_no="0000000000",
+                email=f"{aid.lower()}@{SEED_DOMAIN}", gender=self.rng.choice("MFO"), password=password,
+            )
+            for aid in admin_ids
+        ))
+        return self._bulk(College, (
+            College(college_id=cid, name=f"Seed College {cid} {self.rng.choice(CITIES)}",
+                    location=self.rng.choice(CITIES), email=f"{cid.lower()}@{SEED_DOMAIN}", owner_admin=admin)
+            for cid, admin in zip(allocate_ids("COL", n), admins)
+        ))
+
+    def _events(self, colleges, per_college):
+        now = timezone.now()
+        pictures = self._existing_pictures("events")
+        rows = []
+        ids = iter(allocate_ids("EVT", len(colleges) * per_college))
+        for college in colleges:
+            for _ in range(per_college):
+                kind = self.rng.choice(KINDS)
+                rows.append(Event(
+                    event_id=next(ids), college=college, created_by_id=college.owner_admin.admin_id,
+                    title=f"{kind} {self.rng.randint(2024, 2027)}"[:80],
+                    description=" ".join(self.rng.choices(WORDS, k=60)).capitalize() + ".",
+                    date_time=now + timedelta(days=self.rng.randint(-365, 365), hours=self.rng.randint(8, 20)),
+                    location=f"{self.rng.choice(('Main Hall', 'Auditorium', 'Ground', 'Lab Block'))}, {college.location}",
+                    image_url=self.rng.choice(pictures) if pictures else "",
+                ))
+        return self._bulk(Event, rows)
+
+    def _users(self, n, password):
+        return self._bulk(UserProfile, (
+            UserProfile(user_id=uid, username=f"seed_{uid.lower()}", username_key=normalize_login_name(f"seed_{uid.lower()}"),
+                        email=f"{uid.lower()}@{SEED_DOMAIN}", password=password)
+            for uid in allocate_ids("USR", n)
+        ))
+
+    def _registrations(self, events, users, weights, average):
+        counts = [min(c, len(users)) for c in self._counts(weights, average)]
+        total = sum(counts)
+        reg_ids, inv_ids, pay_ids = (iter(allocate_ids(p, total)) for p in ("REG", "INV", "PAY"))
+        plans = list(PLAN_PRICES)
+        now = timezone.now()
+        regs, invoices, payments = [], [], []
+        for event, count in zip(events, counts):
+            for user in self.rng.sample(users, count):
+                plan, gateway = self.rng.choice(plans), self.rng.choice(GATEWAYS)
+                reg = Registration(registration_id=next(reg_ids), user=user, event=event, payment_status="paid")
+                inv = Invoice(invoice_id=next(inv_ids), registration=reg,
+                              details=f"{plan.upper()} plan via {gateway.replace('_', ' ').title()}")
+                regs.append(reg)
+                invoices.append(inv)
+                payments.append(Payment(payment_id=next(pay_ids), invoice=inv, amount=PLAN_PRICES[plan],
+                                        status="paid", gateway=gateway, paid_at=now))
+        self._bulk(Registration, regs)
+        self._bulk(Invoice, invoices)
+        self._bulk(Payment, payments)
+        return total
+
+    def _ugc(self, events, users, weights, average, photo_share):
+        counts = self._counts(weights, average)
+        total = sum(counts)
+        pictures = self._existing_pictures("ugc") or self._existing_pictures("events")
+        ugc_ids = iter(allocate_ids("UGC", total))
+        posts, photos = [], []
+        for event, count in zip(events, counts):
+            for _ in range(count):
+                with_photo = bool(pictures) and self.rng.random() < photo_share
+                post = UGC(ugc_id=next(ugc_ids), content_type="photo" if with_photo else "text",
+                           content_data=" ".join(self.rng.choices(WORDS, k=8))[:150],
+                           user=self.rng.choice(users), event=event)
+                posts.append(post)
+                if with_photo:
+                    photos.append(Photo(ugc=post, uploaded_by=post.user, image_url=self.rng.choice(pictures)))
+        for photo, pid in zip(photos, allocate_ids("PHT", len(photos))):
+            photo.photo_id = pid
+        self._bulk(UGC, posts)
+        self._bulk(Photo, photos)
+        return total, len(photos)
+
+    def _reviews(self, events, users, weights, average):
+        counts = self._counts(weights, average)
+        ids = iter(allocate_ids("REV", sum(counts)))
+        return len(self._bulk(Review, (
+            Review(review_id=next(ids), user=self.rng.choice(users), event=event,
+                   rating=self.rng.choices((1, 2, 3, 4, 5), weights=(1, 2, 5, 10, 8))[0],
+                   comment=" ".join(self.rng.choices(WORDS, k=10))[:200])
+            for event, count in zip(events, counts) for _ in range(count)
+        )))
+
+    def _existing_pictures(self, top):
+        """URLs of images already in MEDIA_ROOT, so seeded rows render real pictures."""
+        found, stack = [], [top]
+        while stack and len(found) < 50:
+            folder = stack.pop()
+            try:
+                dirs, files = default_storage.listdir(folder)
+            except FileNotFoundError:
+                continue
+            found += [media_url(f"{folder}/{name}") for name in files if images.is_image_path(name)]
+            stack += [f"{folder}/{d}" for d in dirs]
+        return found
@@ -0,0 +1,25 @@
+# core/management/commands/sync_id_sequences.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sequences import SEQUENCES, sync_sequence
+
+
+class Command(BaseCommand):
+    help = (
+        "Move every ID counter past the highest ID already stored in its table. "
+        "Run after loading rows with explicit IDs (fixtures, raw SQL imports)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("prefixes", nargs="*", help="Only these prefixes (default: all).")
+
+    def handle(self, *args, **opts):
+        prefixes = opts["prefixes"] or list(SEQUENCES)
+        unknown = [p for p in prefixes if p not in SEQUENCES]
+        if unknown:
+            raise CommandError(f"Unknown prefix(es): {', '.join(unknown)}")
+
+        for prefix in prefixes:
+            last = sync_sequence(prefix)
+            self.stdout.write(f"{prefix}: last_value={last}")
+        self.stdout.write(self.style.SUCCESS("ID sequences in sync."))
@@ -0,0 +1,226 @@
+# core/metrics.py
+"""
+Per-view request metrics: SQL query count and time, template render time,
+response size and latency, tagged by URL name ("events:admin_analytics").
+
+``core.middleware.RequestMetricsMiddleware`` measures each request and calls
+``record``; templates are timed by the ``TimedDjangoTemplates`` backend. The
+numbers live in this process only: cumulative counters plus the last
+METRICS_WINDOW samples per view for percentiles. ``/ops/requests/`` shows
+them to staff, ``/metrics`` serves the Prometheus text format (with several
+workers, each one reports its own numbers, as Prometheus expects).
+
+Views declare how many queries they should need with ``@query_budget(n)``;
+going over logs a warning, or raises QueryBudgetExceeded when
+QUERY_BUDGET_RAISE is on (set it in tests).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+WINDOW = getattr(settings, "METRICS_WINDOW", 500)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNRESOLVED = "<unresolved>"          # 404s etc. share one series
+
+_current = ContextVar("request_sample", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(max_queries):
+    """Declare the most SQL queries one request to this view should run."""
+    def decorate(view):
+        view.query_budget = max_queries
+        return view
+    return decorate
+
+
+# ---------- one request ----------
+class Sample:
+    __slots__ = ("queries", "sql_ms", "template_ms", "budget", "_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.budget = None
+        self._depth = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook."""
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_ms += (time.perf_counter() - t0) * 1000
+
+
+def start():
+    sample = Sample()
+    return sample, _current.set(sample)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+class _TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        sample = _current.get()
+        if sample is None:
+            return super().render(context, request)
+        sample._depth += 1
+        t0 = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            sample._depth -= 1
+            if not sample._depth:           # a template rendered from inside another counts once
+                sample.template_ms += (time.perf_counter() - t0) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates whose templates add their render time to the current request."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return _TimedTemplate(template.template, self)
+
+
+# ---------- aggregation ----------
+class _ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.over_budget = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.latency_ms = 0.0
+        self.bytes = 0
+        self.budget = None
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent = deque(maxlen=WINDOW)     # (latency_ms, queries, sql_ms, template_ms)
+
+
+_stats = {}
+_lock = threading.Lock()
+
+
+def record(view, sample, latency_ms, status, size):
+    """Add one finished request; ``size`` is None for streamed responses."""
+    with _lock:
+        s = _stats.get(view)
+        if s is None:
+            s = _stats[view] = _ViewStats()
+        s.requests += 1
+        s.errors += status >= 500
+        s.queries += sample.queries
+        s.max_queries = max(s.max_queries, sample.queries)
+        s.sql_ms += sample.sql_ms
+        s.template_ms += sample.template_ms
+        s.latency_ms += latency_ms
+        s.bytes += size or 0
+        s.budget = sample.budget
+        if sample.budget is not None and sample.queries > sample.budget:
+            s.over_budget += 1
+        i = 0
+        while i < len(LATENCY_BUCKETS_MS) and latency_ms > LATENCY_BUCKETS_MS[i]:
+            i += 1
+        s.buckets[i] += 1
+        s.recent.append((latency_ms, sample.queries, sample.sql_ms, sample.template_ms))
+
+
+def check_budget(view, sample):
+    if sample.budget is None or sample.queries <= sample.budget:
+        return
+    message = f"{view} ran {sample.queries} SQL queries (budget {sample.budget})"
+    if getattr(settings, "QUERY_BUDGET_RAISE", False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def _pct(values, p):
+    return round(values[min(len(values) - 1, int(len(values) * p))], 1) if values else None
+
+
+def snapshot():
+    """One dict per view, busiest first, with window percentiles and lifetime averages."""
+    with _lock:
+        items = [(view, s, list(s.recent)) for view, s in _stats.items()]
+    rows = []
+    for view, s, recent in items:
+        latency = sorted(r[0] for r in recent)
+        queries = sorted(r[1] for r in recent)
+        n = s.requests
+        rows.append({
+            "view": view,
+            "requests": n,
+            "errors": s.errors,
+            "latency_ms": {"p50": _pct(latency, 0.5), "p95": _pct(latency, 0.95), "p99": _pct(latency, 0.99)},
+            "queries": {"avg": round(s.queries / n, 1), "p95": _pct(queries, 0.95), "max": s.max_queries},
+            "budget": s.budget,
+            "over_budget": s.over_budget,
+            "sql_ms_avg": round(s.sql_ms / n, 1),
+            "template_ms_avg": round(s.template_ms / n, 1),
+            "bytes_avg": round(s.bytes / n),
+        })
+    rows.sort(key=lambda r: r["requests"], reverse=True)
+    return rows
+
+
+def prometheus_text():
+    """Lifetime counters and the latency histogram in the Prometheus text format."""
+    with _lock:
+        items = sorted(_stats.items())
+        out = [
+            "# HELP foreverfest_request_latency_ms Request latency by view.",
+            "# TYPE foreverfest_request_latency_ms histogram",
+        ]
+        for view, s in items:
+            running = 0
+            for bound, count in zip(LATENCY_BUCKETS_MS + ("+Inf",), s.buckets):
+                running += count
+                out.append(f'foreverfest_request_latency_ms_bucket{{view="{view}",le="{bound}"}} {running}')
+            out.append(f'foreverfest_request_latency_ms_sum{{view="{view}"}} {s.latency_ms:.3f}')
+            out.append(f'foreverfest_request_latency_ms_count{{view="{view}"}} {s.requests}')
+        for metric, attr, kind, text in (
+            ("requests_total", "requests", "counter", "Requests handled."),
+            ("errors_total", "errors", "counter", "Responses with a 5xx status."),
+            ("sql_queries_total", "queries", "counter", "SQL queries run."),
+            ("sql_ms_total", "sql_ms", "counter", "Time spent in SQL."),
+            ("template_ms_total", "template_ms", "counter", "Time spent rendering templates."),
+            ("response_bytes_total", "bytes", "counter", "Response body bytes (streamed responses excluded)."),
+            ("query_budget_exceeded_total", "over_budget", "counter", "Requests over their view's query budget."),
+            ("sql_queries_max", "max_queries", "gauge", "Most SQL queries seen in one request."),
+        ):
+            out.append(f"# HELP foreverfest_{metric} {text}")
+            out.append(f"# TYPE foreverfest_{metric} {kind}")
+            for view, s in items:
+                value = getattr(s, attr)
+                value = f"{value:.3f}" if isinstance(value, float) else value
+                out.append(f'foreverfest_{metric}{{view="{view}"}} {value}')
+    return "\n".join(out) + "\n"
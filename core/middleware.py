@@ -0,0 +1,41 @@
+# core/middleware.py
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Times every request and counts its SQL (see core.metrics). Goes first in
+    MIDDLEWARE so session and principal lookups are counted too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample, token = metrics.start()
+        t0 = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all(initialized_only=False):
+                    stack.enter_context(conn.execute_wrapper(sample.count_query))
+                response = self.get_response(request)
+        finally:
+            metrics.finish(token)
+        latency_ms = (time.perf_counter() - t0) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else metrics.UNRESOLVED
+        size = None if response.streaming else len(response.content)
+        metrics.record(view, sample, latency_ms, response.status_code, size)
+        metrics.check_budget(view, sample)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        sample = metrics.current()
+        if sample is not None:
+            sample.budget = getattr(view_func, "query_budget", None)
@@ -0,0 +1,45 @@
+# core/models.py
+from django.db import models
+from django.utils import timezone
+
+
+class IdSequence(models.Model):
+    """Last number handed out for one ID prefix (e.g. "EVT" -> 42 means EVT0042)."""
+    name = models.CharField(primary_key=True, max_length=10)
+    last_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "id_sequences"
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_value}"
+
+
+class Job(models.Model):
+    """One unit of deferred work for the ``run_jobs`` worker (see core.jobs)."""
+    QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+    STATUS_CHOICES = [(s, s) for s in (QUEUED, RUNNING, DONE, FAILED)]
+
+    task = models.CharField(max_length=200)              # dotted path of the callable
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    key = models.CharField(max_length=200, blank=True, default="")   # de-dupes queued jobs
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=64, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "jobs"
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="jobs_due_idx"),
+            models.Index(fields=["key", "status"], name="jobs_key_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.task} ({self.status})"
@@ -0,0 +1,52 @@
+# core/query_audit.py
+"""
+The queries hot pages run, registered for ``manage.py audit_query_plans``.
+
+Views decorate the small functions that build their querysets::
+
+    @hot_query("ugc.event_feed", event="EVT0001")
+    def _event_ugc(event):
+        return UGC.objects.filter(event=event).order_by("-posted_on", "-ugc_id")
+
+The keyword arguments are sample values the audit builds the query with; the
+plan does not depend on those rows existing. The audit EXPLAINs every
+registered query and fails on a table read without an index. A sort the
+index cannot provide ("USE TEMP B-TREE") is reported, not failed: ordering
+across a join (e.g. registrations by event date) always sorts.
+"""
+import re
+
+from django.db import connections
+
+HOT_QUERIES = {}
+
+# SQLite: "SCAN events" walks the table; "SCAN events USING INDEX x" walks an index in order
+_SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?: AS \w+)?\s*$")
+_PG_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def hot_query(name, allow_scan=(), **sample):
+    """
+    Register a queryset builder under ``name``. ``allow_scan`` lists tables
+    that may be read in full (tiny lookup tables).
+    """
+    def register(builder):
+        HOT_QUERIES[name] = (builder, sample, tuple(allow_scan))
+        return builder
+    return register
+
+
+def explain(name, using="default"):
+    """
+    ``(plan_lines, full_scans, sorts)`` for a registered query: the tables it
+    reads without an index (minus allowed ones) and whether it sorts in memory.
+    """
+    builder, sample, allow_scan = HOT_QUERIES[name]
+    qs = builder(**sample)
+    lines = qs.using(using).explain().splitlines()
+    vendor = connections[using].vendor
+    pattern = _PG_SCAN if vendor == "postgresql" else _SQLITE_SCAN
+    scans = sorted({m.group(1) for line in lines for m in [pattern.search(line)] if m}
+                   - set(allow_scan))
+    sorts = any("TEMP B-TREE" in line or re.search(r"\bSort\b", line) for line in lines)
+    return lines, scans, sorts
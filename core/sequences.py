@@ -0,0 +1,136 @@
+# core/sequences.py
+"""
+Prefixed ID allocation ("EVT0001", "REG0042", ...).
+
+Every prefix owns one row in ``IdSequence``. A worker reserves a block of
+numbers with a single ``UPDATE ... SET last_value = last_value + n`` and then
+hands them out from memory, so an insert never scans its own table and two
+workers can never receive the same number. Unused numbers in a block are
+simply skipped (IDs may have gaps, they are never reused).
+"""
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import BigIntegerField, F, Max
+from django.db.models.functions import Cast, Substr
+
+from .models import IdSequence
+
+
+# prefix -> (model label, id field, zero-padded width)
+SEQUENCES = {
+    "USR": ("accounts.UserProfile", "user_id", 3),
+    "ADM": ("accounts.AdminProfile", "admin_id", 4),
+    "COL": ("colleges.College", "college_id", 4),
+    "EVT": ("events.Event", "event_id", 4),
+    "SPN": ("events.Sponsor", "sponsor_id", 4),
+    "REG": ("registrations.Registration", "registration_id", 4),
+    "INV": ("registrations.Invoice", "invoice_id", 4),
+    "PAY": ("registrations.Payment", "payment_id", 4),
+    "UGC": ("ugc.UGC", "ugc_id", 4),
+    "PHT": ("ugc.Photo", "photo_id", 4),
+    "REV": ("ugc.Review", "review_id", 4),
+    "ANL": ("analytics.Analytics", "analytics_id", 4),
+}
+
+DEFAULT_BLOCK_SIZE = 20
+
+_lock = threading.Lock()
+_pools = {}   # prefix -> [next, end) numbers this process may hand out
+
+
+def _block_size():
+    return max(1, int(getattr(settings, "ID_SEQUENCE_BLOCK_SIZE", DEFAULT_BLOCK_SIZE)))
+
+
+def format_id(prefix, number):
+    width = SEQUENCES[prefix][2]
+    return f"{prefix}{str(number).zfill(width)}"
+
+
+def table_max(prefix):
+    """Highest numeric suffix already stored for ``prefix`` (0 if none)."""
+    label, field, _ = SEQUENCES[prefix]
+    model = apps.get_model(label)
+    agg = (model._default_manager
+           .filter(**{f"{field}__regex": rf"^{prefix}[0-9]+$"})
+           .annotate(num=Cast(Substr(field, len(prefix) + 1), BigIntegerField()))
+           .aggregate(mx=Max("num")))
+    return agg["mx"] or 0
+
+
+def _reserve(prefix, count):
+    """Bump the counter by ``count`` and return the reserved range (start, end)."""
+    with transaction.atomic():
+        bumped = (IdSequence.objects.filter(name=prefix)
+                  .update(last_value=F("last_value") + count))
+        if not bumped:
+            # first use of this prefix: continue after whatever rows already exist
+            try:
+                with transaction.atomic():
+                    IdSequence.objects.create(name=prefix, last_value=table_max(prefix) + count)
+            except IntegrityError:
+                # another worker seeded it first
+                (IdSequence.objects.filter(name=prefix)
+                 .update(last_value=F("last_value") + count))
+        end = IdSequence.objects.values_list("last_value", flat=True).get(name=prefix)
+    return end - count + 1, end + 1
+
+
+def allocate_ids(prefix, count=1):
+    """
+    Return ``count`` fresh IDs for ``prefix``, e.g. ["REG0101", "REG0102"].
+
+    Served from this process's reserved block when possible; otherwise one
+    round trip reserves ``max(count, ID_SEQUENCE_BLOCK_SIZE)`` numbers. When
+    called inside a transaction the spare numbers only become reusable after
+    it commits, so a rollback can never leak a block another worker also owns.
+    """
+    if prefix not in SEQUENCES:
+        raise KeyError(f"Unknown ID prefix: {prefix}")
+
+    with _lock:
+        pool = _pools.get(prefix)
+        if pool and pool[1] - pool[0] >= count:
+            start = pool[0]
+            pool[0] += count
+            return [format_id(prefix, n) for n in range(start, start + count)]
+
+    start, end = _reserve(prefix, max(count, _block_size()))
+    spare = [start + count, end]
+
+    def _keep_spare():
+        if spare[0] < spare[1]:
+            with _lock:
+                _pools[prefix] = spare
+
+    transaction.on_commit(_keep_spare)
+    return [format_id(prefix, n) for n in range(start, start + count)]
+
+
+def next_id(prefix):
+    return allocate_ids(prefix, 1)[0]
+
+
+def sync_sequence(prefix):
+    """Make sure the counter is not behind rows inserted with explicit IDs."""
+    with transaction.atomic():
+        high = table_max(prefix)
+        seq, created = IdSequence.objects.select_for_update().get_or_create(
+            name=prefix, defaults={"last_value": high})
+        if not created and seq.last_value < high:
+            seq.last_value = high
+            seq.save(update_fields=["last_value"])
+    reset_pools(prefix)
+    return seq.last_value
+
+
+def reset_pools(prefix=None):
+    """Forget reserved-but-unused numbers (all prefixes when ``prefix`` is None)."""
+    with _lock:
+        if prefix is None:
+            _pools.clear()
+        else:
+            _pools.pop(prefix, None)
@@ -0,0 +1,66 @@
+# core/templatetags/media_tags.py
+from urllib.parse import quote, unquote
+
+from django import template
+from django.conf import settings
+from django.utils.html import format_html, format_html_join
+
+from core import images
+
+register = template.Library()
+
+# what the CSS makes of each size, so the browser can pick from srcset
+DEFAULT_SIZES = {
+    "thumb": "160px",
+    "card": "(max-width: 600px) 100vw, 480px",
+    "full": "100vw",
+}
+
+
+def _storage_path(src):
+    """Storage path for a FieldFile or a '/media/...' URL; None for anything else."""
+    name = getattr(src, "name", None)
+    if name is not None:
+        return name or None
+    src = str(src or "")
+    prefix = settings.MEDIA_URL.rstrip("/") + "/"
+    if src.startswith(prefix):
+        return unquote(src[len(prefix):])
+    return None
+
+
+def _url(path):
+    return settings.MEDIA_URL.rstrip("/") + "/" + quote(path)
+
+
+def _srcset(variants):
+    return ", ".join(f"{_url(p)} {images.SIZES[size]}w" for size, p in variants.items())
+
+
+@register.simple_tag
+def picture(src, alt="", size="card", sizes=None, css_class=""):
+    """
+    <picture> with AVIF/WebP derivatives of an uploaded image, or a plain
+    lazy <img> of ``src`` while they're missing (or for external URLs).
+
+        {% picture e.image_url e.title "card" %}
+        {% picture college.logo college.name "thumb" %}
+    """
+    url = getattr(src, "url", None) if getattr(src, "name", None) else src
+    path = _storage_path(src)
+    found = images.derivative_set(path) if path and images.is_image_path(path) else None
+    if not found:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async">',
+                           url or "", alt, css_class)
+
+    sizes = sizes or DEFAULT_SIZES.get(size, "100vw")
+    *better, fallback = images.FORMATS
+    sources = format_html_join(
+        "", '<source type="{}" srcset="{}" sizes="{}">',
+        ((images.MIME[fmt], _srcset(found[fmt]), sizes) for fmt in better),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" '
+        'loading="lazy" decoding="async"></picture>',
+        sources, _url(found[fallback][size]), _srcset(found[fallback]), sizes, alt, css_class,
+    )
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import AdminProfile
+from colleges.models import College
+from events.models import Event
+from . import jobs
+from .keyset import keyset_page
+from .models import Job
+
+ORDERING = ("-date_time", "title", "event_id")
+calls = []
+
+
+def record_call(value):
+    calls.append(value)
+
+
+def always_fail():
+    raise RuntimeError("boom")
+
+
+class KeysetPageTests(TestCase):
+    def setUp(self):
+        admin = AdminProfile.objects.create(full_name="A", admin_name="ks-admin", contact_no="0",
+                                            email="ks@example.invalid", gender="O", password="!")
+        college = College.objects.create(name="Keyset College", owner_admin=admin)
+        day = datetime(2026, 5, 1, 10, tzinfo=dt_timezone.utc)
+        # ties on date_time and title, plus a NULL tail: only event_id tells them apart
+        for when, title in [(day, "B"), (day, "A"), (day, "A"), (day - timedelta(days=1), "C"),
+                            (None, "D"), (None, "D"), (day + timedelta(days=1), "E")]:
+            Event.objects.create(college=college, title=title, date_time=when, created_by=admin)
+
+    def _walk(self, size):
+        seen, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(Event.objects.all(), ORDERING, cursor, size)
+            seen += [e.event_id for e in rows]
+            if cursor is None:
+                return seen
+
+    def test_pages_visit_every_row_once_in_order(self):
+        dated = Event.objects.filter(date_time__isnull=False).order_by("-date_time", "title", "event_id")
+        undated = Event.objects.filter(date_time__isnull=True).order_by("title", "event_id")
+        expected = [e.event_id for e in [*dated, *undated]]
+        for size in (1, 2, 3, 10):
+            self.assertEqual(self._walk(size), expected)
+
+    def test_tampered_cursor_starts_over(self):
+        first, cursor = keyset_page(Event.objects.all(), ORDERING, None, 2)
+        again, _ = keyset_page(Event.objects.all(), ORDERING, cursor[:-2] + "xx", 2)
+        self.assertEqual(again, first)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delayed_job_runs_once_due(self):
+        job = jobs.enqueue(record_call, "hello", delay=60)
+        self.assertIsNone(jobs.claim("w1"))
+
+        claimed = jobs.claim("w1", now=job.run_at)
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertTrue(jobs.run(claimed))
+        self.assertEqual(calls, ["hello"])
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.DONE)
+
+        # the 60 s delay is not queue wait
+        self.assertEqual(jobs.stats()["wait_ms"]["p50"], 0)
+
+    def test_queued_key_is_not_duplicated(self):
+        first = jobs.enqueue(record_call, 1, key="same")
+        self.assertEqual(jobs.enqueue(record_call, 2, key="same").pk, first.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_failures_back_off_then_give_up(self):
+        job = jobs.enqueue(always_fail, max_attempts=2)
+        with self.assertLogs("core.jobs", "WARNING"):
+            self.assertFalse(jobs.run(jobs.claim("w1")))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+        with self.assertLogs("core.jobs", "ERROR"):
+            self.assertFalse(jobs.run(jobs.claim("w1", now=job.run_at)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
@@ -0,0 +1,99 @@
+# core/uploads.py
+"""
+Content-addressed media uploads.
+
+Uploads are hashed chunk by chunk and stored as ``<subdir>/<ab>/<sha256>.<ext>``,
+so the same picture uploaded twice is written once and both rows point at the
+same file. Nothing is read into memory in one piece: Django already spools
+large uploads to a temp file and storage.save() copies it chunk by chunk.
+
+Call these *before* opening a transaction - the database should never wait
+on disk I/O.
+"""
+import hashlib
+import os
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+CHUNK_SIZE = getattr(settings, "UPLOAD_CHUNK_SIZE", 256 * 1024)
+
+_EXT_RE = re.compile(r"^\.[a-z0-9]{1,5}$")
+
+# (model label, field) pairs that may hold the media URL of a stored upload
+MEDIA_REFERENCES = (("ugc.Photo", "image_url"), ("events.Event", "image_url"))
+
+
+def file_digest(f):
+    """SHA-256 of an UploadedFile/File, read in CHUNK_SIZE pieces."""
+    h = hashlib.sha256()
+    for chunk in f.chunks(CHUNK_SIZE):     # chunks() rewinds first
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def content_path(subdir, digest, filename=""):
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not _EXT_RE.match(ext):
+        ext = ""
+    return f"{subdir.strip('/')}/{digest[:2]}/{digest}{ext}"
+
+
+def store_upload(f, subdir, storage=None):
+    """
+    Save ``f`` under its content hash. Returns ``(path, created)``; ``created``
+    is False when identical bytes were already stored.
+    """
+    storage = storage or default_storage
+    path = content_path(subdir, file_digest(f), f.name)
+    if storage.exists(path):
+        return path, False
+    f.seek(0)
+    saved = storage.save(path, f)
+    if saved != path:
+        # a concurrent upload of the same bytes got there first; keep theirs
+        storage.delete(saved)
+        return path, False
+    return path, True
+
+
+def discard_files(paths, storage=None):
+    """Best-effort delete of files and their image derivatives; file-system errors are ignored."""
+    from core.images import all_derivative_paths, forget
+
+    storage = storage or default_storage
+    for path in paths:
+        forget(path)
+        for target in [path, *all_derivative_paths(path)]:
+            try:
+                storage.delete(target)
+            except Exception:
+                pass
+
+
+def referenced_paths(paths):
+    """The storage paths in ``paths`` that a row in MEDIA_REFERENCES still points at."""
+    by_url = {media_url(p): p for p in paths}
+    found = set()
+    for label, field in MEDIA_REFERENCES:
+        found.update(apps.get_model(label)._default_manager
+                     .filter(**{f"{field}__in": list(by_url)}).values_list(field, flat=True))
+    return {by_url[url] for url in found}
+
+
+def discard_unreferenced(paths, storage=None):
+    """
+    discard_files() for the paths nothing points at any more. Run as a job: the
+    check happens when the job runs, so a file that was uploaded again since
+    the job was queued is kept.
+    """
+    in_use = referenced_paths(paths)
+    discard_files([p for p in paths if p not in in_use], storage)
+
+
+def media_url(path):
+    """'/media/<path>' for a storage path (also fixes Windows separators)."""
+    path = path.replace("\\", "/").lstrip("/")
+    return f"{settings.MEDIA_URL.rstrip('/')}/{path}"
@@ -0,0 +1,11 @@
+# core/urls.py
+from django.urls import path
+
+from . import views
+
+app_name = "core"
+
+urlpatterns = [
+    path("ops/requests/", views.request_metrics_view, name="request_metrics"),
+    path("metrics", views.prometheus_metrics_view, name="metrics"),
+]
@@ -0,0 +1,32 @@
+# core/views.py
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_http_methods
+
+from . import metrics
+
+
+@staff_member_required
+@require_http_methods(["GET", "POST"])
+def request_metrics_view(request):
+    """Per-view request stats for staff; ``?format=json`` for scripts, POST to reset."""
+    if request.method == "POST":
+        metrics.reset()
+    rows = metrics.snapshot()
+    if request.GET.get("format") == "json":
+        return JsonResponse({"window": metrics.WINDOW, "views": rows})
+    return render(request, "core/request_metrics.html", {"rows": rows, "window": metrics.WINDOW})
+
+
+def prometheus_metrics_view(request):
+    """Prometheus scrape target: METRICS_TOKEN as a bearer token, or a staff session."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    auth = request.headers.get("Authorization", "")
+    allowed = (token and constant_time_compare(auth, f"Bearer {token}")) or (
+        request.user.is_authenticated and request.user.is_staff)
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.prometheus_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
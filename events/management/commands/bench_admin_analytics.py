@@ -0,0 +1,84 @@
+# events/management/commands/bench_admin_analytics.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import AdminProfile, UserProfile
+from colleges.models import College
+from core.sequences import allocate_ids
+from events.models import Event
+from ugc.models import UGC, Review
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway college with N events (rolled back afterwards) and report "
+        "how many SQL queries events:admin_analytics issues for each N."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,100,300",
+                            help="Comma-separated event counts to try.")
+
+    def handle(self, *args, **opts):
+        sizes = [int(x) for x in opts["sizes"].split(",") if x.strip()]
+        results = []
+        for n in sizes:
+            try:
+                with transaction.atomic():
+                    results.append(self._run(n))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        for n, queries, ms in results:
+            self.stdout.write(f"events={n:>6}  queries={queries:>4}  time={ms:8.1f} ms")
+
+        counts = {q for _, q, _ in results}
+        if len(counts) == 1:
+            self.stdout.write(self.style.SUCCESS("Query count is flat across sizes."))
+        else:
+            self.stdout.write(self.style.WARNING("Query count grows with event count!"))
+
+    def _run(self, n):
+        admin = AdminProfile.objects.create(
+            full_name="Bench Admin", admin_name="bench_admin", contact_no="0",
+            email="bench-admin@example.invalid", gender="O", password="!",
+        )
+        college = College.objects.create(name="Bench College", owner_admin=admin)
+        user = UserProfile.objects.create(username="bench_user", email="bench@example.invalid", password="!")
+
+        events = Event.objects.bulk_create([
+            Event(event_id=eid, college=college, title=f"Bench event {i}")
+            for i, eid in enumerate(allocate_ids("EVT", n))
+        ])
+        UGC.objects.bulk_create([
+            UGC(ugc_id=uid, content_type="text", content_data="bench", user=user, event=ev)
+            for uid, ev in zip(allocate_ids("UGC", n), events)
+        ])
+        Review.objects.bulk_create([
+            Review(review_id=rid, user=user, event=ev, rating=4)
+            for rid, ev in zip(allocate_ids("REV", n), events)
+        ])
+
+        client = Client(SERVER_NAME="localhost")
+        session = client.session
+        session["admin_id"] = admin.admin_id
+        session.save()
+
+        url = reverse("events:admin_analytics")
+        client.get(url)  # first hit creates the Analytics rows
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            resp = client.get(url)
+            ms = (time.perf_counter() - t0) * 1000
+        assert resp.status_code == 200, resp.status_code
+        return n, len(ctx.captured_queries), ms
@@ -0,0 +1,54 @@
+# events/management/commands/export_catalog.py
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from events.transfer import KINDS, export_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream colleges, events, sponsors or event sponsors to CSV or JSON Lines "
+        "in primary-key order, in constant memory. The output imports back with "
+        "import_catalog."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(KINDS))
+        parser.add_argument("path", nargs="?", default="-", help="Output file ('-' for stdout).")
+        parser.add_argument("--format", choices=("csv", "jsonl"),
+                            help="Default: from the file extension, else csv.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        kind = KINDS[opts["kind"]]
+        path = opts["path"]
+        fmt = opts["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+
+        out = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        try:
+            count = self._write(out, kind, fmt, opts["chunk_size"])
+        except OSError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if path != "-":
+            self.stdout.write(self.style.SUCCESS(f"{count} {kind.name} row(s) written to {path}."))
+
+    def _write(self, out, kind, fmt, chunk_size):
+        count = 0
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(kind.columns)
+            for row in export_rows(kind, chunk_size):
+                writer.writerow(["" if v is None else v for v in row.values()])
+                count += 1
+        else:
+            encoder = DjangoJSONEncoder()
+            for row in export_rows(kind, chunk_size):
+                out.write(encoder.encode(row) + "\n")
+                count += 1
+        return count
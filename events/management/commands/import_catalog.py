@@ -0,0 +1,141 @@
+# events/management/commands/import_catalog.py
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sequences import sync_sequence
+from events.transfer import KINDS, SKIP, UPDATE, after_import, import_chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Load colleges, events, sponsors or event sponsors from CSV or JSON Lines "
+        "(the export_catalog columns). Rows are validated and written a chunk at "
+        "a time; existing rows are skipped (or updated with --on-conflict "
+        "update). Progress is saved after every chunk, so an interrupted import "
+        "picks up where it stopped when run again with the same file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(KINDS))
+        parser.add_argument("path", help="Input file ('-' for stdin; stdin imports can't resume).")
+        parser.add_argument("--format", choices=("csv", "jsonl"),
+                            help="Default: from the file extension, else csv.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--on-conflict", choices=(SKIP, UPDATE), default=SKIP)
+        parser.add_argument("--errors", help="Write rejected rows with their errors here (JSON Lines).")
+        parser.add_argument("--strict", action="store_true",
+                            help="Stop at the first chunk with an invalid row.")
+        parser.add_argument("--restart", action="store_true",
+                            help="Ignore saved progress and start from the first row.")
+
+    def handle(self, *args, **opts):
+        kind = KINDS[opts["kind"]]
+        path = opts["path"]
+        fmt = opts["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        state_path = None if path == "-" else f"{path}.progress"
+
+        try:
+            src = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(str(exc))
+        done = 0 if opts["restart"] else self._load_state(state_path, kind, path)
+        if done:
+            self.stdout.write(f"Resuming after row {done} (saved progress in {state_path}).")
+
+        errors_out = open(opts["errors"], "a", encoding="utf-8") if opts["errors"] else None
+        totals = Counter()
+        t0 = time.perf_counter()
+        try:
+            skip_to = done
+            rows = (r for r in self._read(src, fmt, kind) if r[0] > skip_to)
+            while True:
+                chunk = list(islice(rows, opts["chunk_size"]))
+                if not chunk:
+                    break
+                unreadable = {n: {"row": ["Not a JSON object."]} for n, raw in chunk if raw is None}
+                stats, errors = import_chunk(kind, [(n, raw) for n, raw in chunk if raw is not None],
+                                             opts["on_conflict"])
+                errors.update(unreadable)
+                stats["invalid"] += len(unreadable)
+                totals.update(stats)
+                done = chunk[-1][0]
+                self._save_state(state_path, kind, path, done)
+                self._report(errors, dict(chunk), errors_out)
+                if errors and opts["strict"]:
+                    raise CommandError(f"Stopped at an invalid row (rows up to {done} were handled).")
+        finally:
+            if src is not sys.stdin:
+                src.close()
+            if errors_out:
+                errors_out.close()
+
+        if kind.prefix:
+            sync_sequence(kind.prefix)        # imported IDs must not be handed out again
+        after_import(kind)
+        if state_path and os.path.exists(state_path):
+            os.remove(state_path)
+
+        seconds = time.perf_counter() - t0
+        self.stdout.write(
+            f"{kind.name}: created {totals['created']}, updated {totals['updated']}, "
+            f"skipped {totals['skipped']}, invalid {totals['invalid']} in {seconds:.1f}s"
+        )
+        self.stdout.write(self.style.SUCCESS("Import finished."))
+
+    # ---------- input ----------
+    def _read(self, src, fmt, kind):
+        """(row number, dict or None if unreadable) pairs; CSV rows count from 1, JSONL by line."""
+        if fmt == "csv":
+            reader = csv.DictReader(src)
+            missing = [c for c in kind.columns if c not in (reader.fieldnames or [])]
+            if missing:
+                self.stdout.write(self.style.WARNING(f"No column(s) {', '.join(missing)}; treated as blank."))
+            yield from enumerate(reader, start=1)
+            return
+        for n, line in enumerate(src, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield n, row if isinstance(row, dict) else None
+
+    # ---------- progress ----------
+    def _signature(self, kind, path):
+        st = os.stat(path)
+        return {"kind": kind.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def _load_state(self, state_path, kind, path):
+        if not state_path or not os.path.exists(state_path):
+            return 0
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if {k: state.get(k) for k in ("kind", "size", "mtime_ns")} != self._signature(kind, path):
+            self.stdout.write(self.style.WARNING("Input changed since the saved progress; starting over."))
+            return 0
+        return state["rows"]
+
+    def _save_state(self, state_path, kind, path, rows):
+        if not state_path:
+            return
+        tmp = f"{state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**self._signature(kind, path), "rows": rows}, f)
+        os.replace(tmp, state_path)
+
+    # ---------- errors ----------
+    def _report(self, errors, raw_by_line, errors_out):
+        for line in sorted(errors):
+            message = "; ".join(f"{col}: {' '.join(msgs)}" for col, msgs in errors[line].items())
+            self.stderr.write(f"row {line}: {message}")
+            if errors_out:
+                errors_out.write(json.dumps({"row": line, "errors": errors[line],
+                                             "data": raw_by_line.get(line)}, default=str) + "\n")
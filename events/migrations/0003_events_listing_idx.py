@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_rename_pasword_userprofile_password'),
+        ('colleges', '0002_college_logo'),
+        ('events', '0002_event_image_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date_time', 'title', 'event_id'], name='events_listing_idx'),
+        ),
+    ]
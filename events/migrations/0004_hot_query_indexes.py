@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_login_name_keys'),
+        ('colleges', '0002_college_logo'),
+        ('events', '0003_events_listing_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['college', '-date_time', 'title'], name='events_college_when_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['college', 'title'], name='events_college_title_idx'),
+        ),
+    ]
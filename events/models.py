@@ -2,31 +2,16 @@
 from django.db import models
 from accounts.models import AdminProfile
 from colleges.models import College
+from core.sequences import next_id
 
 
 # ---------- ID generators ----------
 def generate_event_id():
-    last = Event.objects.order_by("event_id").last()
-    if last and last.event_id.startswith("EVT"):
-        try:
-            n = int(last.event_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"EVT{str(n).zfill(4)}"
+    return next_id("EVT")
 
 
 def generate_sponsor_id():
-    last = Sponsor.objects.order_by("sponsor_id").last()
-    if last and last.sponsor_id.startswith("SPN"):
-        try:
-            n = int(last.sponsor_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"SPN{str(n).zfill(4)}"
+    return next_id("SPN")
 
 
 # ---------- Core tables ----------
@@ -43,6 +28,14 @@ class Event(models.Model):
 
     class Meta:
         db_table = "events"
+        indexes = [
+            # public listing: ORDER BY date_time DESC, title, event_id (keyset paged)
+            models.Index(fields=["-date_time", "title", "event_id"], name="events_listing_idx"),
+            # one college's events: admin manage list and events_by_college
+            models.Index(fields=["college", "-date_time", "title"], name="events_college_when_idx"),
+            # admin analytics: a college's events by title
+            models.Index(fields=["college", "title"], name="events_college_title_idx"),
+        ]
 
     def __str__(self):
         return f"{self.event_id} - {self.title}"
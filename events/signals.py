@@ -0,0 +1,37 @@
+# events/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from colleges.models import College
+from core.cache import bump_version
+from ugc.models import UGC, Review
+from .models import Event
+
+# cached public listing pages (events.views.events_page)
+EVENTS_CACHE_NAMESPACE = "events_page"
+
+
+def event_detail_namespace(event_id):
+    """Per-event namespace of the cached detail fragment (events.views.event_detail_view)."""
+    return f"event_detail:{event_id}"
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=College)      # cards show the college name
+@receiver(post_delete, sender=College)
+def invalidate_event_listing(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(EVENTS_CACHE_NAMESPACE))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=UGC)          # the detail page shows UGC/review counts and the rating
+@receiver(post_delete, sender=UGC)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_event_detail(sender, instance, **kwargs):
+    event_id = instance.pk if sender is Event else instance.event_id
+    # after commit: bumped earlier, a concurrent request could cache the old data under the new version
+    transaction.on_commit(lambda: bump_version(event_detail_namespace(event_id)))
@@ -1,3 +1,129 @@
-from django.test import TestCase
+import csv
+import os
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import AdminProfile, UserProfile
+from analytics.counters import buffer as counter_buffer
+from colleges.models import College
+from core.cache import get_version
+from ugc.models import UGC, Review
+from .models import Event
+from .signals import EVENTS_CACHE_NAMESPACE, event_detail_namespace
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def make_college(tag="t"):
+    admin = AdminProfile.objects.create(
+        full_name="Test Admin", admin_name=f"admin-{tag}", contact_no="0",
+        email=f"admin-{tag}@example.invalid", gender="O", password="!",
+    )
+    return College.objects.create(name=f"Test College {tag}", owner_admin=admin)
+
+
+class CatalogRoundTripTests(TestCase):
+    def setUp(self):
+        self.college = make_college()
+        self.events = [Event.objects.create(college=self.college, title=f"Fest {i}",
+                                            created_by=self.college.owner_admin)
+                       for i in range(3)]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def _import(self, kind, path, *args):
+        out = StringIO()
+        call_command("import_catalog", kind, path, *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_reimporting_an_export_skips_every_row(self):
+        for kind, n in (("college", 1), ("event", 3)):
+            path = self._path(f"{kind}.csv")
+            call_command("export_catalog", kind, path, stdout=StringIO())
+            self.assertIn(f"created 0, updated 0, skipped {n}, invalid 0", self._import(kind, path))
+        self.assertEqual(Event.objects.count(), 3)
+
+    def test_update_mode_overwrites_existing_rows(self):
+        path = self._path("events.csv")
+        call_command("export_catalog", "event", path, stdout=StringIO())
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            row["title"] += " (renamed)"
+        rows.append({**rows[0], "event_id": "", "title": "Brand new"})
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        report = self._import("event", path, "--on-conflict", "update")
+
+        self.assertIn("created 1, updated 3, skipped 0, invalid 0", report)
+        self.assertEqual(Event.objects.filter(title__endswith="(renamed)").count(), 3)
+        self.assertTrue(Event.objects.filter(title="Brand new", college=self.college).exists())
+
+
+@override_settings(CACHES=LOCMEM)
+class EventDetailCacheTests(TestCase):
+    def setUp(self):
+        college = make_college()
+        self.event = Event.objects.create(college=college, title="Open Day", created_by=college.owner_admin)
+        self.user = UserProfile.objects.create(user_id="USR901", username="visitor", email="v@example.invalid",
+                                               password="!")
+        self.url = reverse("events:event_detail", args=[self.event.event_id])
+        self.enterContext(counter_buffer.discarding())     # page views aren't under test
+
+    def _stats(self):
+        resp = self.client.get(self.url)
+        return resp.context["ugc_count"], resp.context["reviews_count"]
+
+    def test_cached_until_a_review_or_post_is_committed(self):
+        self.assertEqual(self._stats(), (0, 0))
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        version = get_version(event_detail_namespace(self.event.event_id))
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            UGC.objects.create(content_type="photo", user=self.user, event=self.event)
+        # not bumped inside the writer's transaction
+        self.assertEqual(get_version(event_detail_namespace(self.event.event_id)), version)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._stats(), (1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(user=self.user, event=self.event, rating=4, comment="Good")
+        self.assertEqual(self._stats(), (1, 1))
+
+    def test_event_edit_refreshes_the_page(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = "Open Day 2"
+            self.event.save()
+        self.assertContains(self.client.get(self.url), "Open Day 2")
+
+
+@override_settings(CACHES=LOCMEM)
+class EventsPageCacheTests(TestCase):
+    def setUp(self):
+        self.college = make_college()
+        self.url = reverse("events:events_page")
+
+    def test_new_event_is_listed_once_committed(self):
+        self.client.get(self.url)
+        version = get_version(EVENTS_CACHE_NAMESPACE)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Event.objects.create(college=self.college, title="Late Addition", created_by=self.college.owner_admin)
+        self.assertEqual(get_version(EVENTS_CACHE_NAMESPACE), version)
+        self.assertNotContains(self.client.get(self.url), "Late Addition")
+
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(self.url), "Late Addition")
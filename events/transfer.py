@@ -0,0 +1,286 @@
+# events/transfer.py
+"""
+Bulk CSV / JSON Lines transfer of colleges, events, sponsors and event
+sponsors (``manage.py export_catalog`` / ``import_catalog``).
+
+Both directions use the same column names, so an export can be imported
+elsewhere unchanged. Foreign keys travel as public IDs (``college_id``,
+``admin_id``, ``event_id``, ``sponsor_id``), never as internal row numbers.
+
+Export walks the table in primary-key order with ``.iterator()``, so memory
+stays flat however many rows there are. Import works a chunk at a time:
+every cell is cleaned with its model field, references and unique values
+are checked with one query per chunk, rows without an ID get one from
+``allocate_ids``, and the chunk goes in with one ``bulk_create`` inside its
+own transaction. Rows that already exist are skipped, or overwritten with
+``on_conflict="update"``, so a file can be imported again safely.
+"""
+from collections import Counter
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import ForeignKey
+from django.utils import timezone
+
+from colleges.models import College
+from core.cache import bump_version
+from core.sequences import allocate_ids
+from registrations.stats import invalidate_college_stats
+from search.autocomplete import CACHE_NAMESPACE as AUTOCOMPLETE_NAMESPACE
+from .models import Event, EventSponsor, Sponsor
+from .signals import EVENTS_CACHE_NAMESPACE, event_detail_namespace
+
+SKIP, UPDATE = "skip", "update"
+
+
+class Kind:
+    """
+    How one model is transferred.
+
+    ``columns``  (column, model field) pairs, in file order
+    ``key``      columns that identify a row (the primary key, or the natural key)
+    ``refs``     {column: field on the referenced model that the file holds}
+    ``unique``   other columns that must be unique across the table
+    ``prefix``   ID prefix for rows that come without a key
+    """
+
+    def __init__(self, name, model, columns, key, refs=None, unique=(), prefix=None):
+        self.name = name
+        self.model = model
+        self.columns = [c for c, _ in columns]
+        self.fields = {c: model._meta.get_field(f) for c, f in columns}
+        self.key = key
+        self.refs = refs or {}
+        self.unique = unique
+        self.prefix = prefix
+
+    def export_sources(self):
+        """values_list() paths, one per column."""
+        out = []
+        for column in self.columns:
+            field = self.fields[column]
+            if column in self.refs and self.refs[column] != field.target_field.attname:
+                out.append(f"{field.name}__{self.refs[column]}")     # e.g. owner_admin__admin_id
+            else:
+                out.append(field.attname)
+        return out
+
+    def export_qs(self):
+        return (self.model._default_manager.order_by(*[self.fields[c].attname for c in self.key])
+                .values_list(*self.export_sources()))
+
+    def key_of(self, values):
+        return tuple(values[self.fields[c].attname] for c in self.key)
+
+
+KINDS = {k.name: k for k in (
+    Kind("college", College, [
+        ("college_id", "college_id"), ("name", "name"), ("contact_no", "contact_no"),
+        ("email", "email"), ("location", "location"), ("logo", "logo"),
+        ("owner_admin", "owner_admin"),
+    ], key=("college_id",), refs={"owner_admin": "admin_id"}, unique=("name", "owner_admin"), prefix="COL"),
+    Kind("event", Event, [
+        ("event_id", "event_id"), ("college_id", "college"), ("title", "title"),
+        ("description", "description"), ("date_time", "date_time"), ("location", "location"),
+        ("image_url", "image_url"), ("created_by", "created_by"),
+    ], key=("event_id",), refs={"college_id": "college_id", "created_by": "admin_id"}, prefix="EVT"),
+    Kind("sponsor", Sponsor, [
+        ("sponsor_id", "sponsor_id"), ("sponsor_name", "sponsor_name"), ("email", "email"), ("phone", "phone"),
+    ], key=("sponsor_id",), prefix="SPN"),
+    Kind("event_sponsor", EventSponsor, [
+        ("event_id", "event"), ("sponsor_id", "sponsor"), ("amount", "amount"), ("notes", "notes"),
+    ], key=("event_id", "sponsor_id"), refs={"event_id": "event_id", "sponsor_id": "sponsor_id"}),
+)}
+
+
+# ---------- export ----------
+def export_rows(kind, chunk_size=2000):
+    """Yield one {column: value} dict per row, streamed from the database."""
+    for values in kind.export_qs().iterator(chunk_size=chunk_size):
+        yield dict(zip(kind.columns, values))
+
+
+# ---------- import: one row ----------
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def clean_row(kind, raw, tz=None):
+    """
+    Model values (by attname) for one input row. Reference columns keep the
+    file's public ID until ``resolve_refs``. Raises ValidationError with a
+    {column: [messages]} dict.
+    """
+    values, errors = {}, {}
+    for column in kind.columns:
+        field = kind.fields[column]
+        value = raw.get(column)
+        if isinstance(value, str):
+            value = value.strip()
+        if _blank(value):
+            if column in kind.key and kind.prefix:
+                values[field.attname] = None          # allocated later
+                continue
+            value = None if field.null else ""
+        if isinstance(field, ForeignKey):
+            if value in (None, "") and not field.null:
+                errors[column] = ["This field is required."]
+            values[field.attname] = value or None
+            continue
+        try:
+            value = field.clean(value, None)
+        except ValidationError as exc:
+            errors[column] = exc.messages
+            continue
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            value = timezone.make_aware(value, tz)
+        values[field.attname] = value
+    if errors:
+        raise ValidationError(errors)
+    return values
+
+
+# ---------- import: one chunk ----------
+def resolve_refs(kind, rows, errors):
+    """Swap public IDs for foreign key values, one query per reference column."""
+    for column, lookup in kind.refs.items():
+        field = kind.fields[column]
+        wanted = {r[field.attname] for _, r in rows if r[field.attname] is not None}
+        if not wanted:
+            continue
+        target = field.target_field.attname
+        found = dict(field.related_model._default_manager
+                     .filter(**{f"{lookup}__in": wanted}).values_list(lookup, target))
+        for line, r in rows:
+            ref = r[field.attname]
+            if ref is None:
+                continue
+            if ref in found:
+                r[field.attname] = found[ref]
+            else:
+                errors.setdefault(line, {})[column] = [f"No {field.related_model.__name__} {ref!r}."]
+
+
+def check_unique(kind, rows, errors):
+    """Unique columns must not clash within the chunk or with another row in the table."""
+    pk = kind.model._meta.pk.attname
+    for column in kind.unique:
+        attname = kind.fields[column].attname
+        seen = {}
+        for line, r in rows:
+            value = r[attname]
+            if value in (None, ""):
+                continue
+            if value in seen:
+                errors.setdefault(line, {})[column] = [f"Repeats line {seen[value]}."]
+            else:
+                seen[value] = line
+        if not seen:
+            continue
+        taken = dict(kind.model._default_manager.filter(**{f"{attname}__in": list(seen)})
+                     .values_list(attname, pk))
+        for line, r in rows:
+            owner = taken.get(r[attname])
+            if owner is not None and owner != r.get(pk):
+                errors.setdefault(line, {})[column] = [f"Already used by {owner}."]
+
+
+def _existing_keys(kind, rows):
+    attnames = [kind.fields[c].attname for c in kind.key]
+    keys = {kind.key_of(r) for _, r in rows}
+    if len(attnames) == 1:
+        filt = {f"{attnames[0]}__in": [k[0] for k in keys]}
+    else:
+        filt = {f"{a}__in": {k[i] for k in keys} for i, a in enumerate(attnames)}
+    if not keys:
+        return set()
+    found = kind.model._default_manager.filter(**filt).values_list(*attnames)
+    return {k for k in map(tuple, found) if k in keys}
+
+
+def _invalidate(kind, objs, existing):
+    # bulk_create skips the post_save hooks that keep these caches fresh
+    if kind.model is Event:
+        colleges = {o.college_id for o in objs}
+    elif kind.model is EventSponsor:
+        colleges = set(Event.objects.filter(event_id__in={o.event_id for o in objs})
+                       .values_list("college_id", flat=True))
+    else:
+        colleges = set()
+    # only rows that were already there can have a cached detail page
+    detail = {o.event_id for o in objs if (o.event_id,) in existing} if kind.model is Event else set()
+
+    def bump():
+        for college_id in colleges:
+            invalidate_college_stats(college_id)
+        for event_id in detail:
+            bump_version(event_detail_namespace(event_id))
+    transaction.on_commit(bump)
+
+
+def import_chunk(kind, chunk, on_conflict=SKIP):
+    """
+    Validate and write one chunk of ``(line, raw dict)`` rows in one
+    transaction. Returns ``(Counter of outcomes, {line: errors})``.
+    """
+    stats, errors, rows = Counter(), {}, []
+    tz = timezone.get_current_timezone()
+    for line, raw in chunk:
+        try:
+            rows.append((line, clean_row(kind, raw, tz)))
+        except ValidationError as exc:
+            errors[line] = exc.message_dict
+
+    with transaction.atomic():
+        resolve_refs(kind, rows, errors)
+        rows = [(line, r) for line, r in rows if line not in errors]
+
+        # rows without an ID are new by definition; only the others are looked up
+        fresh = [r for _, r in rows if None in kind.key_of(r)]
+        given = [(line, r) for line, r in rows if None not in kind.key_of(r)]
+        pk = kind.model._meta.pk.attname
+        for r, new_id in zip(fresh, allocate_ids(kind.prefix, len(fresh)) if fresh else []):
+            r[pk] = new_id
+
+        check_unique(kind, rows, errors)
+        rows = [(line, r) for line, r in rows if line not in errors]
+
+        first = {}
+        for line, r in rows:
+            key = kind.key_of(r)
+            if key in first:
+                errors[line] = {kind.key[0]: [f"Repeats line {first[key]}."]}
+            else:
+                first[key] = line
+        rows = [(line, r) for line, r in rows if line not in errors]
+
+        existing = _existing_keys(kind, [(line, r) for line, r in given if line not in errors])
+        if on_conflict == SKIP:
+            stats["skipped"] += sum(kind.key_of(r) in existing for _, r in rows)
+            rows = [(line, r) for line, r in rows if kind.key_of(r) not in existing]
+            stats["created"] += len(rows)
+        else:
+            stats["updated"] += sum(kind.key_of(r) in existing for _, r in rows)
+            stats["created"] += len(rows) - stats["updated"]
+
+        objs = [kind.model(**r) for _, r in rows]
+        if objs:
+            key_fields = [kind.fields[c].name for c in kind.key]
+            if on_conflict == UPDATE:
+                kind.model._default_manager.bulk_create(
+                    objs, batch_size=500, update_conflicts=True, unique_fields=key_fields,
+                    update_fields=[f.name for c, f in kind.fields.items() if c not in kind.key])
+            else:
+                # ignore_conflicts covers rows inserted by someone else since _existing_keys
+                kind.model._default_manager.bulk_create(objs, batch_size=500, ignore_conflicts=True)
+            _invalidate(kind, objs, existing)
+    stats["invalid"] += len(errors)
+    return stats, errors
+
+
+def after_import(kind):
+    """Caches that list colleges/events as a whole (per-row ones are bumped per chunk)."""
+    if kind.model in (College, Event):
+        bump_version(EVENTS_CACHE_NAMESPACE)
+        bump_version(AUTOCOMPLETE_NAMESPACE)
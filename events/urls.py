@@ -17,6 +17,7 @@ urlpatterns = [
 
     path("admin/reports/analytics/", views.admin_analytics_view, name="admin_analytics"),
     path("event/<str:event_id>/", views.event_detail_view, name="event_detail"),
+    path("event/<str:event_id>/share/", views.share_event_view, name="share_event"),
 
     path("by-college/<str:college_id>/", views.events_by_college, name="events_by_college"),
 
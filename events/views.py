@@ -5,67 +5,105 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.db.models import Prefetch
 from django.views.decorators.http import require_http_methods
 
-from accounts.models import AdminProfile
-from colleges.models import College
 from .models import Event
 from django.conf import settings
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 
 from django.db.models import Count, Avg, Max, Q
 from django.utils import timezone
 
+from django.core.cache import cache
+from django.db.models.functions import Substr
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from core.cache import versioned_key
+from core.keyset import cursor_key, decode_cursor, keyset_page
+from core.metrics import query_budget
+from core.query_audit import hot_query
+from core import images
+from core.uploads import media_url, store_upload
+from .signals import EVENTS_CACHE_NAMESPACE, event_detail_namespace
 from ugc.models import UGC, Review
 from analytics.models import Analytics, AnalyticsUser  # your app label ho to uske hisaab se
 from accounts.models import UserProfile
+from registrations.models import PLAN_CHOICES, SeatInventory
+from registrations.seats import set_capacity
 
 # ---------- Public list  ----------
-def events_page(request):
-    qs = Event.objects.select_related("college").order_by("-date_time", "title")
+EVENTS_PAGE_ORDERING = ("-date_time", "title", "event_id")
+EVENTS_PAGE_SIZE = getattr(settings, "EVENTS_PAGE_SIZE", 24)
+EVENTS_PAGE_CACHE_TTL = getattr(settings, "EVENTS_PAGE_CACHE_TTL", 300)
+EVENT_DETAIL_CACHE_TTL = getattr(settings, "EVENT_DETAIL_CACHE_TTL", 300)
+CARD_BLURB_LEN = 200
 
-    events = []
-    for e in qs:
-        # Decide which image field you are using
-        if hasattr(e, "image") and e.image:  # If using ImageField
-            img = e.image.url
-        elif hasattr(e, "image_url") and e.image_url:  # If storing URL
-            img = e.image_url
-        else:
-            img = ""  # fallback
 
-        events.append({
-            "event_id": e.event_id,
-            "title": e.title,
-            "college_name": e.college.name if e.college_id else "",
-            "date_time": e.date_time,
-            "location": e.location,
-            "tag": e.tag if hasattr(e, "tag") else "",
-            "description": e.description,
-            "image_url": img,
-        })
+def _event_card(e):
+    return {
+        "event_id": e.event_id,
+        "title": e.title,
+        "college_name": e.college.name if e.college_id else "",
+        "date_time": e.date_time,
+        "location": e.location,
+        "tag": e.tag if hasattr(e, "tag") else "",
+        "description": e.blurb,
+        "image_url": e.image_url or "",
+    }
+
+
+def _card_qs():
+    # cards only show a blurb, so never pull the full description column
+    return (Event.objects
+            .select_related("college")
+            .only("event_id", "title", "date_time", "location", "image_url",
+                  "college__college_id", "college__name")
+            .annotate(blurb=Substr("description", 1, CARD_BLURB_LEN)))
 
-    return render(request, "events/events_page.html", {"events": events})
 
+@hot_query("events.listing")
+def _listing_first_page():
+    return _card_qs().order_by(*EVENTS_PAGE_ORDERING)[:EVENTS_PAGE_SIZE + 1]
+
+
+@hot_query("events.college_events", college="COL0001")
+def _college_events(college):
+    return (Event.objects
+            .select_related("college")
+            .filter(college=college)
+            .order_by("-date_time", "title"))
+
+
+@query_budget(3)
+def events_page(request):
+    # key on what the cursor decodes to, never on the raw string: a junk or
+    # tampered ?after= gets the (cached) first page instead of its own entry
+    cursor = request.GET.get("after") or ""
+    values = decode_cursor(cursor, Event, EVENTS_PAGE_ORDERING)
+    if values is None:
+        cursor = ""
+    key = versioned_key(EVENTS_CACHE_NAMESPACE, "page", cursor_key(values))
+
+    cards_html = cache.get(key)
+    if cards_html is None:
+        rows, next_cursor = keyset_page(_card_qs(), EVENTS_PAGE_ORDERING, cursor, EVENTS_PAGE_SIZE)
+        cards_html = render_to_string("events/_event_cards.html", {
+            "events": [_event_card(e) for e in rows],
+            "next_cursor": next_cursor,
+        })
+        cache.set(key, cards_html, EVENTS_PAGE_CACHE_TTL)
+
+    return render(request, "events/events_page.html", {"cards_html": cards_html})
 
-ADMIN_SESSION_KEY = "admin_id"
 
 def _require_admin(request):
     """Return (admin, college) or redirect to admin_login with message."""
-    admin_id = request.session.get(ADMIN_SESSION_KEY)
-    if not admin_id:
+    principal = request.principal          # resolved once per request (accounts.middleware)
+    if not principal.admin_id:
         messages.error(request, "Please log in as admin.")
         return None
-    try:
-        admin = AdminProfile.objects.select_related("college").get(admin_id=admin_id)
-    except AdminProfile.DoesNotExist:
+    if principal.admin is None:
         messages.error(request, "Session invalid. Please log in again.")
         return None
-    # Your College model links to Admin as owner_admin (per prior code)
-    college = getattr(admin, "college", None)
-    if college is None:
-        # If relation name differs, fetch manually:
-        college = College.objects.filter(owner_admin=admin).first()
-    return admin, college
+    return principal.admin, principal.college
 
 
 def _parse_dt_local(val):
@@ -84,6 +122,41 @@ def _parse_dt_local(val):
         return None
 
 
+# ---------- Seat limits (registrations.seats) ----------
+def _capacity_inputs(request):
+    """{plan: int or None} from the capacity_<plan> fields (blank = unlimited), plus bad plans."""
+    caps, bad = {}, []
+    for plan, _ in PLAN_CHOICES:
+        raw = (request.POST.get(f"capacity_{plan}") or "").strip()
+        if not raw:
+            caps[plan] = None
+        elif raw.isdigit():
+            caps[plan] = int(raw)
+        else:
+            bad.append(plan)
+    return caps, bad
+
+
+def _apply_capacity(request, ev, caps):
+    for plan, cap in caps.items():
+        try:
+            set_capacity(ev, plan, cap)
+        except ValueError as exc:
+            messages.warning(request, f"Seat limit not changed: {exc}.")
+
+
+def _capacity_rows(ev=None):
+    current = {}
+    if ev is not None:
+        current = {plan: (cap, left) for plan, cap, left in
+                   SeatInventory.objects.filter(event=ev).values_list("plan", "capacity", "available")}
+    return [
+        {"plan": plan, "label": label,
+         "capacity": current.get(plan, (None, None))[0], "available": current.get(plan, (None, None))[1]}
+        for plan, label in PLAN_CHOICES
+    ]
+
+
 # ---------- Create ----------
 @require_http_methods(["GET", "POST"])
 def admin_create_event_view(request):
@@ -103,16 +176,18 @@ def admin_create_event_view(request):
         upload_file = request.FILES.get("image")
         image_url = ""
         if upload_file:
-            subdir = "events/images"
-            fname = f"{subdir}/{timezone.now().strftime('%Y%m%d%H%M%S')}_{upload_file.name}"
-            saved_path = default_storage.save(fname, ContentFile(upload_file.read()))
-            web_path   = saved_path.replace("\\", "/")
-            image_url  = f"{settings.MEDIA_URL.rstrip('/')}/{web_path}"
+            saved_path, _ = store_upload(upload_file, "events/images")
+            images.schedule(saved_path)
+            image_url  = media_url(saved_path)
 
 
         if not title:
             messages.error(request, "Title is required.")
             return redirect("events:admin_create_event")
+        caps, bad_caps = _capacity_inputs(request)
+        if bad_caps:
+            messages.error(request, "Seat limits must be whole numbers (leave blank for unlimited).")
+            return redirect("events:admin_create_event")
         if college is None:
             messages.error(request, "No college linked to this admin.")
             return redirect("events:admin_manage_events")
@@ -126,13 +201,16 @@ def admin_create_event_view(request):
             created_by=admin,
             image_url=image_url,
         )
+        _apply_capacity(request, ev, caps)
         messages.success(request, f"Event created: {ev.event_id} – {ev.title}")
         return redirect("events:admin_manage_events")
 
-    return render(request, "events/admin_create_event.html", {"admin": admin, "college": college})
+    return render(request, "events/admin_create_event.html",
+                  {"admin": admin, "college": college, "capacity_rows": _capacity_rows()})
 
 
 # ---------- Manage (list) ----------
+@query_budget(4)
 def admin_manage_events_view(request):
     gate = _require_admin(request)
     if gate is None:
@@ -140,12 +218,7 @@ def admin_manage_events_view(request):
     admin, college = gate
 
     # Pull full rows we need; select_related for college label if you show it.
-    qs = (
-        Event.objects
-        .filter(college=college)
-        .select_related("college")
-        .order_by("-date_time", "title")
-    )
+    qs = _college_events(college)
 
     # Build a slim dict per row with a correct image URL
     rows = []
@@ -197,15 +270,17 @@ def admin_edit_event_view(request, event_id):
         if not title:
             messages.error(request, "Title is required.")
             return redirect("events:admin_edit_event", event_id=event_id)
+        caps, bad_caps = _capacity_inputs(request)
+        if bad_caps:
+            messages.error(request, "Seat limits must be whole numbers (leave blank for unlimited).")
+            return redirect("events:admin_edit_event", event_id=event_id)
         
          # NEW: optional new image
         upload_file = request.FILES.get("image")
         if upload_file:
-            subdir = "events/images"
-            fname = f"{subdir}/{timezone.now().strftime('%Y%m%d%H%M%S')}_{upload_file.name}"
-            saved_path = default_storage.save(fname, ContentFile(upload_file.read()))
-            web_path   = saved_path.replace("\\", "/")
-            ev.image_url = f"{settings.MEDIA_URL.rstrip('/')}/{web_path}"
+            saved_path, _ = store_upload(upload_file, "events/images")
+            images.schedule(saved_path)
+            ev.image_url = media_url(saved_path)
 
 
 
@@ -214,13 +289,14 @@ def admin_edit_event_view(request, event_id):
         ev.date_time = date_time
         ev.location = location
         ev.save(update_fields=["title", "description", "date_time", "location","image_url"])
+        _apply_capacity(request, ev, caps)
 
         messages.success(request, "Event updated.")
         return redirect("events:admin_manage_events")
 
     # prefill form-friendly datetime-local value
     dt_value = ev.date_time.astimezone(timezone.get_current_timezone()).strftime("%Y-%m-%dT%H:%M") if ev.date_time else ""
-    return render(request, "events/admin_edit_event.html", {"event": ev, "dt_value": dt_value})
+    return render(request, "events/admin_edit_event.html", {"event": ev, "dt_value": dt_value, "capacity_rows": _capacity_rows(ev)})
 
 
 # ---------- Delete ----------
@@ -262,6 +338,17 @@ from django.contrib import messages
 from .models import Event
 from ugc.models import Review   # adjust import if your Review lives elsewhere
 
+@hot_query("events.college_reviews", college="COL0001")
+def _college_reviews(college):
+    return (
+        Review.objects
+        .filter(event__college=college)
+        .select_related("event", "user")
+        .order_by("-date_posted", "-review_id")
+    )
+
+
+@query_budget(4)
 @require_http_methods(["GET"])
 def admin_event_reviews_view(request):
     gate = _require_admin(request)
@@ -283,12 +370,7 @@ def admin_event_reviews_view(request):
     event_ids = event_scope.values_list("event_id", flat=True)
 
     # Reviews only for those events
-    reviews_qs = (
-        Review.objects
-        .filter(event__college=college)
-        .select_related("event", "user")
-        .order_by("-date_posted", "-review_id")
-    )
+    reviews_qs = _college_reviews(college)
 
     # Per-event aggregates (avg rating, count, last review date)
     aggregates = (
@@ -321,6 +403,17 @@ def admin_event_reviews_view(request):
 from ugc.models import UGC, Photo   # adjust import path if needed
 from django.db.models import Prefetch
 
+@hot_query("events.college_ugc", college="COL0001")
+def _college_ugc(college):
+    return (
+        UGC.objects
+        .filter(event__college=college)            # only this admin's events
+        .select_related("event", "user")           # load event & user in one query
+        .order_by("-posted_on", "-ugc_id")         # newest first
+    )
+
+
+@query_budget(5)
 @require_http_methods(["GET"])
 def admin_event_ugc_view(request):
     gate = _require_admin(request)
@@ -328,13 +421,7 @@ def admin_event_ugc_view(request):
         return redirect("admin_login")
     admin, college = gate
 
-    ugc_posts = (
-        UGC.objects
-        .filter(event__college=college)            # only this admin's events
-        .select_related("event", "user")           # load event & user in one query
-        .prefetch_related(Prefetch("photos",queryset=Photo.objects.all()))
-        .order_by("-posted_on","-ugc_id")                   # newest first
-    )
+    ugc_posts = _college_ugc(college).prefetch_related(Prefetch("photos", queryset=Photo.objects.all()))
 
     return render(request, "events/admin_event_ugc.html", {
         "admin":admin,
@@ -348,10 +435,19 @@ def admin_event_ugc_view(request):
 
 # events/views.py
 # accounts/views.py
-from django.db.models import F, Value, IntegerField
+from django.db.models import OuterRef, Subquery
 from django.db.models.functions import Coalesce
 from analytics.models import Analytics
+from analytics.rollups import ensure_rollups, mark_popular
+from core.jobs import enqueue
+
 
+@hot_query("events.college_events_by_title", college="COL0001")
+def _college_events_by_title(college):
+    return Event.objects.filter(college=college).order_by("title")
+
+
+@query_budget(8)
 @require_http_methods(["GET"])
 def admin_analytics_view(request):
     gate = _require_admin(request)
@@ -359,53 +455,37 @@ def admin_analytics_view(request):
         return redirect("admin_login")
     admin, college = gate
 
-    events_qs = Event.objects.filter(college=college).order_by("title")
-    rows = []
-
-    for ev in events_qs:
-        ana, _ = Analytics.objects.get_or_create(event=ev)
-
-        ugc_count     = UGC.objects.filter(event=ev).count()
-        reviews_qs    = Review.objects.filter(event=ev)
-        reviews_count = reviews_qs.count()
-        avg_rating    = reviews_qs.aggregate(a=Avg("rating"))["a"] or 0
-        views         = ana.views or 0
-        shares        = ana.shares or 0
-
-        engagement_score = (ugc_count*3) + (reviews_count*4) + int(avg_rating*2) + (views*1) + (shares*2)
-
-        # last activity + recent user (your existing logic)
-        last_ugc_dt   = UGC.objects.filter(event=ev).aggregate(m=Max("posted_on"))["m"]
-        last_rev_dt   = reviews_qs.aggregate(m=Max("date_posted"))["m"]
-        last_activity = max([d for d in (last_ugc_dt, last_rev_dt) if d], default=None)
-
-        recent_user = None
-        if last_activity:
-            u = (UGC.objects.filter(event=ev, posted_on=last_activity)
-                          .select_related("user").order_by("-ugc_id").first())
-            if not u:
-                rv = (Review.objects.filter(event=ev, date_posted=last_activity)
-                                 .select_related("user").order_by("-review_id").first())
-                u = rv
-            recent_user = getattr(u, "user", None)
-
-        if not recent_user:
-            link = (AnalyticsUser.objects.filter(analytics=ana)
-                                   .select_related("user")
-                                   .order_by("-id").first())
-            recent_user = link.user if link else None
+    # counters are maintained incrementally (analytics.rollups); just read them
+    events = list(_college_events_by_title(college))
+    analytics_map = ensure_rollups(events)
+
+    # no UGC/review yet: fall back to the most recently linked analytics user
+    no_activity = [a.pk for a in analytics_map.values() if not a.last_user_id]
+    link_users = {}
+    if no_activity:
+        latest_link = (AnalyticsUser.objects.filter(analytics=OuterRef("pk"))
+                       .order_by("-id").values("user_id")[:1])
+        link_ids = dict(Analytics.objects.filter(pk__in=no_activity)
+                        .annotate(uid=Subquery(latest_link))
+                        .filter(uid__isnull=False)
+                        .values_list("pk", "uid"))
+        users = UserProfile.objects.in_bulk(set(link_ids.values()))
+        link_users = {pk: users.get(uid) for pk, uid in link_ids.items()}
 
+    rows = []
+    for ev in events:
+        ana = analytics_map[ev.event_id]
         rows.append({
             "event": ev,
             "analytics": ana,
-            "ugc_count": ugc_count,
-            "reviews_count": reviews_count,
-            "avg_rating": avg_rating,
-            "views": views,
-            "shares": shares,
-            "engagement_score": engagement_score,
-            "last_activity": last_activity,
-            "recent_user": recent_user,
+            "ugc_count": ana.ugc_count,
+            "reviews_count": ana.reviews_count,
+            "avg_rating": ana.avg_rating,
+            "views": ana.views or 0,
+            "shares": ana.shares or 0,
+            "engagement_score": ana.engagement_score,
+            "last_activity": ana.last_activity,
+            "recent_user": ana.last_user or link_users.get(ana.pk),
         })
 
     # ---------- Pick popular (highest engagement within this college) ----------
@@ -417,13 +497,17 @@ def admin_analytics_view(request):
         popular_row = rows_sorted[-1]   # highest score
         popular_event_id = popular_row["event"].event_id
 
-        # Persist a single "yes" for this college, "no" for others
-        Analytics.objects.filter(event__college=college).update(popular_event="no")
-        Analytics.objects.filter(event__event_id=popular_event_id).update(popular_event="yes")
+        # Persisting the flags is left to a background job, and only queued
+        # when what's stored disagrees with what we just computed
+        stale = any((r["analytics"].popular_event == "yes") != (r["event"].event_id == popular_event_id)
+                    for r in rows)
+        if stale and college is not None:
+            enqueue(mark_popular, college.college_id, key=f"popular:{college.college_id}")
 
-        # Also tag the in-memory row so template can show immediately
+        # Tag the in-memory rows so the template shows it immediately
         for r in rows:
             r["is_popular"] = (r["event"].event_id == popular_event_id)
+            r["analytics"].popular_event = "yes" if r["is_popular"] else "no"
     else:
         popular_event_id = None
 
@@ -439,23 +523,48 @@ from django.shortcuts import render, get_object_or_404
 from django.db.models import Avg, Count
 from .models import Event
 from ugc.models import UGC, Review  # adjust app label if different
+from analytics.counters import record_view, record_share
 
+@query_budget(4)
 def event_detail_view(request, event_id):
-    ev = get_object_or_404(Event, event_id=event_id)
+    # stats + rendered fragment, dropped whenever the event or its UGC/reviews change
+    key = versioned_key(event_detail_namespace(event_id), "detail")
+    cached = cache.get(key)
+    if cached is None:
+        ev = get_object_or_404(Event, event_id=event_id)
+        stats = Review.objects.filter(event=ev).aggregate(
+            reviews_count=Count("review_id"), avg_rating=Avg("rating"))
+        stats["ugc_count"] = UGC.objects.filter(event=ev).count()
+        stats["avg_rating"] = stats["avg_rating"] or 0
+        cached = {
+            "title": ev.title,
+            "stats": stats,
+            "detail_html": render_to_string("events/_event_detail.html", {"event": ev, **stats}),
+        }
+        cache.set(key, cached, EVENT_DETAIL_CACHE_TTL)
+    record_view(event_id)
+
+    return render(request, "events/event_detail.html", {
+        "event_id": event_id,
+        "title": cached["title"],
+        "detail_html": cached["detail_html"],
+        **cached["stats"],
+    })
 
-    # Stats
-    ugc_count     = UGC.objects.filter(event=ev).count()
-    reviews_qs    = Review.objects.filter(event=ev)
-    reviews_count = reviews_qs.count()
-    avg_rating    = reviews_qs.aggregate(a=Avg("rating"))["a"] or 0
 
-    context = {
-        "event": ev,
-        "ugc_count": ugc_count,
-        "reviews_count": reviews_count,
-        "avg_rating": avg_rating,
-    }
-    return render(request, "events/event_detail.html", context)
+@require_http_methods(["GET", "POST"])
+def share_event_view(request, event_id):
+    """
+    GET continues to the event's Share & Review hub (the "Share & Review"
+    links). Only the hub's Share button (POST) counts a share; it shows the
+    link to pass on.
+    """
+    ev = get_object_or_404(Event.objects.only("event_id"), event_id=event_id)
+    if request.method == "POST":
+        record_share(ev.event_id)
+        link = request.build_absolute_uri(reverse("events:event_detail", args=[ev.event_id]))
+        messages.success(request, f"Share this link: {link}")
+    return redirect("ugc:event_hub", event_id=ev.event_id)
 
 
 from django.shortcuts import render, get_object_or_404
@@ -464,12 +573,10 @@ from .models import Event
 
 
 
+@query_budget(4)
 def events_by_college(request, college_id):
     college = get_object_or_404(College, college_id=college_id)
-    qs = (Event.objects
-                .select_related("college")
-                .filter(college=college)
-                .order_by("-date_time", "title"))
+    qs = _college_events(college)
 
     # reuse your events card structure
     events = [{
@@ -0,0 +1,131 @@
+# foreverfest/db_profiles.py
+"""
+DATABASES["default"] profiles, picked in settings.py with FOREVERFEST_DB.
+
+sqlite
+    WAL journal (readers never block the writer), synchronous=NORMAL (safe
+    in WAL, one fsync per checkpoint instead of per commit), a memory-mapped
+    read path, a bigger page cache, a busy timeout so writers queue instead of
+    failing with "database is locked", and BEGIN IMMEDIATE so a transaction
+    takes the write lock up front rather than failing when a read turns into
+    a write. Connections are kept for CONN_MAX_AGE so the pragmas run once.
+sqlite-basic
+    What settings.py used to ship: rollback journal, Python's default 5s
+    busy timeout, deferred transactions (a read that turns into a write
+    fails at once when another writer holds the lock). Kept for comparisons
+    (``manage.py bench_db``).
+postgres
+    PostgreSQL through psycopg 3 with Django's connection pool
+    (``pip install "psycopg[pool]"``); CONN_MAX_AGE must stay 0 with a pool.
+postgres-persistent
+    PostgreSQL with one persistent connection per worker thread and health
+    checks - for psycopg without the pool extra, or behind PgBouncer.
+
+PostgreSQL connection details come from FOREVERFEST_PG_NAME / _USER /
+_PASSWORD / _HOST / _PORT, the pool size from FOREVERFEST_PG_POOL_MIN / _MAX.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+SQLITE_BUSY_TIMEOUT = 20                 # seconds a writer waits for the lock
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_CACHE_KIB = 64 * 1024             # negative cache_size = KiB, not pages
+CONN_MAX_AGE = 60
+
+
+def _env(name, default):
+    return os.environ.get(f"FOREVERFEST_PG_{name}", default)
+
+
+def sqlite(name):
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "CONN_MAX_AGE": CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "timeout": SQLITE_BUSY_TIMEOUT,
+            "transaction_mode": "IMMEDIATE",
+            "init_command": ";".join([
+                "PRAGMA journal_mode=WAL",
+                "PRAGMA synchronous=NORMAL",
+                f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+                f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}",
+                "PRAGMA temp_store=MEMORY",
+            ]),
+        },
+    }
+
+
+def sqlite_basic(name):
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        # journal_mode is stored in the file, so switch it back explicitly
+        "OPTIONS": {"init_command": "PRAGMA journal_mode=DELETE"},
+    }
+
+
+def _postgres_base():
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": _env("NAME", "foreverfest"),
+        "USER": _env("USER", "foreverfest"),
+        "PASSWORD": _env("PASSWORD", ""),
+        "HOST": _env("HOST", "localhost"),
+        "PORT": _env("PORT", "5432"),
+        "CONN_HEALTH_CHECKS": True,
+    }
+
+
+def postgres(name=None):
+    db = _postgres_base()
+    db["CONN_MAX_AGE"] = 0
+    db["OPTIONS"] = {
+        "pool": {
+            "min_size": int(_env("POOL_MIN", "2")),
+            "max_size": int(_env("POOL_MAX", "20")),
+            "timeout": 10,               # seconds to wait for a free connection
+        },
+    }
+    return db
+
+
+def postgres_persistent(name=None):
+    db = _postgres_base()
+    db["CONN_MAX_AGE"] = CONN_MAX_AGE
+    return db
+
+
+PROFILES = {
+    "sqlite": sqlite,
+    "sqlite-basic": sqlite_basic,
+    "postgres": postgres,
+    "postgres-persistent": postgres_persistent,
+}
+
+
+def database(profile, sqlite_name):
+    """The DATABASES["default"] dict for ``profile``; ``sqlite_name`` is the SQLite file."""
+    try:
+        return PROFILES[profile](sqlite_name)
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"FOREVERFEST_DB={profile!r}; choose one of {', '.join(PROFILES)}") from None
+
+
+def describe(connection):
+    """One line about what a live connection is actually running with (benchmark output)."""
+    profile = os.environ.get("FOREVERFEST_DB", "sqlite")
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cur:
+            mode = cur.execute("PRAGMA journal_mode").fetchone()[0]
+            sync = cur.execute("PRAGMA synchronous").fetchone()[0]
+            busy = cur.execute("PRAGMA busy_timeout").fetchone()[0]
+        return (f"{profile}: journal_mode={mode} synchronous={sync} busy_timeout={busy}ms "
+                f"begin={connection.transaction_mode or 'DEFERRED'}")
+    settings_dict = connection.settings_dict
+    pool = settings_dict["OPTIONS"].get("pool")
+    return (f"{profile}: {connection.vendor} {settings_dict['HOST']}/{settings_dict['NAME']} "
+            f"pool={'on' if pool else 'off'} CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}")
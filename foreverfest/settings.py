@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from . import db_profiles
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,23 +46,62 @@ INSTALLED_APPS = [
     'registrations',
     'ugc',
     'analytics',
+    'core',
+    'search',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.CurrentPrincipalMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'foreverfest.urls'
 
+# Sessions only hold user_id / admin_id (+ flash messages), so keep them off the
+# database hot path. FOREVERFEST_SESSIONS picks the backend:
+#   cached_db (default)  read from cache, written through to the DB
+#   cache                cache only; needs a cache shared by all workers
+#   signed_cookies       no server-side storage at all
+#   db                   Django's default
+SESSION_ENGINE = {
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+    "db": "django.contrib.sessions.backends.db",
+}[os.environ.get("FOREVERFEST_SESSIONS", "cached_db")]
+
+# Cached pages and stats are invalidated by bumping version keys (core.cache),
+# which only reaches every worker if they all share one cache.
+# FOREVERFEST_CACHE picks the backend:
+#   file (default)  files under FOREVERFEST_CACHE_DIR; any number of workers on one host
+#   redis           FOREVERFEST_REDIS_URL; workers on several hosts (needs the redis package)
+#   locmem          per-process memory; only for a single-process runserver
+CACHES = {
+    "default": {
+        "file": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("FOREVERFEST_CACHE_DIR", str(BASE_DIR / ".cache")),
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        },
+        "redis": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("FOREVERFEST_REDIS_URL", "redis://127.0.0.1:6379/0"),
+        },
+        "locmem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }[os.environ.get("FOREVERFEST_CACHE", "file")]
+}
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that also times renders for core.metrics
+        'BACKEND': 'core.metrics.TimedDjangoTemplates',
         'DIRS':[BASE_DIR/'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -79,11 +121,14 @@ WSGI_APPLICATION = 'foreverfest.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# FOREVERFEST_DB picks the database profile (details in foreverfest/db_profiles.py):
+#   sqlite (default)     WAL, synchronous=NORMAL, mmap, busy timeout, BEGIN IMMEDIATE
+#   sqlite-basic         the old plain SQLite setup, for comparisons
+#   postgres             PostgreSQL with a connection pool (FOREVERFEST_PG_* settings)
+#   postgres-persistent  PostgreSQL with persistent connections instead of a pool
+# `manage.py bench_db` compares write throughput between profiles.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': db_profiles.database(os.environ.get("FOREVERFEST_DB", "sqlite"), BASE_DIR / 'db.sqlite3'),
 }
 
 
@@ -105,6 +150,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing policy. New hashes use PBKDF2-SHA256 with this many
+# iterations (Django's default unless overridden); hashes with another count or
+# from the other hashers below still verify and are re-hashed on next login.
+# `manage.py bench_logins` shows logins/sec per core for candidate counts.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("FOREVERFEST_PBKDF2_ITERATIONS", "1000000"))
+PASSWORD_HASHERS = [
+    'accounts.hashers.PolicyPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -126,6 +184,59 @@ USE_TZ = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Prefixed IDs (core.sequences): how many numbers a worker reserves per DB round trip
+ID_SEQUENCE_BLOCK_SIZE = 20
+
+# Buffered Analytics.views/shares (analytics.counters): flush every N hits or T seconds
+ANALYTICS_COUNTER_FLUSH_SIZE = 500
+ANALYTICS_COUNTER_FLUSH_INTERVAL = 5.0
+
+# Public events listing: cards per page and how long a rendered page is cached
+EVENTS_PAGE_SIZE = 24
+EVENTS_PAGE_CACHE_TTL = 300
+# Event detail page: cached stats + fragment per event, invalidated by events.signals
+EVENT_DETAIL_CACHE_TTL = 300
+
+# Event hub / My UGC feeds: rows per page (the rest loads on scroll, ugc.views)
+UGC_FEED_PAGE_SIZE = 12
+
+# Header search autocomplete (search.autocomplete): in-memory prefix index limits
+AUTOCOMPLETE_MAX_ENTRIES = 300_000
+AUTOCOMPLETE_MAX_AGE = 300
+AUTOCOMPLETE_FRAGMENT_CACHE_SIZE = 512
+
+# Admin dashboard / registrations overview totals (registrations.stats)
+COLLEGE_STATS_CACHE_TTL = 60
+
+# User dashboard "My activity" lists: rows per list and cache lifetime (accounts.activity)
+USER_ACTIVITY_ITEMS = 5
+USER_ACTIVITY_CACHE_TTL = 300
+
+# How long a reserved seat is kept for an unfinished registration (registrations.seats)
+SEAT_HOLD_SECONDS = 600
+
+# Group bookings (registrations:admin_bulk_register): most user x event pairs per call
+REGISTRATION_BULK_MAX_ITEMS = 5000
+
+# Request metrics (core.metrics): samples kept per view for percentiles; bearer
+# token for the /metrics scrape endpoint (staff sessions may read it too);
+# QUERY_BUDGET_RAISE turns an exceeded @query_budget into an exception (tests)
+METRICS_WINDOW = 500
+METRICS_TOKEN = os.environ.get("FOREVERFEST_METRICS_TOKEN", "")
+QUERY_BUDGET_RAISE = False
+
+# Media uploads (core.uploads): read/hash/copy granularity
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Image derivatives (core.images): output formats, best first
+IMAGE_DERIVATIVE_FORMATS = ("avif", "webp")
+
+# Background jobs (core.jobs, run with `manage.py run_jobs`): retries and backoff
+JOBS_MAX_ATTEMPTS = 5
+JOBS_BACKOFF_BASE = 5.0
+JOBS_BACKOFF_MAX = 3600.0
+JOBS_LEASE_SECONDS = 600
+
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR/'static']
 MEDIA_URL = 'media/'
@@ -32,6 +32,8 @@ urlpatterns = [
     path("events/", include(("events.urls", "events"), namespace="events")),
     path("ugc/", include("ugc.urls", namespace="ugc")),
     path("registrations/", include(("registrations.urls", "registrations"), namespace="registrations")),
+    path("analytics/", include("analytics.urls", namespace="analytics")),
+    path("", include("core.urls", namespace="core")),
 
 ]
 
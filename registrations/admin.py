@@ -1,6 +1,7 @@
 # Register your models here.
-from django.contrib import admin
-from .models import Registration, Invoice, Payment
+from django.contrib import admin, messages
+from .models import Registration, Invoice, Payment, SeatHold, SeatInventory
+from .seats import set_capacity
 
 
 # ---------- Inlines ----------
@@ -53,3 +54,29 @@ class PaymentAdmin(admin.ModelAdmin):
     search_fields = ("payment_id", "invoice__invoice_id", "invoice__registration__registration_id")
     readonly_fields = ("payment_id", "paid_at")
     autocomplete_fields = ("invoice",)
+
+
+@admin.register(SeatInventory)
+class SeatInventoryAdmin(admin.ModelAdmin):
+    list_display = ("event", "plan", "capacity", "available")
+    list_filter = ("plan",)
+    search_fields = ("event__event_id", "event__title")
+    readonly_fields = ("available",)
+    autocomplete_fields = ("event",)
+
+    def save_model(self, request, obj, form, change):
+        # available only moves through conditional updates (registrations.seats)
+        try:
+            inv = set_capacity(obj.event, obj.plan, obj.capacity)
+        except ValueError as exc:
+            self.message_user(request, f"Capacity not changed: {exc}", level=messages.ERROR)
+            return
+        obj.pk, obj.available = inv.pk, inv.available
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("id", "event", "plan", "user", "status", "expires_at", "registration")
+    list_filter = ("status", "plan")
+    search_fields = ("event__event_id", "user__username", "registration__registration_id")
+    readonly_fields = ("event", "plan", "user", "status", "expires_at", "created_at", "registration")
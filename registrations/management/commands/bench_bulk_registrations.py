@@ -0,0 +1,54 @@
+# registrations/management/commands/bench_bulk_registrations.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from foreverfest.db_profiles import describe
+from registrations.models import Registration
+from registrations.services import CREATED, register_many
+from .loadtest_registrations import seed
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time registrations.services.register_many for growing group bookings "
+        "(users x events) on throwaway rows that are rolled back, and report "
+        "rows per second and SQL statements per call."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,100,1000,5000",
+                            help="Comma-separated registrations per call.")
+        parser.add_argument("--events", type=int, default=5, help="Events per call; users = size / events.")
+        parser.add_argument("--plan", default="basic")
+        parser.add_argument("--gateway", default="upi")
+
+    def handle(self, *args, **opts):
+        self.stdout.write(describe(connection))
+        for size in [int(x) for x in opts["sizes"].split(",") if x.strip()]:
+            try:
+                with transaction.atomic():
+                    self._run(size, opts)
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _run(self, size, opts):
+        n_events = max(1, min(opts["events"], size))
+        _, _, events, users = seed(max(1, size // n_events), n_events)
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            results = register_many(users, events, opts["plan"], opts["gateway"])
+            seconds = time.perf_counter() - t0
+        created = sum(r["status"] == CREATED for r in results)
+        assert created == Registration.objects.filter(event__in=events).count() == len(results)
+        self.stdout.write(
+            f"pairs={len(results):>6}  time={seconds * 1000:8.1f} ms  "
+            f"rows/s={created / seconds:9.0f}  queries={len(ctx.captured_queries):>4}"
+        )
@@ -0,0 +1,128 @@
+# registrations/management/commands/bench_db.py
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from events.models import Event
+from foreverfest.db_profiles import PROFILES, describe
+from registrations.services import GATEWAYS, PLAN_PRICES, register
+from ugc.models import UGC, Photo
+from .loadtest_registrations import percentile, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare database profiles (FOREVERFEST_DB) under concurrent writers: each "
+        "profile runs in its own process doing registrations, UGC posts and listing "
+        "reads from many threads; prints throughput, errors and latency. PostgreSQL "
+        "profiles need FOREVERFEST_PG_* and a migrated database. Uses throwaway rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", default="sqlite-basic,sqlite",
+                            help=f"Comma-separated profiles to compare ({', '.join(PROFILES)}).")
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--ops", type=int, default=150, help="Operations per thread.")
+        parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    def handle(self, *args, **opts):
+        if opts["child"]:
+            self.stdout.write(json.dumps(self._run(opts["threads"], opts["ops"])))
+            return
+
+        self.stdout.write(f"{opts['threads']} threads x {opts['ops']} ops "
+                          "(60% register, 25% UGC post, 15% listing read)")
+        self.stdout.write(f"{'profile':<20} {'ops/s':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for profile in [p.strip() for p in opts["profiles"].split(",") if p.strip()]:
+            if profile not in PROFILES:
+                raise CommandError(f"Unknown profile {profile!r}; choose from {', '.join(PROFILES)}")
+            result = self._child(profile, opts)
+            if "error" in result:
+                self.stdout.write(self.style.WARNING(f"{profile:<20} skipped: {result['error']}"))
+                continue
+            self.stdout.write(
+                f"{profile:<20} {result['ops_per_s']:>7.0f} {result['errors']:>7} "
+                f"{result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f}"
+            )
+            self.stdout.write(f"    {result['describe']}")
+            for message in result["error_sample"]:
+                self.stdout.write(f"    {message}")
+
+    def _child(self, profile, opts):
+        env = dict(os.environ, FOREVERFEST_DB=profile)
+        proc = subprocess.run(
+            [sys.executable, "-m", "django", "bench_db", "--child",
+             "--threads", str(opts["threads"]), "--ops", str(opts["ops"])],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode or not lines:
+            tail = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+            return {"error": tail}
+        return json.loads(lines[-1])
+
+    def _run(self, threads, ops):
+        admin, college, events, users = seed(threads * ops, 8)
+        pairs = iter([(u, random.choice(events)) for u in users])
+        pair_lock, lock = threading.Lock(), threading.Lock()
+        latencies, errors = [], []
+
+        def one():
+            roll = random.random()
+            if roll < 0.60:
+                with pair_lock:
+                    user, event = next(pairs)
+                register(user, event, random.choice(list(PLAN_PRICES)), random.choice(GATEWAYS))
+            elif roll < 0.85:
+                # the same short transaction event_hub_view does for a photo post
+                with transaction.atomic():
+                    ugc = UGC.objects.create(content_type="photo", content_data="bench",
+                                             user=random.choice(users), event=random.choice(events))
+                    Photo.objects.create(ugc=ugc, uploaded_by=ugc.user, image_url="/media/bench.jpg")
+            else:
+                list(Event.objects.filter(college=college).order_by("-date_time", "title")[:24])
+
+        def worker(_):
+            try:
+                for _ in range(ops):
+                    t0 = time.perf_counter()
+                    try:
+                        one()
+                    except Exception as exc:
+                        with lock:
+                            errors.append(f"{type(exc).__name__}: {exc}")
+                        continue
+                    with lock:
+                        latencies.append((time.perf_counter() - t0) * 1000)
+            finally:
+                connections.close_all()
+
+        try:
+            info = describe(connection)
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(worker, range(threads)))
+            elapsed = time.perf_counter() - t0
+        finally:
+            college.delete()
+            type(users[0]).objects.filter(pk__in=[u.pk for u in users]).delete()
+            admin.delete()
+
+        lat = sorted(latencies)
+        return {
+            "describe": info,
+            "ops_per_s": len(lat) / elapsed,
+            "errors": len(errors),
+            "error_sample": sorted(set(errors))[:3],
+            "p50": percentile(lat, 0.5), "p95": percentile(lat, 0.95), "p99": percentile(lat, 0.99),
+        }
@@ -0,0 +1,136 @@
+# registrations/management/commands/bench_seats.py
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count
+
+from core.models import Job
+from foreverfest.db_profiles import describe
+from registrations import seats
+from registrations.models import PLAN_CHOICES, Registration, SeatHold, SeatInventory
+from registrations.services import GATEWAYS, register
+from .loadtest_registrations import percentile, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer one hot event with limited seats per plan from many threads: "
+        "registrations, failed payments (hold released) and abandoned holds "
+        "(expired, then reclaimed). Checks nothing was oversold and reports "
+        "throughput and latency. Uses throwaway rows that are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seats", type=int, default=100, help="Seats per plan.")
+        parser.add_argument("--users", type=int, default=1000, help="Buyers competing for the seats.")
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--fail-rate", type=float, default=0.1,
+                            help="Share of buyers whose payment fails after the seat was held.")
+        parser.add_argument("--abandon-rate", type=float, default=0.05,
+                            help="Share of buyers who hold a seat and never come back.")
+        parser.add_argument("--hold-seconds", type=float, default=0.5,
+                            help="Hold expiry used for the run, so abandoned seats come back quickly.")
+
+    def handle(self, *args, **opts):
+        self.stdout.write(describe(connection))
+
+        admin, college, (event,), users = seed(opts["users"], 1)
+        plans = [plan for plan, _ in PLAN_CHOICES]
+        for plan in plans:
+            seats.set_capacity(event, plan, opts["seats"])
+        self.stdout.write(
+            f"{event.pk}: {opts['seats']} seats x {len(plans)} plans, {len(users)} buyers, "
+            f"{opts['threads']} threads, fail {opts['fail_rate']:.0%}, abandon {opts['abandon_rate']:.0%}"
+        )
+
+        hold_seconds, seats.HOLD_SECONDS = seats.HOLD_SECONDS, opts["hold_seconds"]
+        lock = threading.Lock()
+        latencies, outcomes, errors = [], {}, []
+
+        def buy(user):
+            plan, roll = random.choice(plans), random.random()
+            t0 = time.perf_counter()
+            try:
+                if roll < opts["fail_rate"]:
+                    hold = seats.reserve(event, plan, user)
+                    seats.release(hold)              # the gateway said no
+                    outcome = "payment failed"
+                elif roll < opts["fail_rate"] + opts["abandon_rate"]:
+                    seats.reserve(event, plan, user)
+                    outcome = "abandoned"
+                else:
+                    register(user, event, plan, random.choice(GATEWAYS))
+                    outcome = "registered"
+            except seats.SoldOut:
+                outcome = "sold out"
+            except Exception as exc:
+                with lock:
+                    errors.append(f"{type(exc).__name__}: {exc}")
+                return
+            ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencies.append(ms)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        def worker(chunk):
+            try:
+                for user in chunk:
+                    buy(user)
+            finally:
+                connections.close_all()
+
+        random.shuffle(users)
+        chunks = [users[i::opts["threads"]] for i in range(opts["threads"])]
+        try:
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=opts["threads"]) as pool:
+                list(pool.map(worker, chunks))
+            elapsed = time.perf_counter() - t0
+            time.sleep(opts["hold_seconds"])
+            swept = seats.release_expired(event=event)
+            self._report(event, opts["seats"], latencies, outcomes, errors, elapsed, swept)
+        finally:
+            seats.HOLD_SECONDS = hold_seconds
+            Job.objects.filter(key__startswith=f"seats:{event.pk}:").delete()
+            college.delete()
+            type(users[0]).objects.filter(pk__in=[u.pk for u in users]).delete()
+            admin.delete()
+
+    def _report(self, event, capacity, latencies, outcomes, errors, elapsed, swept):
+        lat = sorted(latencies)
+        self.stdout.write(
+            f"{len(lat)} buyers in {elapsed:.2f}s -> {len(lat) / elapsed:.0f}/s; "
+            + ", ".join(f"{k} {v}" for k, v in sorted(outcomes.items()))
+        )
+        if lat:
+            self.stdout.write(
+                f"latency ms: p50 {percentile(lat, 0.5):.1f}  p95 {percentile(lat, 0.95):.1f}  "
+                f"p99 {percentile(lat, 0.99):.1f}  max {lat[-1]:.1f}"
+            )
+        self.stdout.write(f"expired holds swept afterwards: {swept}")
+
+        holds = {(row["plan"], row["status"]): row["n"] for row in
+                 SeatHold.objects.filter(event=event).values("plan", "status").order_by().annotate(n=Count("id"))}
+        ok = not errors
+        for inv in SeatInventory.objects.filter(event=event).order_by("plan"):
+            sold = holds.get((inv.plan, SeatHold.CONFIRMED), 0)
+            held = holds.get((inv.plan, SeatHold.HELD), 0)
+            balanced = inv.available + sold + held == inv.capacity and sold <= capacity
+            ok &= balanced
+            self.stdout.write(
+                f"  {inv.plan:<8} sold {sold:>5}  held {held:>4}  left {inv.available:>5}  "
+                f"of {inv.capacity}{'' if balanced else '  <- MISMATCH'}"
+            )
+        registrations = Registration.objects.filter(event=event).count()
+        confirmed = sum(n for (_, status), n in holds.items() if status == SeatHold.CONFIRMED)
+        self.stdout.write(f"registrations {registrations}, confirmed seats {confirmed}")
+        for message in sorted(set(errors))[:5]:
+            self.stderr.write(f"  {message}")
+
+        if not ok or registrations != confirmed:
+            raise CommandError("Seat inventory does not add up.")
+        self.stdout.write(self.style.SUCCESS("No seat oversold; every seat is sold, held or available."))
@@ -0,0 +1,137 @@
+# registrations/management/commands/loadtest_registrations.py
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count
+
+from accounts.models import AdminProfile, UserProfile, normalize_login_name
+from colleges.models import College
+from core.sequences import allocate_ids
+from events.models import Event
+from foreverfest.db_profiles import describe
+from registrations.models import Invoice, Payment, Registration
+from registrations.services import GATEWAYS, PLAN_PRICES, register
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def seed(n_users, n_events):
+    """Throwaway admin, college, events and users for the load tests."""
+    tag = allocate_ids("USR")[0].lower()
+    admin = AdminProfile.objects.create(
+        full_name="Load Test", admin_name=f"loadtest-{tag}", contact_no="0",
+        email=f"loadtest-{tag}@example.invalid", gender="O", password="!",
+    )
+    college = College.objects.create(name=f"Load Test College {tag}", owner_admin=admin)
+    events = Event.objects.bulk_create(
+        Event(event_id=eid, college=college, title=f"Load test {i}", created_by=admin)
+        for i, eid in enumerate(allocate_ids("EVT", n_events))
+    )
+    users = UserProfile.objects.bulk_create(
+        UserProfile(user_id=uid, username=f"lt_{uid}", username_key=normalize_login_name(f"lt_{uid}"),
+                    email=f"{uid.lower()}@lt.invalid", password="!")
+        for uid in allocate_ids("USR", n_users)
+    )
+    return admin, college, events, users
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent registrations (including repeats of the same user/event) "
+        "at registrations.services.register from many threads, then check that no "
+        "duplicates were written and report latency percentiles. Uses throwaway "
+        "rows that are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--events", type=int, default=10)
+        parser.add_argument("--attempts", type=int, default=2,
+                            help="Times each (user, event) pair is submitted.")
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--keep", action="store_true", help="Leave the generated rows in place.")
+
+    def handle(self, *args, **opts):
+        self.stdout.write(describe(connection))
+
+        admin, college, events, users = seed(opts["users"], opts["events"])
+        pairs = [(u, e) for u in users for e in events] * opts["attempts"]
+        random.shuffle(pairs)
+        self.stdout.write(
+            f"{len(pairs)} submissions ({len(users)} users x {len(events)} events x "
+            f"{opts['attempts']}) on {opts['threads']} threads"
+        )
+
+        lock = threading.Lock()
+        latencies, errors, created = [], [], [0]
+
+        def attempt(pair):
+            user, event = pair
+            t0 = time.perf_counter()
+            try:
+                _, was_created = register(user, event, random.choice(list(PLAN_PRICES)),
+                                          random.choice(GATEWAYS))
+            except Exception as exc:
+                with lock:
+                    errors.append(f"{type(exc).__name__}: {exc}")
+                return
+            ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencies.append(ms)
+                created[0] += was_created
+
+        def worker(chunk):
+            try:
+                for pair in chunk:
+                    attempt(pair)
+            finally:
+                connections.close_all()
+
+        chunks = [pairs[i::opts["threads"]] for i in range(opts["threads"])]
+        try:
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=opts["threads"]) as pool:
+                list(pool.map(worker, chunks))
+            elapsed = time.perf_counter() - t0
+            self._report(pairs, users, events, latencies, errors, created[0], elapsed)
+        finally:
+            if not opts["keep"]:
+                college.delete()          # cascades to events, registrations, invoices, payments
+                UserProfile.objects.filter(pk__in=[u.pk for u in users]).delete()
+                admin.delete()
+
+    def _report(self, pairs, users, events, latencies, errors, created, elapsed):
+        expected = len({(u.pk, e.pk) for u, e in pairs})
+        regs = Registration.objects.filter(event__in=events)
+        stored = regs.count()
+        dupes = (regs.values("user_id", "event_id").order_by()
+                 .annotate(n=Count("registration_id")).filter(n__gt=1).count())
+        invoices = Invoice.objects.filter(registration__in=regs).count()
+        payments = Payment.objects.filter(invoice__registration__in=regs).count()
+
+        lat = sorted(latencies)
+        self.stdout.write(
+            f"{len(lat)} ok, {len(errors)} errors in {elapsed:.2f}s -> {len(lat) / elapsed:.0f} submissions/s"
+        )
+        if lat:
+            self.stdout.write(
+                f"latency ms: p50 {percentile(lat, 0.5):.1f}  p95 {percentile(lat, 0.95):.1f}  "
+                f"p99 {percentile(lat, 0.99):.1f}  max {lat[-1]:.1f}  (mean {statistics.fmean(lat):.1f})"
+            )
+        self.stdout.write(
+            f"registrations {stored} (expected {expected}, created {created}), "
+            f"duplicate pairs {dupes}, invoices {invoices}, payments {payments}"
+        )
+        for message in sorted(set(errors))[:5]:
+            self.stderr.write(f"  {message}")
+
+        if errors or dupes or stored != expected or not (stored == invoices == payments == created):
+            raise CommandError("Load test found lost or duplicated registrations.")
+        self.stdout.write(self.style.SUCCESS("No duplicates; every registration has one invoice and payment."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_login_name_keys'),
+        ('events', '0003_events_listing_idx'),
+        ('registrations', '0002_alter_registration_user'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='registration',
+            constraint=models.UniqueConstraint(fields=('user', 'event'), name='uniq_registration_user_event'),
+        ),
+    ]
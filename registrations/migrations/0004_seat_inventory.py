@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_login_name_keys'),
+        ('events', '0003_events_listing_idx'),
+        ('registrations', '0003_registration_unique_user_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('plan', models.CharField(choices=[('basic', 'Basic'), ('premium', 'Premium'), ('vip', 'VIP')], max_length=10)),
+                ('status', models.CharField(choices=[('held', 'Held'), ('confirmed', 'Confirmed'), ('released', 'Released')], default='held', max_length=10)),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(db_column='event_id', on_delete=django.db.models.deletion.CASCADE, related_name='seat_holds', to='events.event')),
+                ('registration', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='seat_hold', to='registrations.registration')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_holds', to='accounts.userprofile')),
+            ],
+            options={
+                'db_table': 'seat_holds',
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='seat_holds_expiry_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SeatInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('plan', models.CharField(choices=[('basic', 'Basic'), ('premium', 'Premium'), ('vip', 'VIP')], max_length=10)),
+                ('capacity', models.PositiveIntegerField()),
+                ('available', models.IntegerField()),
+                ('event', models.ForeignKey(db_column='event_id', on_delete=django.db.models.deletion.CASCADE, related_name='seat_inventory', to='events.event')),
+            ],
+            options={
+                'db_table': 'seat_inventory',
+                'constraints': [models.UniqueConstraint(fields=('event', 'plan'), name='uniq_seat_inventory_event_plan'), models.CheckConstraint(condition=models.Q(('available__gte', 0)), name='seat_inventory_available_gte_0')],
+            },
+        ),
+    ]
@@ -3,44 +3,21 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from events.models import Event
 from accounts.models import UserProfile
+from core.sequences import next_id
 
 User = get_user_model()  #  Import actual user model
 
 # ---------- ID generators ----------
 def generate_registration_id():
-    last = Registration.objects.order_by("registration_id").last()
-    if last and last.registration_id.startswith("REG"):
-        try:
-            n = int(last.registration_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"REG{str(n).zfill(4)}"
+    return next_id("REG")
 
 
 def generate_invoice_id():
-    last = Invoice.objects.order_by("invoice_id").last()
-    if last and last.invoice_id.startswith("INV"):
-        try:
-            n = int(last.invoice_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"INV{str(n).zfill(4)}"
+    return next_id("INV")
 
 
 def generate_payment_id():
-    last = Payment.objects.order_by("payment_id").last()
-    if last and last.payment_id.startswith("PAY"):
-        try:
-            n = int(last.payment_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"PAY{str(n).zfill(4)}"
+    return next_id("PAY")
 
 
 # ---------- Core tables ----------
@@ -53,6 +30,10 @@ class Registration(models.Model):
 
     class Meta:
         db_table = "registrations"
+        constraints = [
+            # one registration per user per event, even under concurrent submits
+            models.UniqueConstraint(fields=["user", "event"], name="uniq_registration_user_event"),
+        ]
 
     def __str__(self):
         return f"{self.registration_id} - {self.user.username} -> {self.event.title}"
@@ -84,3 +65,52 @@ class Payment(models.Model):
 
     def __str__(self):
         return f"{self.payment_id} - {self.amount} ({self.status})"
+
+
+# ---------- Seat inventory ----------
+PLAN_CHOICES = [("basic", "Basic"), ("premium", "Premium"), ("vip", "VIP")]
+
+
+class SeatInventory(models.Model):
+    """
+    Seats for one plan of one event. ``available`` is capacity minus seats
+    that are held or sold; it is only ever changed with conditional UPDATEs
+    (see registrations.seats). An event without rows here is unlimited.
+    """
+    event = models.ForeignKey(Event, to_field="event_id", db_column="event_id", on_delete=models.CASCADE, related_name="seat_inventory")
+    plan = models.CharField(max_length=10, choices=PLAN_CHOICES)
+    capacity = models.PositiveIntegerField()
+    available = models.IntegerField()
+
+    class Meta:
+        db_table = "seat_inventory"
+        constraints = [
+            models.UniqueConstraint(fields=["event", "plan"], name="uniq_seat_inventory_event_plan"),
+            models.CheckConstraint(condition=models.Q(available__gte=0), name="seat_inventory_available_gte_0"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} {self.plan}: {self.available}/{self.capacity}"
+
+
+class SeatHold(models.Model):
+    """A seat taken from SeatInventory until it is confirmed, released or expires."""
+    HELD, CONFIRMED, RELEASED = "held", "confirmed", "released"
+    STATUS_CHOICES = [(HELD, "Held"), (CONFIRMED, "Confirmed"), (RELEASED, "Released")]
+
+    event = models.ForeignKey(Event, to_field="event_id", db_column="event_id", on_delete=models.CASCADE, related_name="seat_holds")
+    plan = models.CharField(max_length=10, choices=PLAN_CHOICES)
+    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="seat_holds")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=HELD)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    registration = models.OneToOneField(Registration, on_delete=models.SET_NULL, null=True, blank=True, related_name="seat_hold")
+
+    class Meta:
+        db_table = "seat_holds"
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="seat_holds_expiry_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} {self.plan} for {self.user_id} ({self.status})"
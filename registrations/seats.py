@@ -0,0 +1,172 @@
+# registrations/seats.py
+"""
+Per-event, per-plan seat inventory.
+
+``reserve`` takes a seat with one conditional UPDATE on the plan's
+SeatInventory row (``available = available - 1 WHERE available > 0``) and
+records a SeatHold that expires after SEAT_HOLD_SECONDS. That row is the
+only shared write, so registrations for other plans/events never wait on
+each other, and two requests can never take the last seat twice. A hold is
+then either confirmed together with the registration, released (payment
+failed, duplicate submit) or - if the process died in between - swept back
+into the pool by ``release_expired`` once it expires.
+
+Events with no SeatInventory rows are unlimited, as before.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.jobs import enqueue
+from .models import SeatHold, SeatInventory
+
+HOLD_SECONDS = getattr(settings, "SEAT_HOLD_SECONDS", 600)
+
+
+class SoldOut(Exception):
+    """No seat is left for the requested plan."""
+
+
+# ---------- capacity ----------
+def set_capacity(event, plan, capacity):
+    """
+    Set (or with ``capacity=None`` remove) the seat limit of one plan. Raises
+    ValueError when the new capacity is below the seats already held or sold.
+    """
+    if capacity is None:
+        SeatInventory.objects.filter(event=event, plan=plan).delete()
+        return None
+    inv, created = SeatInventory.objects.get_or_create(
+        event=event, plan=plan, defaults={"capacity": capacity, "available": capacity})
+    if created or inv.capacity == capacity:
+        return inv
+    # shift available by the change in capacity, unless that would go negative
+    changed = SeatInventory.objects.filter(
+        pk=inv.pk, available__gte=F("capacity") - capacity,
+    ).update(available=F("available") + capacity - F("capacity"), capacity=capacity)
+    if not changed:
+        raise ValueError(f"{plan} already has more than {capacity} seats held or sold")
+    inv.refresh_from_db()
+    return inv
+
+
+def availability(event):
+    """{plan: seats left} for the plans of ``event`` that have a limit."""
+    return dict(SeatInventory.objects.filter(event=event).values_list("plan", "available"))
+
+
+# ---------- holds ----------
+def _take(event, plan):
+    return SeatInventory.objects.filter(event=event, plan=plan, available__gt=0).update(
+        available=F("available") - 1)
+
+
+def _give_back(event_id, plan, count=1):
+    SeatInventory.objects.filter(event_id=event_id, plan=plan).update(available=F("available") + count)
+
+
+def reserve(event, plan, user):
+    """
+    Hold one seat of ``plan`` for ``user``. Returns the SeatHold, or None when
+    the plan is unlimited; raises SoldOut when no seat is left.
+    """
+    with transaction.atomic():
+        if not _take(event, plan):
+            if not SeatInventory.objects.filter(event=event, plan=plan).exists():
+                return None
+            # expired holds may still be sitting on seats; reclaim them and retry once
+            if not (release_expired(event=event, plan=plan) and _take(event, plan)):
+                raise SoldOut(plan)
+        hold = SeatHold.objects.create(
+            event=event, plan=plan, user=user,
+            expires_at=timezone.now() + timedelta(seconds=HOLD_SECONDS))
+    # one queued sweep per plan returns abandoned holds even if nobody asks
+    enqueue(release_expired, event_id=event.pk, plan=plan,
+            delay=HOLD_SECONDS + 1, key=f"seats:{event.pk}:{plan}")
+    return hold
+
+
+def confirm(hold, registration):
+    """
+    Turn ``hold`` into a sold seat for ``registration``. If the hold already
+    expired and was swept, a fresh seat is taken instead (SoldOut if none).
+    Call inside the registration's transaction.
+    """
+    confirmed = SeatHold.objects.filter(pk=hold.pk, status=SeatHold.HELD).update(
+        status=SeatHold.CONFIRMED, registration=registration)
+    if not confirmed:
+        if not _take(hold.event_id, hold.plan):
+            raise SoldOut(hold.plan)
+        SeatHold.objects.filter(pk=hold.pk).update(status=SeatHold.CONFIRMED, registration=registration)
+    hold.status, hold.registration = SeatHold.CONFIRMED, registration
+
+
+def release(hold):
+    """Return a held seat to the pool (payment failed, duplicate submit). Returns True if it was held."""
+    with transaction.atomic():
+        released = SeatHold.objects.filter(pk=hold.pk, status=SeatHold.HELD).update(status=SeatHold.RELEASED)
+        if released:
+            _give_back(hold.event_id, hold.plan)
+    hold.status = SeatHold.RELEASED
+    return bool(released)
+
+
+def release_expired(event=None, plan=None, event_id=None, now=None, batch=500):
+    """Release holds past their expiry (optionally for one event/plan). Returns how many."""
+    now = now or timezone.now()
+    qs = SeatHold.objects.filter(status=SeatHold.HELD, expires_at__lt=now)
+    if event is not None or event_id is not None:
+        qs = qs.filter(event_id=event_id or event.pk)
+    if plan:
+        qs = qs.filter(plan=plan)
+
+    released = 0
+    for pk, ev_id, pl in qs.values_list("pk", "event_id", "plan")[:batch]:
+        with transaction.atomic():
+            # a confirm or another sweeper may have got there first
+            if SeatHold.objects.filter(pk=pk, status=SeatHold.HELD).update(status=SeatHold.RELEASED):
+                _give_back(ev_id, pl)
+                released += 1
+    return released
+
+
+def release_for_registration(registration):
+    """A sold registration was deleted: its seat goes back on sale."""
+    for pk, ev_id, pl in (SeatHold.objects.filter(registration=registration, status=SeatHold.CONFIRMED)
+                          .values_list("pk", "event_id", "plan")):
+        if SeatHold.objects.filter(pk=pk, status=SeatHold.CONFIRMED).update(status=SeatHold.RELEASED):
+            _give_back(ev_id, pl)
+
+
+# ---------- batches (registrations.services.register_many) ----------
+def take_many(plan, wanted):
+    """
+    Take seats of ``plan`` for several events at once; ``wanted`` is
+    {event_id: seats}. Returns {event_id: seats granted} for the events that
+    have a limit (unlimited events are left out). Call inside a transaction:
+    the inventory rows stay locked until it ends.
+    """
+    rows = dict(SeatInventory.objects.select_for_update()
+                .filter(event_id__in=list(wanted), plan=plan).values_list("event_id", "available"))
+    granted = {}
+    for event_id, available in rows.items():
+        need = wanted[event_id]
+        if available < need and release_expired(event_id=event_id, plan=plan):
+            available = SeatInventory.objects.get(event_id=event_id, plan=plan).available
+        granted[event_id] = n = max(0, min(need, available))
+        if n:
+            SeatInventory.objects.filter(event_id=event_id, plan=plan).update(available=F("available") - n)
+    return granted
+
+
+def confirm_many(plan, registrations):
+    """Record confirmed holds for seats taken with ``take_many``, one per registration."""
+    expires = timezone.now()
+    SeatHold.objects.bulk_create([
+        SeatHold(event_id=r.event_id, plan=plan, user_id=r.user_id, status=SeatHold.CONFIRMED,
+                 expires_at=expires, registration=r)
+        for r in registrations
+    ], batch_size=500)
@@ -0,0 +1,182 @@
+# registrations/services.py
+"""
+The registration write path, shared by register_event and the load test.
+
+IDs come from the pooled sequences before the transaction opens, and the
+transaction itself is three plain INSERTs - it starts by writing, so under
+SQLite it takes the write lock once (waiting on busy_timeout) instead of
+upgrading a read lock and failing with "database is locked". Duplicate
+submits are stopped by the (user, event) unique constraint rather than by
+a check-then-insert race. Plans with a seat limit are reserved first
+(registrations.seats) and the seat goes back if anything below fails.
+
+``register_many`` is the batch version for group bookings: one set-based
+query finds the pairs that are already registered, seats are taken per
+event rather than per person, and every row goes in with bulk_create, so
+the number of statements grows with the number of events, not with N x M.
+"""
+from decimal import Decimal
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from accounts.activity import invalidate_user_activity
+from analytics import rollups
+from core.sequences import allocate_ids, next_id
+from . import seats
+from .models import Invoice, Payment, Registration
+from .stats import invalidate_college_stats
+
+PLAN_PRICES = {
+    "basic":   Decimal("500"),
+    "premium": Decimal("1000"),
+    "vip":     Decimal("2000"),
+}
+
+GATEWAYS = ("credit_card", "debit_card", "upi")
+
+
+def _existing(user, event):
+    return Registration.objects.select_related("invoice").filter(user=user, event=event).first()
+
+
+def register(user, event, plan, gateway):
+    """
+    Register ``user`` for ``event`` and record the (already settled) payment.
+    Returns ``(registration, created)``; ``created`` is False when the user was
+    registered already, in which case the existing registration is returned.
+    Raises seats.SoldOut when the plan has no seat left.
+    """
+    reg_id, inv_id, pay_id = next_id("REG"), next_id("INV"), next_id("PAY")
+    try:
+        hold = seats.reserve(event, plan, user)
+    except seats.SoldOut:
+        # a repeat submit from someone who already has their seat is not "sold out"
+        existing = _existing(user, event)
+        if existing is None:
+            raise
+        return existing, False
+    try:
+        with transaction.atomic():
+            reg = Registration.objects.create(
+                registration_id=reg_id, user=user, event=event, payment_status="paid",
+            )
+            inv = Invoice.objects.create(
+                invoice_id=inv_id, registration=reg,
+                details=f"{plan.upper()} plan via {gateway.replace('_', ' ').title()}",
+            )
+            Payment.objects.create(
+                payment_id=pay_id, invoice=inv, amount=PLAN_PRICES[plan],
+                status="paid", gateway=gateway, paid_at=timezone.now(),
+            )
+            if hold is not None:
+                seats.confirm(hold, reg)
+    except IntegrityError:
+        if hold is not None:
+            seats.release(hold)
+        existing = _existing(user, event)
+        if existing is None:
+            raise
+        return existing, False
+    except Exception:
+        # payment/registration failed: the seat is back on sale straight away
+        if hold is not None:
+            seats.release(hold)
+        raise
+    return reg, True
+
+
+# ---------- batches ----------
+CREATED, EXISTS, DUPLICATE, SOLD_OUT = "created", "exists", "duplicate", "sold_out"
+BULK_BATCH_SIZE = 500
+
+
+def _registered_pairs(users, events):
+    """{(user_id, event_id): registration_id} already in the database - one query."""
+    rows = (Registration.objects
+            .filter(user_id__in=[u.pk for u in users], event_id__in=[e.pk for e in events])
+            .values_list("user_id", "event_id", "registration_id"))
+    return {(u, e): r for u, e, r in rows}
+
+
+def _invalidate(registrations):
+    # bulk_create skips the post_save hooks that keep these caches fresh
+    # (the Analytics rollups are adjusted in register_many's transaction)
+    colleges = {r.event.college_id for r in registrations}
+    users = {r.user_id for r in registrations}
+
+    def bump():
+        for college_id in colleges:
+            invalidate_college_stats(college_id)
+        for user_id in users:
+            invalidate_user_activity(user_id)
+    transaction.on_commit(bump)
+
+
+def register_many(users, events, plan, gateway):
+    """
+    Register every user in ``users`` for every event in ``events`` and record
+    the (already settled) payments. Returns one dict per (user, event) pair,
+    in input order, with ``status`` one of CREATED, EXISTS (registered
+    before), DUPLICATE (repeated in the input) or SOLD_OUT, plus the
+    registration/invoice IDs where there are any.
+
+    When a plan runs short, the seats go to the pairs listed first.
+    """
+    price = PLAN_PRICES[plan]
+    details = f"{plan.upper()} plan via {gateway.replace('_', ' ').title()}"
+    pairs = [(u, e) for e in events for u in users]
+
+    for attempt in range(2):
+        existing = _registered_pairs(users, events)
+        seen, todo, results = set(), [], []
+        for user, event in pairs:
+            key = (user.pk, event.pk)
+            item = {"user_id": user.pk, "event_id": event.pk}
+            if key in seen:
+                item["status"] = DUPLICATE
+            elif key in existing:
+                item.update(status=EXISTS, registration_id=existing[key])
+            else:
+                todo.append((user, event, item))
+            seen.add(key)
+            results.append(item)
+
+        try:
+            with transaction.atomic():
+                granted = seats.take_many(plan, Counter(e.pk for _, e, _ in todo))
+                placed = []
+                for user, event, item in todo:
+                    left = granted.get(event.pk)
+                    if left is not None:
+                        if not left:
+                            item["status"] = SOLD_OUT
+                            continue
+                        granted[event.pk] = left - 1
+                    placed.append((user, event, item))
+
+                n = len(placed)
+                now = timezone.now()
+                regs, invoices, payments = [], [], []
+                for (user, event, item), reg_id, inv_id, pay_id in zip(
+                        placed, allocate_ids("REG", n), allocate_ids("INV", n), allocate_ids("PAY", n)):
+                    reg = Registration(registration_id=reg_id, user=user, event=event, payment_status="paid")
+                    inv = Invoice(invoice_id=inv_id, registration=reg, details=details)
+                    regs.append(reg)
+                    invoices.append(inv)
+                    payments.append(Payment(payment_id=pay_id, invoice=inv, amount=price,
+                                            status="paid", gateway=gateway, paid_at=now))
+                    item.update(status=CREATED, registration_id=reg_id, invoice_id=inv_id)
+                Registration.objects.bulk_create(regs, batch_size=BULK_BATCH_SIZE)
+                Invoice.objects.bulk_create(invoices, batch_size=BULK_BATCH_SIZE)
+                Payment.objects.bulk_create(payments, batch_size=BULK_BATCH_SIZE)
+                seats.confirm_many(plan, [r for r in regs if r.event_id in granted])
+                rollups.on_bulk_registered(Counter(r.event_id for r in regs))
+                _invalidate(regs)
+            return results
+        except IntegrityError:
+            # someone registered one of these pairs in the meantime: look again
+            if attempt:
+                raise
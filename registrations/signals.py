@@ -0,0 +1,50 @@
+# registrations/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from events.models import Event
+from .models import Invoice, Payment, Registration
+from .seats import release_for_registration
+from .stats import invalidate_college_stats
+
+
+def _invalidate_later(college_id):
+    if college_id:
+        transaction.on_commit(lambda: invalidate_college_stats(college_id))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_changed(sender, instance, **kwargs):
+    _invalidate_later(instance.college_id)
+
+
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+def registration_changed(sender, instance, **kwargs):
+    if Registration.event.is_cached(instance):
+        college_id = instance.event.college_id
+    else:
+        # on an event delete the event row may already be gone; event_changed covers that
+        college_id = (Event.objects.filter(event_id=instance.event_id)
+                      .values_list("college_id", flat=True).first())
+    _invalidate_later(college_id)
+
+
+@receiver(pre_delete, sender=Registration)
+def registration_deleted(sender, instance, **kwargs):
+    # before the delete, while the seat hold still points at the registration
+    release_for_registration(instance)
+
+
+@receiver(post_save, sender=Payment)
+def payment_changed(sender, instance, **kwargs):
+    inv = instance.invoice if Payment.invoice.is_cached(instance) else None
+    reg = inv.registration if inv is not None and Invoice.registration.is_cached(inv) else None
+    if reg is not None and Registration.event.is_cached(reg):
+        college_id = reg.event.college_id          # register() builds the whole chain
+    else:
+        college_id = (Event.objects.filter(registrations__invoice__payment=instance)
+                      .values_list("college_id", flat=True).first())
+    _invalidate_later(college_id)
@@ -0,0 +1,66 @@
+# registrations/stats.py
+"""
+College-wide totals shown on the admin dashboard and the registrations overview.
+
+Everything comes out of one grouped query over the college's events with the
+registration -> invoice -> payment chain LEFT JOINed (all one-to-one, so SUMs
+aren't inflated). Results are cached per college for COLLEGE_STATS_CACHE_TTL
+seconds; registration/payment and event writes bump that college's version
+(see registrations.signals) so admins see their own changes immediately.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, Exists, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from core.cache import bump_version, versioned_key
+from events.models import Event, EventSponsor
+
+CACHE_TTL = getattr(settings, "COLLEGE_STATS_CACHE_TTL", 60)
+
+EMPTY_STATS = {
+    "total_events": 0,
+    "total_registrations": 0,
+    "paid_registrations": 0,
+    "total_revenue": Decimal("0.00"),
+    "total_sponsored": 0,
+}
+
+
+def _namespace(college_id):
+    return f"college_stats:{college_id}"
+
+
+def compute_college_stats(college_id):
+    paid_reg = Q(registrations__payment_status__iexact="paid")
+    paid_pay = Q(registrations__invoice__payment__status__iexact="paid")
+    sponsored = Exists(EventSponsor.objects.filter(event=OuterRef("pk")))
+    return Event.objects.filter(college_id=college_id).aggregate(
+        total_events=Count("event_id", distinct=True),
+        total_registrations=Count("registrations"),
+        paid_registrations=Count("registrations", filter=paid_reg),
+        total_revenue=Coalesce(
+            Sum("registrations__invoice__payment__amount", filter=paid_pay),
+            Value(Decimal("0.00")),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+        total_sponsored=Count("event_id", filter=Q(sponsored), distinct=True),
+    )
+
+
+def college_stats(college):
+    """Cached totals dict for ``college`` (see EMPTY_STATS for the keys)."""
+    if college is None:
+        return dict(EMPTY_STATS)
+    key = versioned_key(_namespace(college.college_id))
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_college_stats(college.college_id)
+        cache.set(key, stats, CACHE_TTL)
+    return stats
+
+
+def invalidate_college_stats(college_id):
+    bump_version(_namespace(college_id))
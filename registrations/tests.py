@@ -1,3 +1,22 @@
 from django.test import TestCase
 
-# Create your tests here.
+from analytics.models import Analytics
+from analytics.rollups import rebuild_rollups
+from .management.commands.loadtest_registrations import seed
+from .services import CREATED, EXISTS, register, register_many
+
+
+class RegisterManyRollupTests(TestCase):
+    def test_group_booking_updates_registrations_count(self):
+        _, _, events, users = seed(4, 2)
+        first, second = events
+        register(users[0], first, "basic", "upi")          # row exists before the batch
+
+        results = register_many(users, events, "basic", "upi")
+
+        statuses = [r["status"] for r in results]
+        self.assertEqual(statuses.count(CREATED), 7)
+        self.assertEqual(statuses.count(EXISTS), 1)
+        counts = dict(Analytics.objects.values_list("event_id", "registrations_count"))
+        self.assertEqual(counts, {first.event_id: 4, second.event_id: 4})
+        self.assertEqual(rebuild_rollups(event_ids=[first.event_id, second.event_id], dry_run=True), [])
@@ -7,6 +7,8 @@ urlpatterns = [
     path("register/<str:event_id>/", views.register_event, name="register_event"),
     path("invoice/<str:invoice_id>/", views.invoice_detail, name="invoice_detail"),
     path("admin/registrations/", views.admin_registrations_overview, name="admin_registrations_overview"),
+    path("admin/registrations/export/", views.admin_registrations_export, name="admin_registrations_export"),
+    path("admin/registrations/bulk/", views.admin_bulk_register, name="admin_bulk_register"),
 
 ]
 
@@ -1,47 +1,39 @@
+import json
+from collections import Counter
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
-from django.db import transaction
+from django.conf import settings
+from django.http import JsonResponse
 from decimal import Decimal
 
+from accounts.models import UserProfile
+
 from events.models import Event
-from .models import Registration, Invoice, Payment
+from .models import PLAN_CHOICES, Registration, Invoice, Payment
+from .seats import SoldOut, availability
+from .services import GATEWAYS, PLAN_PRICES, register, register_many
+from core.metrics import query_budget
+from core.query_audit import hot_query
 from django.db.models import Count, Sum, Q
-from accounts.models import AdminProfile  
 from django.db.models.functions import Coalesce
 from .models import Registration
 
+# registrations/views.py
 
-def _current_admin(request):
-    admin_id = request.session.get("admin_id")
-    if not admin_id:
-        return None
-    return AdminProfile.objects.filter(admin_id=admin_id).first()
-
-
-USER_SESSION_KEY = "user_id"
-
-
-from accounts.models import UserProfile
-
-def _current_user(request):
-    uid = request.session.get(USER_SESSION_KEY)
-    if not uid:
-        return None
-    return UserProfile.objects.filter(pk=uid).first() or UserProfile.objects.filter(user_id=uid).first()
-
-PLAN_PRICES = {
-    "basic":   Decimal("500"),
-    "premium": Decimal("1000"),
-    "vip":     Decimal("2000"),
-}
+def _plan_options(event):
+    left = availability(event)           # plans without a limit are missing -> None
+    return [
+        {"value": plan.upper(), "label": label, "price": PLAN_PRICES[plan], "left": left.get(plan)}
+        for plan, label in PLAN_CHOICES
+    ]
 
-# registrations/views.py
 
+@query_budget(25)
 @require_http_methods(["GET", "POST"])
-@transaction.atomic
 def register_event(request, event_id: str):
-    user = _current_user(request)
+    user = request.principal.user
     if not user:
         messages.error(request, "Please log in to register.")
         return redirect("login")
@@ -66,41 +58,30 @@ def register_event(request, event_id: str):
             messages.error(request, "Please choose a valid plan.")
             return redirect("registrations:register_event", event_id=event.event_id)
 
-        if pm not in ("credit_card", "debit_card", "upi"):
+        if pm not in GATEWAYS:
             messages.error(request, "Please choose a valid payment method.")
             return redirect("registrations:register_event", event_id=event.event_id)
 
-        amount = PLAN_PRICES[plan]
-
-        # prevent duplicate
-        existing = Registration.objects.filter(user=user, event=event).first()
-        if existing:
+        # Registration -> Invoice -> Payment in one short transaction; the
+        # unique (user, event) constraint turns a double submit into a no-op
+        try:
+            reg, created = register(user, event, plan, pm)
+        except SoldOut:
+            messages.error(request, f"Sorry, the {plan.upper()} plan is sold out.")
+            return redirect("registrations:register_event", event_id=event.event_id)
+        if not created:
             messages.info(request, "You are already registered for this event.")
-            if hasattr(existing, "invoice"):
-                return redirect("registrations:invoice_detail", invoice_id=existing.invoice.invoice_id)
+            if hasattr(reg, "invoice"):
+                return redirect("registrations:invoice_detail", invoice_id=reg.invoice.invoice_id)
             return redirect("events:event_detail", event_id=event.event_id)
 
-        # create Registration → Invoice → Payment
-        reg = Registration.objects.create(user=user, event=event, payment_status="pending")
-        inv = Invoice.objects.create(
-            registration=reg,
-            details=f"{plan.upper()} plan via {pm.replace('_',' ').title()}",
-        )
-        Payment.objects.create(
-            invoice=inv,
-            amount=PLAN_PRICES[plan],
-            status="paid",
-            gateway=pm,
-        )
-        reg.payment_status = "paid"
-        reg.save(update_fields=["payment_status"])
-
         messages.success(request, "Registration successful. Your invoice is ready.")
-        return redirect("registrations:invoice_detail", invoice_id=inv.invoice_id)
+        return redirect("registrations:invoice_detail", invoice_id=reg.invoice.invoice_id)
 
-    return render(request, "registrations/register_event.html", {"event": event})
+    return render(request, "registrations/register_event.html", {"event": event, "plans": _plan_options(event)})
 
 
+@query_budget(3)
 def invoice_detail(request, invoice_id: str):
     inv = get_object_or_404(Invoice.objects.select_related("registration__event",
                                                            "registration__user",
@@ -126,17 +107,6 @@ from django.contrib import messages
 
 from .models import Registration, Payment
 from events.models import Event
-from accounts.models import AdminProfile
-
-
-def _current_admin(request):
-    aid = request.session.get("admin_id")
-    if not aid:
-        return None
-    try:
-        return AdminProfile.objects.select_related("college").get(admin_id=aid)
-    except AdminProfile.DoesNotExist:
-        return None
 
 
 # registrations/views.py (or wherever this function lives)
@@ -146,9 +116,51 @@ from django.db.models.functions import Coalesce
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from registrations.models import Registration, Payment
+import csv
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .stats import college_stats
+
+REGISTRATIONS_PER_PAGE = 50
+
+
+def registration_row(r):
+    """Display dict for one Registration (select_related user/event/invoice/payment)."""
+    inv = getattr(r, "invoice", None)
+    pay = getattr(inv, "payment", None)
+    return {
+        "reg_id": r.registration_id,
+        "date": r.registration_date,
+        "user": r.user,                      # .username / .email in template
+        "event_id": r.event.event_id,
+        "event_title": r.event.title,
+        "event_when": r.event.date_time,
+        "status": r.payment_status,
+        "invoice_id": getattr(inv, "invoice_id", None),
+        "pay_status": getattr(pay, "status", ""),
+        "gateway": getattr(pay, "gateway", ""),
+        "amount": getattr(pay, "amount", Decimal("0.00")),
+    }
 
+
+@hot_query("registrations.college_registrations", college="COL0001")
+def college_registrations(college):
+    """A college's registrations, newest first, ready for registration_row()."""
+    return (
+        Registration.objects
+        .filter(event__college=college)
+        .select_related("user", "event", "invoice", "invoice__payment")
+        # registration_id last: pages need a total order or tied rows repeat/vanish
+        .order_by("-registration_date", "-event__date_time", "-registration_id")
+    )
+
+
+@query_budget(8)
 def admin_registrations_overview(request):
-    admin = _current_admin(request)
+    admin = request.principal.admin
     if not admin:
         messages.error(request, "Please log in as admin.")
         return redirect("admin_login")
@@ -160,32 +172,10 @@ def admin_registrations_overview(request):
             "college": None, "rows": [], "stats": {}, "by_event": [],
         })
 
-    base_qs = (
-        Registration.objects
-        .filter(event__college=college)
-        .select_related("user", "event", "invoice", "invoice__payment")
-        .order_by("-registration_date", "-event__date_time")
-    )
+    base_qs = college_registrations(college)
 
-    # ---- Totals ----
-    total_regs = base_qs.count()
-    paid_regs  = base_qs.filter(payment_status__iexact="paid").count()
-
-    pay_qs = Payment.objects.filter(invoice__registration__event__college=college)
-    total_revenue = (
-        pay_qs.filter(status__iexact="paid")
-              .aggregate(total=Coalesce(
-                  Sum("amount"),
-                  Value(Decimal("0.00")),
-                  output_field=DecimalField(max_digits=12, decimal_places=2),
-              ))["total"]
-    )
-
-    stats = {
-        "total_regs": total_regs,
-        "paid_regs": paid_regs,
-        "total_revenue": total_revenue,
-    }
+    # ---- Totals (shared, cached) ----
+    stats = college_stats(college)
 
     # ---- Per-event rollup ----
     by_event = (
@@ -206,27 +196,171 @@ def admin_registrations_overview(request):
                .order_by("event__title")
     )
 
-    # ---- Table rows ----
-    rows = []
-    for r in base_qs:
-        pay = getattr(getattr(r, "invoice", None), "payment", None)
-        rows.append({
-            "reg_id": r.registration_id,
-            "date": r.registration_date,
-            "user": r.user,                      # .username / .email in template
-            "event_id": r.event.event_id,
-            "event_title": r.event.title,
-            "event_when": r.event.date_time,
-            "status": r.payment_status,
-            "invoice_id": getattr(getattr(r, "invoice", None), "invoice_id", None),
-            "pay_status": getattr(pay, "status", ""),
-            "gateway": getattr(pay, "gateway", ""),
-            "amount": getattr(pay, "amount", Decimal("0.00")),
-        })
+    # ---- Table rows (one page at a time) ----
+    page = Paginator(base_qs, REGISTRATIONS_PER_PAGE).get_page(request.GET.get("page"))
+    rows = [registration_row(r) for r in page.object_list]
 
     return render(request, "registrations/admin_registrations.html", {
         "college": college,
         "rows": rows,
+        "page": page,
         "stats": stats,
         "by_event": by_event,
-    })
\ No newline at end of file
+    })
+
+
+# ---------- Streaming export ----------
+EXPORT_FIELDS = (
+    ("reg_id", "registration_id"),
+    ("date", "registration_date"),
+    ("username", "user__username"),
+    ("email", "user__email"),
+    ("event_id", "event_id"),
+    ("event_title", "event__title"),
+    ("event_when", "event__date_time"),
+    ("status", "payment_status"),
+    ("invoice_id", "invoice__invoice_id"),
+    ("pay_status", "invoice__payment__status"),
+    ("gateway", "invoice__payment__gateway"),
+    ("amount", "invoice__payment__amount"),
+)
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """csv.writer target that hands each formatted line straight back."""
+    def write(self, value):
+        return value
+
+
+@hot_query("registrations.export", college="COL0001")
+def _export_qs(college):
+    return (
+        Registration.objects
+        .filter(event__college=college)
+        .order_by("-registration_date", "-event__date_time", "-registration_id")
+        .values_list(*[src for _, src in EXPORT_FIELDS])
+    )
+
+
+def _export_rows(college):
+    return _export_qs(college).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _csv_lines(college):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for values in _export_rows(college):
+        yield writer.writerow(["" if v is None else v for v in values])
+
+
+def _jsonl_lines(college):
+    names = [name for name, _ in EXPORT_FIELDS]
+    encoder = DjangoJSONEncoder()
+    for values in _export_rows(college):
+        yield encoder.encode(dict(zip(names, values))) + "\n"
+
+
+@require_http_methods(["GET"])
+def admin_registrations_export(request):
+    """Stream every registration of the admin's college as CSV or JSON Lines."""
+    admin = request.principal.admin
+    if not admin:
+        messages.error(request, "Please log in as admin.")
+        return redirect("admin_login")
+    college = getattr(admin, "college", None)
+    if not college:
+        messages.info(request, "No college is linked to your admin account yet.")
+        return redirect("registrations:admin_registrations_overview")
+
+    fmt = request.GET.get("format", "csv")
+    stamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+    if fmt == "jsonl":
+        resp = StreamingHttpResponse(_jsonl_lines(college), content_type="application/x-ndjson")
+    else:
+        fmt = "csv"
+        resp = StreamingHttpResponse(_csv_lines(college), content_type="text/csv")
+    resp["Content-Disposition"] = f'attachment; filename="registrations_{college.college_id}_{stamp}.{fmt}"'
+    return resp
+
+# ---------- Group bookings (JSON API) ----------
+BULK_MAX_ITEMS = getattr(settings, "REGISTRATION_BULK_MAX_ITEMS", 5000)
+
+
+def _bulk_error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _string_list(value):
+    """The non-blank strings of a JSON list, or None when ``value`` isn't a list of strings."""
+    if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+        return None
+    return [x.strip() for x in value if x.strip()]
+
+
+def _resolve_users(refs):
+    """Users by user_id or email, in ``refs`` order; returns (users, unknown refs)."""
+    found = UserProfile.objects.filter(Q(user_id__in=refs) | Q(email__in=[r.lower() for r in refs]))
+    by_ref = {}
+    for u in found:
+        by_ref[u.user_id] = u
+        by_ref[u.email.lower()] = u
+    users, unknown = [], []
+    for ref in refs:
+        user = by_ref.get(ref) or by_ref.get(ref.lower())
+        (users.append(user) if user else unknown.append(ref))
+    return users, unknown
+
+
+@require_http_methods(["POST"])
+def admin_bulk_register(request):
+    """
+    Register a team: every listed user for every listed event of the admin's
+    college, in one call. JSON body::
+
+        {"users": ["USR0012", "asha@example.com"], "events": ["EVT0040"],
+         "plan": "basic", "gateway": "upi"}
+
+    Send the CSRF token in X-CSRFToken. Answers with a per-pair outcome
+    (registrations.services.register_many) and a count per outcome.
+    """
+    admin = request.principal.admin
+    if not admin:
+        return _bulk_error("Please log in as admin.", status=403)
+    college = getattr(admin, "college", None)
+    if not college:
+        return _bulk_error("No college is linked to your admin account yet.", status=403)
+
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return _bulk_error("Body must be JSON.")
+    if not isinstance(data, dict):
+        return _bulk_error("Body must be a JSON object.")
+    user_refs = _string_list(data.get("users", []))
+    event_ids = _string_list(data.get("events", []))
+    if user_refs is None or event_ids is None:
+        return _bulk_error("users and events must be lists of strings.")
+    plan = str(data.get("plan") or "").lower()
+    gateway = str(data.get("gateway") or "").lower()
+    if not user_refs or not event_ids:
+        return _bulk_error("List at least one user and one event.")
+    if plan not in PLAN_PRICES:
+        return _bulk_error(f"plan must be one of {', '.join(PLAN_PRICES)}.")
+    if gateway not in GATEWAYS:
+        return _bulk_error(f"gateway must be one of {', '.join(GATEWAYS)}.")
+    if len(user_refs) * len(event_ids) > BULK_MAX_ITEMS:
+        return _bulk_error(f"At most {BULK_MAX_ITEMS} user/event pairs per call.")
+
+    users, unknown_users = _resolve_users(user_refs)
+    own = {e.event_id: e for e in Event.objects.filter(college=college, event_id__in=event_ids)}
+    events = [own[eid] for eid in dict.fromkeys(event_ids) if eid in own]
+    unknown_events = [eid for eid in event_ids if eid not in own]
+
+    results = register_many(users, events, plan, gateway) if users and events else []
+    return JsonResponse({
+        "summary": dict(Counter(r["status"] for r in results)),
+        "unknown_users": unknown_users,
+        "unknown_events": unknown_events,
+        "results": results,
+    })
@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _reinstall_triggers(sender, using, **kwargs):
+    # SQLite table rebuilds during later migrations drop triggers; put them back
+    from django.db import connections
+    from . import fts
+    conn = connections[using]
+    if fts.available(conn) and fts.install(conn):
+        fts.rebuild(conn)
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(_reinstall_triggers, sender=self)
@@ -0,0 +1,241 @@
+# search/autocomplete.py
+"""
+In-process autocomplete for the header search box.
+
+College names and event titles are normalised and every word-suffix of a
+name ("tech fest 2025", "fest 2025", "2025") is kept in a sorted list per
+kind, so a prefix lookup is a bisect plus a short forward scan and never
+touches the database. Rendered ``search_suggest.html`` fragments for hot
+prefixes sit in a small LRU in front of that.
+
+The index is built lazily on first use and patched in place by signals
+when a College or Event changes in this process. It is rebuilt when the
+version in the cache changes (a change in another worker sharing the cache
+bumps it, see settings.CACHES) or after AUTOCOMPLETE_MAX_AGE seconds. A
+rebuild runs outside the lock: the old index keeps answering until the new
+one is swapped in, and before the first build finishes lookups use FTS. If
+even the names alone don't fit in AUTOCOMPLETE_MAX_ENTRIES, lookups fall
+back to the FTS index.
+"""
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from core.cache import bump_version, get_version
+
+CACHE_NAMESPACE = "autocomplete"
+MAX_KEY_LEN = 60
+
+MAX_ENTRIES = getattr(settings, "AUTOCOMPLETE_MAX_ENTRIES", 300_000)
+MAX_AGE = getattr(settings, "AUTOCOMPLETE_MAX_AGE", 300)
+FRAGMENT_CACHE_SIZE = getattr(settings, "AUTOCOMPLETE_FRAGMENT_CACHE_SIZE", 512)
+
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """'  Café-Fest 2025 ' -> 'cafe fest 2025'"""
+    text = text or ""
+    if not text.isascii():
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _keys(label, suffixes):
+    words = normalize(label).split()
+    if not words:
+        return []
+    starts = range(len(words)) if suffixes else range(1)
+    return [" ".join(words[i:])[:MAX_KEY_LEN] for i in starts]
+
+
+class PrefixIndex:
+    """Sorted (key, ref) lists per kind; keys are re-derived from the label on removal."""
+
+    def __init__(self, suffixes=True):
+        self.suffixes = suffixes
+        self._sorted = {}    # kind -> sorted [(key, ref)]
+        self.labels = {}     # (kind, ref) -> display label
+        self.size = 0
+
+    def add(self, kind, ref, label):
+        self.remove(kind, ref)
+        keys = _keys(label, self.suffixes)
+        bucket = self._sorted.setdefault(kind, [])
+        for key in keys:
+            insort(bucket, (key, ref))
+        self.labels[(kind, ref)] = label
+        self.size += len(keys)
+
+    def remove(self, kind, ref):
+        label = self.labels.pop((kind, ref), None)
+        if label is None:
+            return
+        bucket = self._sorted[kind]
+        for key in _keys(label, self.suffixes):
+            i = bisect_left(bucket, (key, ref))
+            if i < len(bucket) and bucket[i] == (key, ref):
+                del bucket[i]
+                self.size -= 1
+
+    def load(self, kind, rows):
+        """Bulk load [(ref, label)] - one sort instead of n insorts."""
+        bucket = self._sorted.setdefault(kind, [])
+        for ref, label in rows:
+            keys = _keys(label, self.suffixes)
+            bucket.extend((key, ref) for key in keys)
+            self.labels[(kind, ref)] = label
+            self.size += len(keys)
+        bucket.sort()
+
+    def lookup(self, kind, prefix, limit):
+        bucket = self._sorted.get(kind, [])
+        seen, out = set(), []
+        i = bisect_left(bucket, (prefix,))
+        while i < len(bucket) and len(out) < limit:
+            key, ref = bucket[i]
+            if not key.startswith(prefix):
+                break
+            if ref not in seen:
+                seen.add(ref)
+                out.append(ref)
+            i += 1
+        return out
+
+
+class _LRU:
+    def __init__(self, size):
+        self.size = size
+        self._data = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+class Autocomplete:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._index = None
+        self._version = None
+        self._built_at = 0.0
+        self._building = False
+        self._generation = 0     # bumped whenever the index changes; guards fragment puts
+        self.fragments = _LRU(FRAGMENT_CACHE_SIZE)
+
+    # ---------- building ----------
+    def _build(self):
+        from colleges.models import College
+        from events.models import Event
+
+        colleges = list(College.objects.values_list("college_id", "name"))
+        events = list(Event.objects.values_list("event_id", "title"))
+
+        index = PrefixIndex(suffixes=True)
+        approx = sum(len(normalize(label).split()) for _, label in colleges + events)
+        if approx > MAX_ENTRIES:
+            index = PrefixIndex(suffixes=False)        # names only
+            if len(colleges) + len(events) > MAX_ENTRIES:
+                index = None                            # too big: use FTS
+        if index is not None:
+            index.load("college", colleges)
+            index.load("event", events)
+        return index
+
+    def _current(self):
+        """
+        ``(index, generation)`` to answer from. A stale index keeps serving
+        while one thread rebuilds (~0.7 s at 100k events) without the lock.
+        """
+        version = get_version(CACHE_NAMESPACE)
+        with self._lock:
+            fresh = (self._version == version and time.monotonic() - self._built_at < MAX_AGE)
+            if fresh or self._building:
+                return self._index, self._generation
+            self._building = True
+        try:
+            index = self._build()
+        finally:
+            with self._lock:
+                self._building = False
+        with self._lock:
+            # a change() during the build bumped the version past ``version``,
+            # so the next lookup rebuilds again and picks it up
+            self._index = index
+            self._version = version
+            self._built_at = time.monotonic()
+            self._generation += 1
+            self.fragments.clear()
+            return self._index, self._generation
+
+    # ---------- change hooks (signals) ----------
+    def changed(self, kind, ref, label=None):
+        """Patch this process's index and tell other processes to rebuild theirs."""
+        with self._lock:
+            index = self._index
+            if index is not None:
+                if label is None:
+                    index.remove(kind, ref)
+                else:
+                    index.add(kind, ref, label)
+                if index.size > MAX_ENTRIES:
+                    self._index = None
+            self._generation += 1
+            self.fragments.clear()
+            self._version = bump_version(CACHE_NAMESPACE)
+
+    # ---------- lookups ----------
+    def suggest(self, q, limit):
+        """({college_id, name} dicts, {event_id, title} dicts), or None if the index is unavailable."""
+        prefix = normalize(q)[:MAX_KEY_LEN]
+        if not prefix:
+            return [], []
+        index, _ = self._current()
+        if index is None:
+            return None
+        with self._lock:
+            colleges = [{"college_id": ref, "name": index.labels[("college", ref)]}
+                        for ref in index.lookup("college", prefix, limit)]
+            events = [{"event_id": ref, "title": index.labels[("event", ref)]}
+                      for ref in index.lookup("event", prefix, limit)]
+        return colleges, events
+
+    def suggest_html(self, q, limit):
+        prefix = normalize(q)[:MAX_KEY_LEN]
+        _, generation = self._current()
+        with self._lock:
+            html = self.fragments.get(prefix)
+        if html is not None:
+            return html
+
+        found = self.suggest(q, limit)
+        if found is None:
+            from .queries import find_colleges, find_events
+            found = (find_colleges(q, limit, suggest=True), find_events(q, limit, suggest=True))
+        colleges, events = found
+        html = render_to_string("accounts/search_suggest.html", {"colleges": colleges, "events": events})
+        with self._lock:
+            if self._generation == generation:      # not rendered from an index swapped out since
+                self.fragments.put(prefix, html)
+        return html
+
+
+autocomplete = Autocomplete()
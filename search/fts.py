@@ -0,0 +1,153 @@
+# search/fts.py
+"""
+SQLite FTS5 index over college names and event titles/descriptions.
+
+``search_docs`` maps every indexed row to a stable integer id which is used as
+the rowid of the FTS tables; triggers on ``events`` and ``colleges_college``
+keep both in sync, so bulk inserts and raw SQL are indexed too. On other
+database backends ``available()`` is False and callers fall back to LIKE.
+"""
+import re
+
+from django.db import connection
+
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS search_docs (
+        id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        ref TEXT NOT NULL,
+        UNIQUE (kind, ref)
+    )""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS events_fts
+        USING fts5(title, description, tokenize='{TOKENIZER}', prefix='1 2 3')""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS colleges_fts
+        USING fts5(name, tokenize='{TOKENIZER}', prefix='1 2 3')""",
+]
+
+_DOC = "(SELECT id FROM search_docs WHERE kind = '{kind}' AND ref = {ref})"
+
+# (table, kind, pk column, fts table, indexed columns)
+SOURCES = [
+    ("events", "event", "event_id", "events_fts", ("title", "description")),
+    ("colleges_college", "college", "college_id", "colleges_fts", ("name",)),
+]
+
+
+def _triggers(table, kind, pk, fts, cols):
+    new_doc = _DOC.format(kind=kind, ref=f"new.{pk}")
+    old_doc = _DOC.format(kind=kind, ref=f"old.{pk}")
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    sets = ", ".join(f"{c} = new.{c}" for c in cols)
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO search_docs (kind, ref) VALUES ('{kind}', new.{pk});
+            INSERT INTO {fts} (rowid, {col_list}) VALUES ({new_doc}, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {pk}, {col_list} ON {table} BEGIN
+            UPDATE search_docs SET ref = new.{pk} WHERE kind = '{kind}' AND ref = old.{pk};
+            UPDATE {fts} SET {sets} WHERE rowid = {new_doc};
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = {old_doc};
+            DELETE FROM search_docs WHERE kind = '{kind}' AND ref = old.{pk};
+        END""",
+    ]
+
+
+def available(conn=None):
+    return (conn or connection).vendor == "sqlite"
+
+
+def triggers_installed(conn=None):
+    conn = conn or connection
+    with conn.cursor() as cur:
+        cur.execute("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_a_'")
+        return cur.fetchone()[0] == 3 * len(SOURCES)
+
+
+def install(conn=None):
+    """Create tables and triggers if missing. Returns True if anything had to be (re)created."""
+    conn = conn or connection
+    if not available(conn):
+        return False
+    with conn.cursor() as cur:
+        cur.execute("SELECT count(*) FROM sqlite_master WHERE name = 'search_docs'")
+        had_schema = cur.fetchone()[0] == 1
+    had_triggers = had_schema and triggers_installed(conn)
+    with conn.cursor() as cur:
+        for sql in SCHEMA:
+            cur.execute(sql)
+        for source in SOURCES:
+            for sql in _triggers(*source):
+                cur.execute(sql)
+    return not had_triggers
+
+
+def rebuild(conn=None):
+    """Drop every indexed document and re-index both source tables."""
+    conn = conn or connection
+    install(conn)
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM search_docs")
+        for table, kind, pk, fts, cols in SOURCES:
+            col_list = ", ".join(cols)
+            cur.execute(f"DELETE FROM {fts}")
+            cur.execute(f"INSERT INTO search_docs (kind, ref) SELECT '{kind}', {pk} FROM {table}")
+            cur.execute(
+                f"INSERT INTO {fts} (rowid, {col_list}) "
+                f"SELECT d.id, {', '.join('t.' + c for c in cols)} FROM {table} t "
+                f"JOIN search_docs d ON d.kind = '{kind}' AND d.ref = t.{pk}"
+            )
+            cur.execute(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+
+
+def counts(conn=None):
+    """{kind: (source rows, indexed rows)} - used to spot a stale index."""
+    conn = conn or connection
+    out = {}
+    with conn.cursor() as cur:
+        for table, kind, pk, fts, cols in SOURCES:
+            cur.execute(f"SELECT count(*) FROM {table}")
+            rows = cur.fetchone()[0]
+            cur.execute(f"SELECT count(*) FROM {fts}")
+            out[kind] = (rows, cur.fetchone()[0])
+    return out
+
+
+# ---------- querying ----------
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expr(q, column=None):
+    """
+    Turn free text into an FTS5 query: every word must match as a prefix,
+    e.g. 'tech fe' -> '"tech"* AND "fe"*'. Returns "" if q has no words.
+    """
+    tokens = _TOKEN_RE.findall(q or "")[:8]
+    if not tokens:
+        return ""
+    expr = " AND ".join(f'"{t}"*' for t in tokens)
+    return f"{column} : ({expr})" if column else expr
+
+
+def search_refs(kind, q, limit, column=None, ranked=True):
+    """
+    Primary keys of matching rows, best match first. Unranked lookups return
+    the newest documents first and stop after ``limit`` matches instead of
+    scoring every hit, which keeps short suggest prefixes fast.
+    """
+    table, _, _, fts, cols = next(s for s in SOURCES if s[1] == kind)
+    expr = match_expr(q, column)
+    if not expr:
+        return []
+    # first column (title / name) weighs 10x the description
+    weights = ", ".join(["10.0"] + ["1.0"] * (len(cols) - 1))
+    order = f"ORDER BY bm25({fts}, {weights})" if ranked else f"ORDER BY {fts}.rowid DESC"
+    sql = (f"SELECT d.ref FROM {fts} JOIN search_docs d ON d.id = {fts}.rowid "
+           f"WHERE {fts} MATCH %s {order} LIMIT %s")
+    with connection.cursor() as cur:
+        cur.execute(sql, [expr, limit])
+        return [row[0] for row in cur.fetchall()]
@@ -0,0 +1,31 @@
+# search/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand, CommandError
+
+from search import fts
+
+
+class Command(BaseCommand):
+    help = "Re-create the FTS5 search tables/triggers and re-index all colleges and events."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true",
+                            help="Only compare indexed vs. source row counts.")
+
+    def handle(self, *args, **opts):
+        if not fts.available():
+            raise CommandError("Full-text index needs SQLite FTS5; this database uses LIKE search.")
+
+        if not opts["check"]:
+            fts.rebuild()
+
+        stale = False
+        for kind, (rows, indexed) in fts.counts().items():
+            self.stdout.write(f"{kind}: {rows} rows, {indexed} indexed")
+            stale |= rows != indexed
+        if not fts.triggers_installed():
+            self.stdout.write("sync triggers are missing")
+            stale = True
+
+        if stale:
+            raise CommandError("Search index is stale; run without --check.")
+        self.stdout.write(self.style.SUCCESS("Search index is up to date."))
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from search import fts
+    if fts.available(schema_editor.connection):
+        fts.rebuild(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    from search import fts
+    if not fts.available(schema_editor.connection):
+        return
+    with schema_editor.connection.cursor() as cur:
+        for _, _, _, fts_table, _ in fts.SOURCES:
+            for suffix in ("ai", "au", "ad"):
+                cur.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+            cur.execute(f"DROP TABLE IF EXISTS {fts_table}")
+        cur.execute("DROP TABLE IF EXISTS search_docs")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('colleges', '0002_college_logo'),
+        ('events', '0003_events_listing_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
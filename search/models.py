@@ -0,0 +1,2 @@
+# search/models.py
+# The FTS5 tables are plain SQL (see search.fts); no Django models here.
@@ -0,0 +1,31 @@
+# search/queries.py
+from django.db.models import Q
+
+from colleges.models import College
+from events.models import Event
+from . import fts
+
+SEARCH_LIMIT = 50
+SUGGEST_LIMIT = 5
+
+
+def _in_order(qs, refs):
+    found = qs.in_bulk(refs)
+    return [found[r] for r in refs if r in found]
+
+
+def find_colleges(q, limit=SEARCH_LIMIT, suggest=False):
+    if fts.available():
+        refs = fts.search_refs("college", q, limit, ranked=not suggest)
+        return _in_order(College.objects.all(), refs)
+    return list(College.objects.filter(name__icontains=q)[:limit])
+
+
+def find_events(q, limit=SEARCH_LIMIT, suggest=False):
+    """Ranked matches on title + description; suggestions match titles only, newest first."""
+    qs = Event.objects.select_related("college")
+    if fts.available():
+        refs = fts.search_refs("event", q, limit, column="title" if suggest else None, ranked=not suggest)
+        return _in_order(qs, refs)
+    cond = Q(title__icontains=q) if suggest else Q(title__icontains=q) | Q(description__icontains=q)
+    return list(qs.filter(cond)[:limit])
@@ -0,0 +1,28 @@
+# search/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from colleges.models import College
+from events.models import Event
+from .autocomplete import autocomplete
+
+
+@receiver(post_save, sender=College)
+def college_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.changed("college", instance.pk, instance.name))
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.changed("event", instance.pk, instance.title))
+
+
+@receiver(post_delete, sender=College)
+def college_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.changed("college", instance.pk))
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.changed("event", instance.pk))
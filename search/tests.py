@@ -0,0 +1,50 @@
+from django.test import TestCase, override_settings
+
+from accounts.models import AdminProfile
+from colleges.models import College
+from events.models import Event
+from .autocomplete import Autocomplete, normalize
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM)
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        admin = AdminProfile.objects.create(full_name="A", admin_name="ac-admin", contact_no="0",
+                                            email="ac@example.invalid", gender="O", password="!")
+        self.college = College.objects.create(name="Riverside Institute", owner_admin=admin)
+        Event.objects.create(college=self.college, title="Tech Fest 2025", created_by=admin)
+        Event.objects.create(college=self.college, title="Café Festival", created_by=admin)
+        self.ac = Autocomplete()
+
+    def _titles(self, q):
+        _, events = self.ac.suggest(q, 10)
+        return sorted(e["title"] for e in events)
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  Café-Fest_2025 "), "cafe fest 2025")
+
+    def test_matches_any_word_prefix(self):
+        self.assertEqual(self._titles("fest"), ["Café Festival", "Tech Fest 2025"])
+        self.assertEqual(self._titles("cafe"), ["Café Festival"])
+        self.assertEqual(self._titles("2025"), ["Tech Fest 2025"])
+        colleges, _ = self.ac.suggest("inst", 10)
+        self.assertEqual([c["name"] for c in colleges], ["Riverside Institute"])
+
+    def test_changes_patch_the_index(self):
+        self._titles("fest")                          # build it
+        event = Event.objects.get(title="Tech Fest 2025")
+        self.ac.changed("event", event.pk, "Robotics Meetup")
+        self.assertEqual(self._titles("fest"), ["Café Festival"])
+        self.assertEqual(self._titles("robo"), ["Robotics Meetup"])
+        self.ac.changed("event", event.pk)
+        self.assertEqual(self._titles("robo"), [])
+
+    def test_version_bump_from_elsewhere_rebuilds(self):
+        self._titles("fest")
+        other = Autocomplete()                         # e.g. another worker sharing the cache
+        admin = self.college.owner_admin
+        event = Event.objects.create(college=self.college, title="Hackathon", created_by=admin)
+        other.changed("event", event.pk, event.title)
+        self.assertEqual(self._titles("hack"), ["Hackathon"])
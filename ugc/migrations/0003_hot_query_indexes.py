@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_login_name_keys'),
+        ('events', '0004_hot_query_indexes'),
+        ('ugc', '0002_alter_photo_uploaded_by_alter_review_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['event', '-date_posted', '-review_id'], name='reviews_event_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', '-date_posted', '-review_id'], name='reviews_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ugc',
+            index=models.Index(fields=['event', '-posted_on', '-ugc_id'], name='ugc_event_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ugc',
+            index=models.Index(fields=['user', '-posted_on', '-ugc_id'], name='ugc_user_recent_idx'),
+        ),
+    ]
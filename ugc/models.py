@@ -2,45 +2,20 @@
 from django.db import models
 from accounts.models import UserProfile
 from events.models import Event
-
-User = UserProfile()
+from core.sequences import next_id
 
 
 # ---------- ID generators ----------
 def generate_ugc_id():
-    last = UGC.objects.order_by("ugc_id").last()
-    if last and last.ugc_id.startswith("UGC"):
-        try:
-            n = int(last.ugc_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"UGC{n:04d}"
+    return next_id("UGC")
 
 
 def generate_photo_id():
-    last = Photo.objects.order_by("photo_id").last()
-    if last and last.photo_id.startswith("PHT"):
-        try:
-            n = int(last.photo_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"PHT{n:04d}"
+    return next_id("PHT")
 
 
 def generate_review_id():
-    last = Review.objects.order_by("review_id").last()
-    if last and last.review_id.startswith("REV"):
-        try:
-            n = int(last.review_id[3:]) + 1
-        except ValueError:
-            n = 1
-    else:
-        n = 1
-    return f"REV{n:04d}"
+    return next_id("REV")
 
 
 CONTENT_CHOICES = (
@@ -61,6 +36,11 @@ class UGC(models.Model):
 
     class Meta:
         db_table = "ugc"
+        indexes = [
+            # newest first per event (event hub) and per user (my UGC)
+            models.Index(fields=["event", "-posted_on", "-ugc_id"], name="ugc_event_recent_idx"),
+            models.Index(fields=["user", "-posted_on", "-ugc_id"], name="ugc_user_recent_idx"),
+        ]
 
     def _str_(self):
         return f"{self.ugc_id} - {self.content_type} by {self.user.username}"
@@ -92,6 +72,10 @@ class Review(models.Model):
 
     class Meta:
         db_table = "reviews"
+        indexes = [
+            models.Index(fields=["event", "-date_posted", "-review_id"], name="reviews_event_recent_idx"),
+            models.Index(fields=["user", "-date_posted", "-review_id"], name="reviews_user_recent_idx"),
+        ]
 
 
     def _str_(self):
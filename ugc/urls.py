@@ -1,13 +1,20 @@
 # ugc/urls.py
 from django.urls import path
-from .views import event_hub_view, my_ugc_view, delete_ugc_view
+from .views import (
+    delete_ugc_view, event_hub_view, event_review_feed, event_ugc_feed,
+    my_review_feed, my_ugc_feed, my_ugc_view,
+)
 
 
 app_name = "ugc"
 
 urlpatterns = [
     path("event/<str:event_id>/",event_hub_view, name="event_hub"),
+    path("event/<str:event_id>/feed/ugc/", event_ugc_feed, name="event_ugc_feed"),
+    path("event/<str:event_id>/feed/reviews/", event_review_feed, name="event_review_feed"),
     path("mine/", my_ugc_view, name="my_ugc"),
+    path("mine/feed/ugc/", my_ugc_feed, name="my_ugc_feed"),
+    path("mine/feed/reviews/", my_review_feed, name="my_review_feed"),
     path("mine/delete/<str:ugc_id>/", delete_ugc_view, name="delete_ugc"),
 
 
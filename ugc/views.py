@@ -1,34 +1,28 @@
 
 
+from django.http import HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.db import transaction
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 from django.utils import timezone
-from accounts.models import UserProfile
+from django.db.models import prefetch_related_objects
+from core import images
+from core.keyset import keyset_page
+from core.jobs import enqueue
+from core.metrics import query_budget
+from core.query_audit import hot_query
+from core.uploads import discard_unreferenced, media_url, store_upload
 from events.models import Event
 from .models import UGC, Photo, Review
 from django.views.decorators.http import require_POST
 
 
-USER_SESSION_KEY = "user_id"
-
-
-def _get_logged_profile(request):
-    uid = request.session.get(USER_SESSION_KEY)
-    if not uid:
-        return None
-    return (UserProfile.objects.filter(pk=uid).first()
-            or UserProfile.objects.filter(user_id=uid).first())
-
-
+@query_budget(15)
 @require_http_methods(["GET", "POST"])
-@transaction.atomic
 def event_hub_view(request, event_id: str):
-    profile = _get_logged_profile(request)
+    profile = request.principal.user
     if not profile:
         messages.error(request, "Please log in to continue.")
         return redirect("login")
@@ -52,26 +46,14 @@ def event_hub_view(request, event_id: str):
 
             final_url = ""
             if upload_file:
-                subdir = "ugc/photos"  # folder inside MEDIA_ROOT
-                fname  = f"{subdir}/{timezone.now().strftime('%Y%m%d%H%M%S')}_{upload_file.name}"
-
-                # Save and normalize
-                saved_path = default_storage.save(fname, ContentFile(upload_file.read()))
-                # e.g. "ugc\\photos\\20250818_pic.jpg" on Windows -> "ugc/photos/20250818_pic.jpg"
-                web_path   = saved_path.replace("\\", "/").lstrip("/")
-                # ensure exactly one /media prefix
-                final_url  = f"{settings.MEDIA_URL.rstrip('/')}/{web_path}"
-
-            # Create the UGC (caption lives in content_data)
-            ugc = UGC.objects.create(
-                content_type=content_type,
-                content_data=caption[:150],
-                user=profile,
-                event=event,
-            )
+                # streamed to disk (content-addressed) before any DB write
+                saved_path, _ = store_upload(upload_file, "ugc/photos")
+                final_url = media_url(saved_path)
+                images.schedule(saved_path)
 
-            # Create Photo row for photos (uploaded file wins; else use legacy text URL if present)
+            photo_url = ""
             if content_type == "photo":
+                # uploaded file wins; else use legacy text URL if present
                 photo_url = final_url or legacy_url
                 if photo_url:
                     # also normalize legacy values like "\media\ugc\..." or "media\..."
@@ -81,11 +63,21 @@ def event_hub_view(request, event_id: str):
                     # avoid /media/media
                     if cleaned.startswith("/media/media/"):
                         cleaned = cleaned.replace("/media/media/", "/media/", 1)
-
+                    photo_url = cleaned
+
+            with transaction.atomic():
+                # Create the UGC (caption lives in content_data)
+                ugc = UGC.objects.create(
+                    content_type=content_type,
+                    content_data=caption[:150],
+                    user=profile,
+                    event=event,
+                )
+                if photo_url:
                     Photo.objects.create(
                         ugc=ugc,
                         uploaded_by=profile,
-                        image_url=cleaned[:255],
+                        image_url=photo_url[:255],
                     )
 
             messages.success(request, "Your photo has been posted!")
@@ -117,63 +109,130 @@ def event_hub_view(request, event_id: str):
             messages.error(request, "Unknown action.")
             return redirect("ugc:event_hub", event_id=event.event_id)
 
-    # ---------- GET: lists ----------
-    ugc_list = (
-        UGC.objects.filter(event=event)
-        .select_related("user")
-        .prefetch_related("photos")
-        .order_by("-posted_on", "-ugc_id")[:12]
-    )
-    reviews = (
-        Review.objects.filter(event=event)
-        .select_related("user")
-        .order_by("-date_posted", "-review_id")[:12]
-    )
+    # ---------- GET: first page of each feed; the rest loads on scroll ----------
+    ugc_list, ugc_next = _ugc_page(_event_ugc(event), None)
+    reviews, reviews_next = _review_page(_event_reviews(event), None)
 
     return render(request, "ugc/event_hub.html", {
         "event": event,
         "account_user": profile,
         "ugc_list": ugc_list,
+        "ugc_next": ugc_next,
         "reviews": reviews,
+        "reviews_next": reviews_next,
     })
 
 
 
 
 
+# ---------- Feeds (newest first; see ugc_*_recent_idx / reviews_*_recent_idx) ----------
+@hot_query("ugc.event_ugc", event="EVT0001")
+def _event_ugc(event):
+    return UGC.objects.filter(event=event).select_related("user").order_by("-posted_on", "-ugc_id")
+
+
+@hot_query("ugc.event_reviews", event="EVT0001")
+def _event_reviews(event):
+    return Review.objects.filter(event=event).select_related("user").order_by("-date_posted", "-review_id")
+
+
+@hot_query("ugc.user_ugc", user="USR001")
+def _user_ugc(user):
+    return UGC.objects.filter(user=user).select_related("event").order_by("-posted_on", "-ugc_id")
+
+
+@hot_query("ugc.user_reviews", user="USR001")
+def _user_reviews(user):
+    return Review.objects.filter(user=user).select_related("event").order_by("-date_posted", "-review_id")
+
+
+# ---------- Feed pages (keyset on the feed ordering; htmx infinite scroll) ----------
+UGC_FEED_ORDERING = ("-posted_on", "-ugc_id")
+REVIEW_FEED_ORDERING = ("-date_posted", "-review_id")
+FEED_PAGE_SIZE = getattr(settings, "UGC_FEED_PAGE_SIZE", 12)
+
+
+def _ugc_page(qs, cursor):
+    # one query for the page + one for its photos, whatever the page number
+    rows, next_cursor = keyset_page(qs, UGC_FEED_ORDERING, cursor, FEED_PAGE_SIZE)
+    prefetch_related_objects(rows, "photos")
+    return rows, next_cursor
+
+
+def _review_page(qs, cursor):
+    return keyset_page(qs, REVIEW_FEED_ORDERING, cursor, FEED_PAGE_SIZE)
+
+
+def _feed_user(request):
+    user = request.principal.user
+    if not user:
+        return None, HttpResponse(status=401)
+    return user, None
+
+
+@query_budget(4)
+def event_ugc_feed(request, event_id: str):
+    user, denied = _feed_user(request)
+    if denied:
+        return denied
+    rows, next_cursor = _ugc_page(_event_ugc(event_id), request.GET.get("after"))
+    return render(request, "ugc/_event_ugc_items.html", {
+        "account_user": user, "event_id": event_id, "ugc_list": rows, "ugc_next": next_cursor})
+
+
+@query_budget(3)
+def event_review_feed(request, event_id: str):
+    user, denied = _feed_user(request)
+    if denied:
+        return denied
+    rows, next_cursor = _review_page(_event_reviews(event_id), request.GET.get("after"))
+    return render(request, "ugc/_event_review_items.html", {
+        "account_user": user, "event_id": event_id, "reviews": rows, "reviews_next": next_cursor})
+
+
+@query_budget(6)
 def my_ugc_view(request):
-    user = _get_logged_profile(request)
+    user = request.principal.user
     if not user:
         messages.error(request, "Please log in to continue.")
         return redirect("login")
 
-    items = (
-        UGC.objects
-        .filter(user=user)
-        .select_related("event")
-        .prefetch_related("photos")
-        .order_by("-posted_on", "-ugc_id")
-    )
-
-    my_reviews = (
-        Review.objects
-        .filter(user=user)
-        .select_related("event")
-        .order_by("-date_posted", "-review_id")
-    )
+    items, items_next = _ugc_page(_user_ugc(user), None)
+    my_reviews, reviews_next = _review_page(_user_reviews(user), None)
 
     return render(request, "ugc/my_ugc.html", {
         "account_user": user,
         "items": items,
-         "reviews": my_reviews,
+        "items_next": items_next,
+        "reviews": my_reviews,
+        "reviews_next": reviews_next,
     })
 
 
+@query_budget(4)
+def my_ugc_feed(request):
+    user, denied = _feed_user(request)
+    if denied:
+        return denied
+    rows, next_cursor = _ugc_page(_user_ugc(user), request.GET.get("after"))
+    return render(request, "ugc/_my_ugc_cards.html", {"items": rows, "items_next": next_cursor})
+
+
+@query_budget(3)
+def my_review_feed(request):
+    user, denied = _feed_user(request)
+    if denied:
+        return denied
+    rows, next_cursor = _review_page(_user_reviews(user), request.GET.get("after"))
+    return render(request, "ugc/_my_review_cards.html", {"reviews": rows, "reviews_next": next_cursor})
+
+
 @require_POST
 @transaction.atomic
 def delete_ugc_view(request, ugc_id: str):
     """Delete user's own UGC (and linked photo files if stored under MEDIA_URL)."""
-    user = _get_logged_profile(request)
+    user = request.principal.user
     if not user:
         messages.error(request, "Please log in to continue.")
         return redirect("login")
@@ -188,20 +247,18 @@ def delete_ugc_view(request, ugc_id: str):
         messages.error(request, "Post not found or you do not have permission.")
         return redirect("ugc:my_ugc")
 
-    # Try to delete physical files for each photo if they live under MEDIA_URL
-    media_prefix = settings.MEDIA_URL.rstrip("/")
-    for p in ugc.photos.all():
-        url = (p.image_url or "").strip()
-        if url and url.startswith(media_prefix):
-            # url like /media/ugc/photos/2025..._abcd.png  -> storage path ugc/photos/...
-            rel_path = url[len(media_prefix):].lstrip("/")
-            try:
-                default_storage.delete(rel_path)
-            except Exception:
-                pass  # ignore file-system errors; DB delete will still proceed
-
+    urls = {(p.image_url or "").strip() for p in ugc.photos.all()}
     ugc.delete()  # cascades to Photo rows due to FK
 
+    # Delete physical files under MEDIA_URL in the background. Uploads are
+    # content-addressed and shared, so the job itself skips any file that
+    # another row points at by the time it runs.
+    media_prefix = settings.MEDIA_URL.rstrip("/")
+    paths = [url[len(media_prefix):].lstrip("/")
+             for url in urls if url and url.startswith(media_prefix)]
+    if paths:
+        enqueue(discard_unreferenced, paths)   # committed (or rolled back) with the delete
+
     messages.success(request, "Your post has been deleted.")
     return redirect("ugc:my_ugc")
 